@@ -2,10 +2,15 @@ import os
 import sys
 import requests
 import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from flask import jsonify
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
-disable_warnings(InsecureRequestWarning)
 
 HTTP_SUCCESS = 200
 HTTP_FAILURE = 400
@@ -36,9 +41,75 @@ errs = 0
 # Set the header application
 hdrs = {'Content-Type': 'application/json'}
 
+# Rows per CT-VL REST v2.0 request. tokenize/detokenize accept a JSON array of
+# requests and answer with an array in the same order.
+CTS_BATCH_SIZE = max(int(os.environ.get('CTS_BATCH_SIZE', '1000')), 1)
+# Maximum number of requests on the wire at once for one BigQuery call.
+CTS_MAX_CONCURRENCY = max(int(os.environ.get('CTS_MAX_CONCURRENCY', '8')), 1)
+# TLS verification of the CT-VL certificate: false (default, CT-VL usually
+# runs with a self-signed certificate), true, or the path of a CA bundle that
+# signs it. Passed on every request, because a session-level setting is
+# overridden by REQUESTS_CA_BUNDLE.
+CTS_SSL_VERIFY = os.environ.get('CTS_SSL_VERIFY', 'false')
+if CTS_SSL_VERIFY.lower() in ('true', 'yes', '1'):
+    CTS_SSL_VERIFY = True
+elif CTS_SSL_VERIFY.lower() in ('false', 'no', '0'):
+    CTS_SSL_VERIFY = False
+    disable_warnings(InsecureRequestWarning)
+
+# One keep-alive session per function instance, reused across warm invocations.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=CTS_MAX_CONCURRENCY, pool_maxsize=CTS_MAX_CONCURRENCY))
+session.headers.update(hdrs)
+session.auth = p11auth
+
+# Optional detokenize cache. Off by default; entries are scoped to the
+# tokengroup/tokentemplate pair and the BigQuery session user.
+DETOKENIZE_CACHE_ENABLED = os.environ.get('DETOKENIZE_CACHE_ENABLED', 'false').lower() in ('true', 'yes', '1')
+DETOKENIZE_CACHE_MAX_SIZE = max(int(os.environ.get('DETOKENIZE_CACHE_MAX_SIZE', '10000')), 1)
+DETOKENIZE_CACHE_TTL_SECONDS = float(os.environ.get('DETOKENIZE_CACHE_TTL_SECONDS', '300'))
+
+class TokenCache:
+    """Bounded LRU cache with a per-entry TTL, safe to share across request threads."""
+
+    def __init__(self, max_size, ttl_seconds):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, size=len(self.entries))
+
+detokenize_cache = TokenCache(DETOKENIZE_CACHE_MAX_SIZE, DETOKENIZE_CACHE_TTL_SECONDS)
+logger = logging.getLogger(__name__)
+
 ############ Check connect to VTS before continue #######################
 try:
-    r = requests.get(p11url, verify=False)
+    r = session.get(p11url, verify=CTS_SSL_VERIFY)
     r.raise_for_status()
 except requests.exceptions.RequestException as err:
     print("\nEror, something wrong: ")
@@ -55,13 +126,72 @@ except requests.exceptions.Timeout as errt:
     sys.exit(HTTP_FAILURE)
 
 ################################################################################
+def build_request(mode, row_value, p11tokgroup, p11toktemplate):
+    data = {"tokengroup" :  p11tokgroup, "tokentemplate" : p11toktemplate}
+    ## Now only handling tokenize and detokenize
+    if mode == "tokenize":
+      data["data"] = row_value
+    else:
+      data["token"] = row_value
+    return data
+
+def parse_result(mode, result):
+    if mode == "tokenize":
+      return result['token']
+    return result['data']
+
+def post_batch(u, mode, batch):
+    # Post one array request; CT-VL answers with one result per element, in order.
+    r = session.post(u, json=batch, verify=CTS_SSL_VERIFY)
+    r.raise_for_status()
+    results = r.json()
+    if len(results) != len(batch):
+        # Rows cannot be matched to replies, so fail the whole BigQuery call.
+        raise ValueError("CT-VL returned %d results for %d rows" % (len(results), len(batch)))
+    return [parse_result(mode, result) for result in results]
+
+def post_single(u, mode, data):
+    r = session.post(u, json=data, verify=CTS_SSL_VERIFY)
+    r.raise_for_status()
+    return parse_result(mode, json.loads(r.text))
+
+def process_rows(u, mode, values, p11tokgroup, p11toktemplate):
+    requests_data = [build_request(mode, value, p11tokgroup, p11toktemplate) for value in values]
+    workers = min(CTS_MAX_CONCURRENCY, max(len(requests_data), 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if mode in ("tokenize", "detokenize"):
+            batches = [requests_data[i:i + CTS_BATCH_SIZE] for i in range(0, len(requests_data), CTS_BATCH_SIZE)]
+            return [value for batch in executor.map(lambda batch: post_batch(u, mode, batch), batches) for value in batch]
+        # The crypto endpoints take one value per request.
+        return list(executor.map(lambda data: post_single(u, mode, data), requests_data))
+
+def detokenize_rows(u, values, p11tokgroup, p11toktemplate, user):
+    # Each distinct token goes on the wire at most once per call, and not at
+    # all when the cache already holds it for this user and token template.
+    results = {}
+    missing = []
+    for value in dict.fromkeys(values):
+        entry = detokenize_cache.get((p11tokgroup, p11toktemplate, user, value)) if DETOKENIZE_CACHE_ENABLED else None
+        if entry is None:
+            missing.append(value)
+        else:
+            results[value] = entry[1]
+    if missing:
+        fetched = process_rows(u, "detokenize", missing, p11tokgroup, p11toktemplate)
+        for value, data in zip(missing, fetched):
+            results[value] = data
+            if DETOKENIZE_CACHE_ENABLED:
+                detokenize_cache.put((p11tokgroup, p11toktemplate, user, value), data)
+    if DETOKENIZE_CACHE_ENABLED and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("detokenize cache: %s unique: %d rows: %d", detokenize_cache.snapshot(), len(results), len(values))
+    return [results[value] for value in values]
+
 def tokenization(request):
     try:
         # The list of rows to return.
         return_value = []
         result = None
         payload = request.get_json()
-        print("\npayload:", payload)
         user_defined_contexts = payload["userDefinedContext"]
         mode = None
         datatype = None
@@ -96,35 +226,12 @@ def tokenization(request):
         #print("\nuser making request:", googleuser)
         #Can have special logic to prevent dba from access.
         #print("nbr of rows", len(rows))
-        # For each input row
-        for row in rows:
-            row_value = row[0]
-            #print("\nrow value:", row_value)
-            data = {"tokengroup" :  p11tokgroup, "tokentemplate" : p11toktemplate}
-            ## Now only handling tokenize and detokenize
-            if mode == "tokenize":
-              data["data"] = row_value
-            else:
-              data["token"] = row_value
-            # Post the request
-            r = requests.post(u, headers=hdrs, auth=p11auth, verify=False, json=data)
-            result = json.loads(r.text)
-            if mode == "tokenize":
-              if datatype == "nbr":
-                #intvalue = int(result['token'])
-                ##row_to_return = [intvalue]
-                 row_to_return = result['token']
-              else:
-                row_to_return = result['token']
-            else:
-              if datatype == "nbr":
-                ##intvalue = int(result['data'])
-                ##row_to_return = [intvalue]
-                 row_to_return = result['data']
-              else:
-                row_to_return = result['data']
-
-            return_value.append(row_to_return)
+        # Rows are grouped into batched requests; replies keep BigQuery's row order.
+        row_values = [row[0] for row in rows]
+        if mode == "detokenize":
+          return_value = detokenize_rows(u, row_values, p11tokgroup, p11toktemplate, googleuser)
+        else:
+          return_value = process_rows(u, mode, row_values, p11tokgroup, p11toktemplate)
  
         json_compatible_string_to_return = jsonify( { "replies" : return_value } )
         #print("\njson_compatible_string_to_return:", json_compatible_string_to_return)
@@ -133,4 +240,3 @@ def tokenization(request):
     except:
         print("\nrows:", rows)
         return(rows, HTTP_FAILURE)
-
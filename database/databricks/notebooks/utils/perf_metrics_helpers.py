@@ -62,6 +62,11 @@ def load_config_batch_size_from_properties(config_path=None):
     if not config_path:
         return None
 
+    try:
+        from thales_databricks_udf import get_crdp_config, load_properties
+    except ImportError:
+        load_properties = None
+
     try:
         from pathlib import Path
 
@@ -69,6 +74,11 @@ def load_config_batch_size_from_properties(config_path=None):
         if not path.exists():
             return None
 
+        if load_properties is not None:
+            # Shares the wheel's mtime-checked properties cache and compiled config.
+            properties = load_properties(str(path))
+            return get_crdp_config(properties).batch_size if "BATCH_SIZE" in properties else None
+
         for raw_line in path.read_text(encoding="utf-8").splitlines():
             line = raw_line.strip()
             if not line or line.startswith("#") or "=" not in line:
@@ -83,6 +93,21 @@ def load_config_batch_size_from_properties(config_path=None):
     return None
 
 
+def collect_crdp_client_metrics():
+    """
+    Snapshot of the Python CRDP client metrics recorded in this Python process.
+
+    Pass it through extra_metrics (for example
+    extra_metrics={"crdp_client_metrics": collect_crdp_client_metrics()}) so it
+    is stored in notes_json. Requires CRDP_METRICS_ENABLED=true in the properties.
+    """
+    try:
+        from thales_databricks_udf import get_crdp_client_metrics
+    except ImportError:
+        return None
+    return get_crdp_client_metrics()
+
+
 def get_node_timeline_summary(cluster_id, start_ts, end_ts):
     if not cluster_id:
         return {
@@ -90,6 +90,23 @@ print("Secure reveal results with auto session lookup:", secure_reveal_results_a
 
 # COMMAND ----------
 
+# Production-safe Arrow-batch usage:
+# - the pandas_udf protects one column per Spark Arrow batch
+# - no group/explode step is needed to build array columns
+from thales_databricks_udf.crdp_vectorized import thales_crdp_pandas_udf_secure
+
+protect_email_udf = thales_crdp_pandas_udf_secure(
+    "protectbulk",
+    "char",
+    "email",
+    spark_session=spark,
+)
+
+vectorized_df = spark.createDataFrame([(value,) for value in plaintext_values], "email string")
+display(vectorized_df.withColumn("email_protected", protect_email_udf("email")))
+
+# COMMAND ----------
+
 # Flexible testing/admin usage:
 # - explicit reveal_user override is allowed here
 testing_results = thales_crdp_python_function_bulk(
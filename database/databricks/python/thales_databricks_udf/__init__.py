@@ -1,19 +1,89 @@
-from .crdp_udfs import (
-    BADDATATAG,
-    PROPERTIES,
-    check_valid,
-    demo_bulk_test,
-    debug_tls_materials,
-    load_properties,
-    prepare_reveal_input,
-    prepare_reveal_input_with_versions,
-    resolve_runtime_reveal_user,
-    thales_crdp_python_function_bulk,
-    thales_crdp_python_function_bulk_by_object,
-    thales_crdp_python_protect_with_external_header,
-    thales_crdp_python_protect_with_external_header_by_object,
-    thales_crdp_python_function_bulk_legacy,
-    thales_crdp_python_function_bulk_secure,
-    thales_crdp_python_function_bulk_secure_by_object,
-    thales_crdp_python_function_bulk_secure_legacy,
-)
+import importlib
+
+# Every UC Python UDF sandbox imports this package on cold start, so the
+# submodules are only imported when one of their names is first used: the
+# asyncio client and the pandas/Arrow entry points cost nothing for callers
+# that never touch them.
+_EXPORTS = {
+    "crdp_udfs": (
+        "BADDATATAG",
+        "CrdpCircuitOpenError",
+        "CrdpConfig",
+        "PROPERTIES",
+        "check_valid",
+        "check_valid_batch",
+        "clear_reveal_cache",
+        "clear_reveal_user_cache",
+        "demo_bulk_test",
+        "debug_tls_materials",
+        "get_adaptive_batch_stats",
+        "get_bulk_failure_stats",
+        "get_crdp_config",
+        "get_crdp_endpoint_stats",
+        "get_dedup_stats",
+        "get_http_session_pool_stats",
+        "get_reveal_cache_stats",
+        "get_reveal_user_cache_stats",
+        "get_tls_session_stats",
+        "load_crdp_config",
+        "load_properties",
+        "prepare_reveal_input",
+        "prepare_reveal_input_with_versions",
+        "register_json_codec",
+        "resolve_runtime_reveal_user",
+        "thales_crdp_python_function_bulk",
+        "thales_crdp_python_function_bulk_by_columns",
+        "thales_crdp_python_function_bulk_by_object",
+        "thales_crdp_python_protect_with_external_header",
+        "thales_crdp_python_protect_with_external_header_by_object",
+        "thales_crdp_python_protect_with_external_header_bulk",
+        "thales_crdp_python_protect_with_external_header_bulk_by_object",
+        "thales_crdp_python_function_bulk_legacy",
+        "thales_crdp_python_function_bulk_secure",
+        "thales_crdp_python_function_bulk_secure_by_columns",
+        "thales_crdp_python_function_bulk_secure_by_object",
+        "thales_crdp_python_function_bulk_secure_legacy",
+    ),
+    "crdp_metrics": (
+        "export_crdp_client_metrics_prometheus",
+        "get_crdp_client_metrics",
+        "reset_crdp_client_metrics",
+    ),
+    "crdp_async": (
+        "AsyncCrdpClient",
+        "get_async_client",
+        "post_json_async",
+        "thales_crdp_python_function_bulk_async",
+        "thales_crdp_python_function_bulk_by_object_async",
+        "thales_crdp_python_function_bulk_legacy_async",
+        "thales_crdp_python_function_bulk_secure_async",
+        "thales_crdp_python_function_bulk_secure_by_object_async",
+        "thales_crdp_python_function_bulk_secure_legacy_async",
+        "thales_crdp_python_protect_with_external_header_async",
+        "thales_crdp_python_protect_with_external_header_by_object_async",
+        "thales_crdp_python_protect_with_external_header_bulk_async",
+        "thales_crdp_python_protect_with_external_header_bulk_by_object_async",
+    ),
+    "crdp_vectorized": (
+        "thales_crdp_pandas_udf_secure",
+        "thales_crdp_python_function_vectorized",
+        "thales_crdp_python_function_vectorized_secure",
+    ),
+}
+_EXPORT_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+__all__ = sorted(_EXPORT_MODULES)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return importlib.import_module(f"{__name__}.{name}")
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_MODULES) | set(_EXPORTS))
@@ -0,0 +1,662 @@
+import asyncio
+import ssl
+import time
+import weakref
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .crdp_metrics import describe_error, observe_histogram
+from .crdp_udfs import (
+    CrdpCircuitOpenError,
+    _BulkCall,
+    _build_external_header_bulk_result,
+    _extract_external_header_result,
+    _is_breaker_failure,
+    _is_endpoint_failure,
+    _is_isolatable_error,
+    _is_retryable_error,
+    _is_same_rejection,
+    _merge_chunk_results,
+    _prepare_bulk_call,
+    _prepare_protect_with_external_header,
+    _prepare_protect_with_external_header_bulk,
+    _record_isolation_requests,
+    _record_request_metrics,
+    _retry_backoff_seconds,
+    get_crdp_config,
+    get_crdp_hedge_percentile,
+    get_crdp_http_pool_maxsize,
+    get_crdp_ssl_context,
+    get_crdp_retry_max_attempts,
+    get_endpoint_balancer,
+    get_json_codec,
+    get_resilience_state,
+    is_crdp_hedge_enabled,
+    is_crdp_metrics_enabled,
+)
+
+__all__ = [
+    "AsyncCrdpClient",
+    "get_async_client",
+    "post_json_async",
+    "post_to_crdp_async",
+    "thales_crdp_python_function_bulk_async",
+    "thales_crdp_python_function_bulk_by_object_async",
+    "thales_crdp_python_function_bulk_legacy_async",
+    "thales_crdp_python_function_bulk_secure_async",
+    "thales_crdp_python_function_bulk_secure_by_object_async",
+    "thales_crdp_python_function_bulk_secure_legacy_async",
+    "thales_crdp_python_protect_with_external_header_async",
+    "thales_crdp_python_protect_with_external_header_by_object_async",
+    "thales_crdp_python_protect_with_external_header_bulk_async",
+    "thales_crdp_python_protect_with_external_header_bulk_by_object_async",
+]
+
+
+_CACHED_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def build_async_ssl_context(properties: dict) -> ssl.SSLContext:
+    # The same context as the requests session pool, so TLS sessions resume across both.
+    return get_crdp_ssl_context(properties)
+
+
+class _AsyncConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class AsyncCrdpClient:
+    """
+    Minimal asyncio HTTP/1.1 client for the CRDP REST API.
+
+    Connections are kept alive and pooled per scheme/host/port. At most
+    CRDP_HTTP_POOL_MAXSIZE requests are on the wire at once; additional
+    requests wait for a pooled connection instead of opening new sockets.
+    """
+
+    def __init__(self, properties: dict):
+        self._properties = dict(properties)
+        self._connect_timeout, self._read_timeout = get_crdp_config(self._properties).timeout
+        self._max_connections = get_crdp_http_pool_maxsize(self._properties)
+        self._semaphore = asyncio.Semaphore(self._max_connections)
+        self._idle_connections: dict[tuple, list[_AsyncConnection]] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        self._closed = True
+        idle_connections = [connection for connections in self._idle_connections.values() for connection in connections]
+        self._idle_connections.clear()
+        for connection in idle_connections:
+            connection.close()
+        for connection in idle_connections:
+            try:
+                await connection.writer.wait_closed()
+            except Exception:
+                pass
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = build_async_ssl_context(self._properties)
+        return self._ssl_context
+
+    async def _open_connection(self, scheme: str, host: str, port: int) -> _AsyncConnection:
+        ssl_context = self._get_ssl_context() if scheme == "https" else None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context, server_hostname=host if ssl_context else None),
+                self._connect_timeout,
+            )
+        except asyncio.TimeoutError as ex:
+            raise requests.ConnectTimeout(f"Connection to {host}:{port} timed out.") from ex
+        except OSError as ex:
+            raise requests.ConnectionError(f"Connection to {host}:{port} failed: {ex}") from ex
+        ssl_object = writer.get_extra_info("ssl_object")
+        if ssl_object is not None and ssl_object.session_reused and hasattr(ssl_context, "record_resumed"):
+            ssl_context.record_resumed()
+        return _AsyncConnection(reader, writer)
+
+    def _release_connection(self, pool_key: tuple, connection: _AsyncConnection, keep_alive: bool):
+        if keep_alive and not self._closed:
+            self._idle_connections.setdefault(pool_key, []).append(connection)
+        else:
+            connection.close()
+
+    async def post_json(self, url: str, payload: dict, *, codec=None, parse_response=None, record_metrics: bool = False):
+        """
+        POST ``payload`` and return the decoded body, or ``parse_response(body_bytes)``.
+        ``codec`` defaults to the ``CRDP_JSON_CODEC=auto`` choice. With
+        ``record_metrics`` the request is recorded in the client metrics
+        registry; latency is measured after a pooled connection was acquired.
+        """
+        codec = codec or get_json_codec({})
+        parsed = urlsplit(url)
+        scheme = parsed.scheme.lower()
+        host = parsed.hostname
+        port = parsed.port or (443 if scheme == "https" else 80)
+        target = parsed.path or "/"
+        if parsed.query:
+            target = f"{target}?{parsed.query}"
+
+        body = codec.dumps(payload)
+        request_bytes = (
+            f"POST {target} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        ).encode("latin-1") + body
+
+        pool_key = (scheme, host, port)
+        timing = [time.monotonic()]
+        try:
+            status, reason, response_body = await self._exchange(pool_key, request_bytes, timing)
+            if status >= 400:
+                kind = "Client" if status < 500 else "Server"
+                response = requests.Response()
+                response.status_code = status
+                response.reason = reason
+                response.url = url
+                response._content = response_body
+                raise requests.HTTPError(f"{status} {kind} Error: {reason} for url: {url}", response=response)
+        except Exception as ex:
+            if record_metrics:
+                _record_request_metrics(url, payload, len(body), 0, time.monotonic() - timing[0], describe_error(ex))
+            raise
+        if record_metrics:
+            _record_request_metrics(url, payload, len(body), len(response_body), time.monotonic() - timing[0])
+        if parse_response is not None:
+            return parse_response(response_body)
+        return codec.loads(response_body) if response_body else {}
+
+    async def _exchange(self, pool_key: tuple, request_bytes: bytes, timing: list):
+        """Send one request on a pooled connection; ``timing[0]`` is reset once a connection slot is acquired."""
+        scheme, host, port = pool_key
+        async with self._semaphore:
+            timing[0] = time.monotonic()
+            idle_connections = self._idle_connections.get(pool_key)
+            connection = idle_connections.pop() if idle_connections else None
+            reused = connection is not None
+            if connection is None:
+                connection = await self._open_connection(scheme, host, port)
+
+            while True:
+                try:
+                    status, reason, response_body, keep_alive = await asyncio.wait_for(
+                        self._round_trip(connection, request_bytes),
+                        self._read_timeout,
+                    )
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError) as ex:
+                    connection.close()
+                    if not reused:
+                        raise requests.ConnectionError(f"Connection to {host}:{port} was closed: {ex}") from ex
+                    # The pooled keep-alive socket went stale; retry once on a fresh connection.
+                    reused = False
+                    connection = await self._open_connection(scheme, host, port)
+                except asyncio.TimeoutError as ex:
+                    connection.close()
+                    raise requests.ReadTimeout(f"Read from {host}:{port} timed out.") from ex
+                except BaseException:
+                    connection.close()
+                    raise
+            self._release_connection(pool_key, connection, keep_alive)
+        return status, reason, response_body
+
+    async def _round_trip(self, connection: _AsyncConnection, request_bytes: bytes):
+        connection.writer.write(request_bytes)
+        await connection.writer.drain()
+
+        reader = connection.reader
+        status_line = (await reader.readuntil(b"\r\n")).decode("latin-1").strip()
+        protocol, _, rest = status_line.partition(" ")
+        status_text, _, reason = rest.partition(" ")
+        status = int(status_text)
+
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = protocol.upper() == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                chunk_size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if chunk_size == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                chunks.append(await reader.readexactly(chunk_size))
+                await reader.readexactly(2)
+            response_body = b"".join(chunks)
+        elif "content-length" in headers:
+            response_body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            response_body = await reader.read()
+            keep_alive = False
+        return status, reason, response_body, keep_alive
+
+
+async def get_async_client(properties: dict) -> AsyncCrdpClient:
+    """Return the pooled client for the running event loop and properties signature."""
+    loop = asyncio.get_running_loop()
+    clients = _CACHED_ASYNC_CLIENTS.setdefault(loop, {})
+    signature = get_crdp_config(properties).http_session_signature
+    client = clients.get(signature)
+    if client is None:
+        client = AsyncCrdpClient(properties)
+        clients[signature] = client
+    return client
+
+
+async def post_json_async(url: str, payload: dict, properties: dict, parse_response=None):
+    client = await get_async_client(properties)
+    return await client.post_json(
+        url,
+        payload,
+        codec=get_json_codec(properties),
+        parse_response=parse_response,
+        record_metrics=is_crdp_metrics_enabled(properties),
+    )
+
+
+async def _post_to_balanced_endpoint_async(mode: str, payload: dict, properties: dict, parse_response=None):
+    balancer = get_endpoint_balancer(properties)
+    endpoint = balancer.acquire()
+    started = time.monotonic()
+    try:
+        response_json = await post_json_async(f"{endpoint.base_url}/v1/{mode}", payload, properties, parse_response)
+    except Exception as ex:
+        balancer.release(endpoint, time.monotonic() - started, _is_endpoint_failure(ex))
+        raise
+    balancer.release(endpoint, time.monotonic() - started, False)
+    return response_json
+
+
+async def _post_hedged_async(mode: str, payload: dict, properties: dict, hedge_delay: float, parse_response=None):
+    primary = asyncio.ensure_future(_post_to_balanced_endpoint_async(mode, payload, properties, parse_response))
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done:
+        return primary.result()
+
+    hedge = asyncio.ensure_future(_post_to_balanced_endpoint_async(mode, payload, properties, parse_response))
+    pending = {primary, hedge}
+    first_error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                first_error = first_error or task.exception()
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def post_to_crdp_async(mode: str, payload: dict, properties: dict, parse_response=None):
+    """Awaitable variant of ``post_to_crdp``; shares the balancer, breaker and retry settings."""
+    state = get_resilience_state(properties)
+    breaker = state.circuit_breaker
+    max_attempts = get_crdp_retry_max_attempts(properties)
+    hedge_enabled = is_crdp_hedge_enabled(properties)
+    call_started = time.monotonic()
+
+    try:
+        for attempt in range(1, max_attempts + 1):
+            if breaker is not None and not breaker.allow():
+                raise CrdpCircuitOpenError("CRDP circuit breaker is open; failing fast without contacting CRDP.")
+
+            hedge_delay = state.latencies.percentile(get_crdp_hedge_percentile(properties)) if hedge_enabled else None
+            started = time.monotonic()
+            try:
+                if hedge_delay is None:
+                    response_json = await _post_to_balanced_endpoint_async(mode, payload, properties, parse_response)
+                else:
+                    response_json = await _post_hedged_async(mode, payload, properties, hedge_delay, parse_response)
+            except Exception as ex:
+                retryable = _is_retryable_error(ex)
+                if breaker is not None:
+                    breaker.record(not _is_breaker_failure(ex))
+                if not retryable or attempt == max_attempts:
+                    raise
+                await asyncio.sleep(_retry_backoff_seconds(properties, attempt))
+                continue
+
+            state.latencies.add(time.monotonic() - started)
+            if breaker is not None:
+                breaker.record(True)
+            return response_json
+    finally:
+        if is_crdp_metrics_enabled(properties):
+            observe_histogram(
+                "thales_crdp_client_call_latency_seconds",
+                (mode, payload.get("protection_policy_name") or ""),
+                time.monotonic() - call_started,
+            )
+
+
+async def _send_bulk_range_async(call: _BulkCall, start: int, end: int) -> list:
+    parser = call.response_parser()
+    started = time.monotonic()
+    try:
+        results = await post_to_crdp_async(call.mode, call.range_payload(start, end), call.props, parser)
+        if len(results) != end - start:
+            raise ValueError(f"CRDP returned {len(results)} results for {end - start} values.")
+    except Exception as ex:
+        if call.adaptive is not None and not _is_isolatable_error(ex):
+            call.adaptive.record(end - start, time.monotonic() - started, 0, failed=True)
+        raise
+    if call.adaptive is not None:
+        call.adaptive.record(end - start, time.monotonic() - started, parser.response_bytes)
+    return results
+
+
+async def _send_bulk_range_isolating_async(call: _BulkCall, start: int, end: int) -> tuple[list, list]:
+    """Asyncio counterpart of ``crdp_udfs._send_bulk_range_isolating``."""
+    try:
+        return await _send_bulk_range_async(call, start, end), []
+    except Exception as ex:
+        if not call.isolate_failures or not _is_isolatable_error(ex):
+            raise
+        return await _bisect_rejected_range_async(call, start, end, ex, first_split=True)
+
+
+async def _bisect_rejected_range_async(
+    call: _BulkCall, start: int, end: int, rejection: Exception, first_split: bool = False
+) -> tuple[list, list]:
+    """Asyncio counterpart of ``crdp_udfs._bisect_rejected_range``; the two halves are sent concurrently."""
+    if end - start == 1:
+        return [call.failed_value(start)], [start]
+    if not call.isolation_budget.take(2):
+        raise rejection
+
+    _record_isolation_requests(2)
+    middle = (start + end) // 2
+    bounds = ((start, middle), (middle, end))
+    outcomes = await asyncio.gather(
+        *(_send_bulk_range_async(call, half_start, half_end) for half_start, half_end in bounds),
+        return_exceptions=True,
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not _is_isolatable_error(outcome):
+            raise outcome
+
+    left, right = outcomes
+    if first_split and isinstance(left, Exception) and isinstance(right, Exception) and _is_same_rejection(left, right):
+        raise rejection
+
+    async def resolve(half_start, half_end, outcome):
+        if isinstance(outcome, Exception):
+            return await _bisect_rejected_range_async(call, half_start, half_end, outcome)
+        return outcome, []
+
+    halves = await asyncio.gather(*(resolve(*half, outcome) for half, outcome in zip(bounds, outcomes)))
+    return _merge_chunk_results(halves)
+
+
+async def _thales_crdp_python_function_bulk_impl_async(
+    databricks_inputdata,
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+    allow_runtime_reveal_user_override: bool = True,
+):
+    # Preparing a call may read the properties file, query Spark for the
+    # session user, load TLS material and read the reveal cache, so it runs
+    # on a worker thread instead of blocking the event loop.
+    call = await asyncio.to_thread(
+        _prepare_bulk_call,
+        databricks_inputdata,
+        mode,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        reveal_user=reveal_user,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+        allow_runtime_reveal_user_override=allow_runtime_reveal_user_override,
+    )
+    return await _run_bulk_call_async(call)
+
+
+async def _run_bulk_call_async(call: _BulkCall):
+    # The client semaphore already bounds connections; the adaptive controller
+    # may ask for fewer chunks in flight than that.
+    limiter = asyncio.Semaphore(call.max_workers) if call.max_workers else None
+    metrics_enabled = is_crdp_metrics_enabled(call.props)
+    dispatch_started = time.monotonic()
+
+    async def send_chunk(start, end):
+        if limiter is None:
+            return await _send_bulk_range_isolating_async(call, start, end)
+        async with limiter:
+            if metrics_enabled:
+                observe_histogram("thales_crdp_client_queue_wait_seconds", call.metric_labels(), time.monotonic() - dispatch_started)
+            return await _send_bulk_range_isolating_async(call, start, end)
+
+    try:
+        chunk_results = await asyncio.gather(*(send_chunk(start, end) for start, end in call.chunk_ranges))
+        return call.finish(*_merge_chunk_results(chunk_results))
+    except Exception as ex:
+        if call.return_ciphertext_on_error:
+            return call.fallback()
+        raise ex
+
+
+async def thales_crdp_python_function_bulk_async(
+    databricks_inputdata,
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    """Awaitable variant of ``thales_crdp_python_function_bulk``."""
+    return await _thales_crdp_python_function_bulk_impl_async(
+        databricks_inputdata,
+        mode,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        reveal_user=reveal_user,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+        allow_runtime_reveal_user_override=True,
+    )
+
+
+async def thales_crdp_python_function_bulk_secure_async(
+    databricks_inputdata,
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    """Awaitable variant of ``thales_crdp_python_function_bulk_secure``."""
+    return await _thales_crdp_python_function_bulk_impl_async(
+        databricks_inputdata,
+        mode,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        reveal_user=None,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+        allow_runtime_reveal_user_override=False,
+    )
+
+
+async def thales_crdp_python_function_bulk_legacy_async(databricks_inputdata, mode, datatype):
+    return await thales_crdp_python_function_bulk_async(databricks_inputdata, mode, datatype, None)
+
+
+async def thales_crdp_python_function_bulk_by_object_async(
+    databricks_inputdata,
+    mode,
+    datatype,
+    object_name,
+    column_name=None,
+    *,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    return await thales_crdp_python_function_bulk_async(
+        databricks_inputdata,
+        mode,
+        datatype,
+        column_name,
+        object_name=object_name,
+        reveal_user=reveal_user,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+    )
+
+
+async def thales_crdp_python_function_bulk_secure_legacy_async(databricks_inputdata, mode, datatype, *, properties=None, spark_session=None):
+    return await thales_crdp_python_function_bulk_secure_async(
+        databricks_inputdata,
+        mode,
+        datatype,
+        None,
+        properties=properties,
+        spark_session=spark_session,
+    )
+
+
+async def thales_crdp_python_function_bulk_secure_by_object_async(
+    databricks_inputdata,
+    mode,
+    datatype,
+    object_name,
+    column_name=None,
+    *,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    return await thales_crdp_python_function_bulk_secure_async(
+        databricks_inputdata,
+        mode,
+        datatype,
+        column_name,
+        object_name=object_name,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+    )
+
+
+async def thales_crdp_python_protect_with_external_header_async(
+    value,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    props, normalized_value, policy_type, payload = await asyncio.to_thread(
+        _prepare_protect_with_external_header, value, datatype, column_name, object_name, properties, spark_session
+    )
+    if payload is None:
+        return {"protected_value": None, "external_header": None}
+
+    response_json = await post_to_crdp_async("protectbulk", payload, props)
+    return _extract_external_header_result(response_json, normalized_value, policy_type)
+
+
+async def thales_crdp_python_protect_with_external_header_by_object_async(
+    value,
+    datatype,
+    object_name,
+    column_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    return await thales_crdp_python_protect_with_external_header_async(
+        value,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        properties=properties,
+        spark_session=spark_session,
+    )
+
+
+async def thales_crdp_python_protect_with_external_header_bulk_async(
+    values,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    call, present_indexes, size = await asyncio.to_thread(
+        _prepare_protect_with_external_header_bulk, values, datatype, column_name, object_name, properties, spark_session
+    )
+    return _build_external_header_bulk_result(call, await _run_bulk_call_async(call), present_indexes, size)
+
+
+async def thales_crdp_python_protect_with_external_header_bulk_by_object_async(
+    values,
+    datatype,
+    object_name,
+    column_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    return await thales_crdp_python_protect_with_external_header_bulk_async(
+        values,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        properties=properties,
+        spark_session=spark_session,
+    )
@@ -0,0 +1,200 @@
+import bisect
+import threading
+from typing import Optional
+
+__all__ = [
+    "export_crdp_client_metrics_prometheus",
+    "get_crdp_client_metrics",
+    "reset_crdp_client_metrics",
+]
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_CHUNK_SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+# name -> (type, help, label names, histogram buckets)
+_METRIC_DEFINITIONS = {
+    "thales_crdp_client_requests_total": (
+        "counter",
+        "HTTP requests sent to CRDP, including retries and hedges.",
+        ("mode", "policy", "endpoint"),
+        None,
+    ),
+    "thales_crdp_client_elements_total": (
+        "counter",
+        "Values sent to CRDP in bulk requests.",
+        ("mode", "policy", "endpoint"),
+        None,
+    ),
+    "thales_crdp_client_request_bytes_total": (
+        "counter",
+        "Request body bytes sent to CRDP.",
+        ("mode", "policy", "endpoint"),
+        None,
+    ),
+    "thales_crdp_client_response_bytes_total": (
+        "counter",
+        "Response body bytes received from CRDP.",
+        ("mode", "policy", "endpoint"),
+        None,
+    ),
+    "thales_crdp_client_errors_total": (
+        "counter",
+        "Failed CRDP HTTP requests by error kind.",
+        ("mode", "policy", "endpoint", "error"),
+        None,
+    ),
+    "thales_crdp_client_request_latency_seconds": (
+        "histogram",
+        "Time from sending one HTTP request to CRDP until its response was read.",
+        ("mode", "policy", "endpoint"),
+        _LATENCY_BUCKETS,
+    ),
+    "thales_crdp_client_call_latency_seconds": (
+        "histogram",
+        "Time spent in one CRDP call including endpoint selection, retries, backoff and hedging.",
+        ("mode", "policy"),
+        _LATENCY_BUCKETS,
+    ),
+    "thales_crdp_client_queue_wait_seconds": (
+        "histogram",
+        "Time a bulk chunk waited for a dispatch worker before its CRDP call started.",
+        ("mode", "policy"),
+        _LATENCY_BUCKETS,
+    ),
+    "thales_crdp_client_chunk_size": (
+        "histogram",
+        "Values per bulk request.",
+        ("mode", "policy", "endpoint"),
+        _CHUNK_SIZE_BUCKETS,
+    ),
+}
+
+_COUNTERS: dict = {}
+_HISTOGRAMS: dict = {}
+_METRICS_LOCK = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Called from crdp_udfs' fork hook: the lock may be held by a parent thread.
+    global _METRICS_LOCK
+    _METRICS_LOCK = threading.Lock()
+
+
+def inc_counter(name: str, labels: tuple, amount: float = 1) -> None:
+    key = (name, labels)
+    with _METRICS_LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + amount
+
+
+def observe_histogram(name: str, labels: tuple, value: float) -> None:
+    buckets = _METRIC_DEFINITIONS[name][3]
+    key = (name, labels)
+    with _METRICS_LOCK:
+        histogram = _HISTOGRAMS.get(key)
+        if histogram is None:
+            histogram = _HISTOGRAMS[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+        histogram[0][bisect.bisect_left(buckets, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+
+def record_crdp_request(
+    mode: str,
+    policy: Optional[str],
+    endpoint: str,
+    element_count: int,
+    request_bytes: int,
+    response_bytes: int,
+    elapsed_seconds: float,
+    error: Optional[str] = None,
+) -> None:
+    """Record one HTTP request to CRDP; ``error`` is set when it failed."""
+    labels = (mode, policy or "", endpoint)
+    inc_counter("thales_crdp_client_requests_total", labels)
+    inc_counter("thales_crdp_client_request_bytes_total", labels, request_bytes)
+    observe_histogram("thales_crdp_client_request_latency_seconds", labels, elapsed_seconds)
+    if error is not None:
+        inc_counter("thales_crdp_client_errors_total", labels + (error,))
+        return
+    inc_counter("thales_crdp_client_elements_total", labels, element_count)
+    inc_counter("thales_crdp_client_response_bytes_total", labels, response_bytes)
+    observe_histogram("thales_crdp_client_chunk_size", labels, element_count)
+
+
+def describe_error(ex: Exception) -> str:
+    response = getattr(ex, "response", None)
+    if response is not None and getattr(response, "status_code", None) is not None:
+        return f"http_{response.status_code}"
+    return type(ex).__name__
+
+
+def _label_dict(name: str, labels: tuple) -> dict:
+    return dict(zip(_METRIC_DEFINITIONS[name][2], labels))
+
+
+def get_crdp_client_metrics() -> dict:
+    """
+    Snapshot of every recorded series, as plain JSON-serializable data.
+
+    Counters map to ``value``; histograms map to ``count``, ``sum`` and
+    cumulative ``buckets`` keyed by upper bound.
+    """
+    with _METRICS_LOCK:
+        counters = dict(_COUNTERS)
+        histograms = {key: (list(value[0]), value[1], value[2]) for key, value in _HISTOGRAMS.items()}
+
+    snapshot = {"counters": [], "histograms": []}
+    for (name, labels), value in sorted(counters.items()):
+        snapshot["counters"].append({"name": name, "labels": _label_dict(name, labels), "value": value})
+    for (name, labels), (bucket_counts, total, count) in sorted(histograms.items()):
+        cumulative = 0
+        buckets = {}
+        for upper_bound, bucket_count in zip(_METRIC_DEFINITIONS[name][3] + ("+Inf",), bucket_counts):
+            cumulative += bucket_count
+            buckets[str(upper_bound)] = cumulative
+        snapshot["histograms"].append(
+            {"name": name, "labels": _label_dict(name, labels), "count": count, "sum": total, "buckets": buckets}
+        )
+    return snapshot
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def export_crdp_client_metrics_prometheus() -> str:
+    """Render the registry in the Prometheus text exposition format (version 0.0.4)."""
+    snapshot = get_crdp_client_metrics()
+    series_by_name: dict = {}
+    for sample in snapshot["counters"] + snapshot["histograms"]:
+        series_by_name.setdefault(sample["name"], []).append(sample)
+
+    lines = []
+    for name, (metric_type, help_text, _, _) in _METRIC_DEFINITIONS.items():
+        samples = series_by_name.get(name)
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sample in samples:
+            if metric_type == "counter":
+                lines.append(f"{name}{_format_labels(sample['labels'])} {sample['value']}")
+                continue
+            for upper_bound, cumulative in sample["buckets"].items():
+                bucket_labels = dict(sample["labels"], le=upper_bound)
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(sample['labels'])} {sample['sum']}")
+            lines.append(f"{name}_count{_format_labels(sample['labels'])} {sample['count']}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def reset_crdp_client_metrics() -> None:
+    with _METRICS_LOCK:
+        _COUNTERS.clear()
+        _HISTOGRAMS.clear()
@@ -0,0 +1,300 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+__all__ = [
+    "SharedRevealCache",
+    "close_reveal_cache",
+    "get_disabled_reason",
+    "open_reveal_cache",
+]
+
+_MAGIC = b"TCRDPRC1"
+# magic, slot count, ways, value bytes, then the hits/misses/stores/evictions/expired counters
+_HEADER = struct.Struct("<8sIII4x5Q")
+_COUNTERS = struct.Struct("<5Q")
+_COUNTERS_OFFSET = 24
+_COUNTER_NAMES = ("hits", "misses", "stores", "evictions", "expired")
+# expiry on the CLOCK_MONOTONIC clock shared by every process on the node, value length
+_RECORD = struct.Struct("<dH")
+_DIGEST_SIZE = 16
+_EMPTY_DIGEST = bytes(_DIGEST_SIZE)
+_WAYS = 8
+_MEMORY_FILESYSTEMS = {"tmpfs", "ramfs"}
+
+_OPEN_CACHES: dict = {}
+_DISABLED_REASONS: dict = {}
+_OPEN_CACHES_LOCK = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Called from crdp_udfs' fork hook. The parent's handles are dropped from the
+    # registry by PID on the next open; only the lock needs replacing here.
+    global _OPEN_CACHES_LOCK
+    _OPEN_CACHES_LOCK = threading.Lock()
+
+
+def _xor(data: bytes, pad: bytes) -> bytes:
+    return (int.from_bytes(data, "little") ^ int.from_bytes(pad, "little")).to_bytes(len(data), "little")
+
+
+def _aligned_find(keys: bytes, digest: bytes) -> int:
+    position = keys.find(digest)
+    while position != -1 and position % _DIGEST_SIZE:
+        position = keys.find(digest, position + 1)
+    return -1 if position == -1 else position // _DIGEST_SIZE
+
+
+def _mount_fstype(path: str) -> Optional[str]:
+    real_path = os.path.realpath(path)
+    best_mount, fstype = "", None
+    try:
+        with open("/proc/self/mounts", "r", encoding="utf-8") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace("\\040", " ")
+                inside = real_path == mount_point or real_path.startswith(mount_point.rstrip("/") + "/")
+                if inside and len(mount_point) >= len(best_mount):
+                    best_mount, fstype = mount_point, fields[2]
+    except OSError:
+        return None
+    return fstype
+
+
+class SharedRevealCache:
+    """
+    Fixed-size table of reveal results in a memory-backed file that every
+    Python worker of the same OS user on the node maps.
+
+    Slots are grouped in buckets of eight. The first 16 bytes of SHAKE-256
+    over the lookup material select and identify the slot; the rest of that
+    stream is XORed over the stored UTF-8 value. That pad is obfuscation, not
+    encryption: anyone who can read the region and knows or guesses the
+    ciphertext, reveal user and policy can recover the value, so the file
+    permissions are the actual protection. Expired entries are never returned
+    and are wiped when seen, and a full bucket evicts the entry closest to
+    expiry. Access is serialized with ``flock`` on the file plus a thread lock.
+
+    The region is a file in a memory filesystem: its pages can be written to
+    swap, and it outlives the worker processes until it is unlinked or the
+    node restarts.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_value_bytes: int):
+        import fcntl
+
+        self._fcntl = fcntl
+        self.path = path
+        self.slot_count = max(-(-max_entries // _WAYS), 1) * _WAYS
+        self.value_bytes = max_value_bytes
+        self.record_size = _RECORD.size + max_value_bytes
+        self._records_offset = _HEADER.size + self.slot_count * _DIGEST_SIZE
+        self.size = self._records_offset + self.slot_count * self.record_size
+        self.pid = os.getpid()
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+        try:
+            status = os.fstat(self._fd)
+            if status.st_uid != os.getuid() or status.st_mode & 0o077:
+                raise PermissionError(f"{path} must be owned by this user and not accessible to others")
+            with self._locked():
+                self._map = self._initialize()
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _initialize(self) -> mmap.mmap:
+        if os.fstat(self._fd).st_size == self.size:
+            region = mmap.mmap(self._fd, self.size)
+            if _HEADER.unpack_from(region, 0)[:4] == (_MAGIC, self.slot_count, _WAYS, self.value_bytes):
+                return region
+            region.close()
+        # Truncating first zero-fills every slot of a new or foreign region.
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(self._fd, self.size)
+        region = mmap.mmap(self._fd, self.size)
+        _HEADER.pack_into(region, 0, _MAGIC, self.slot_count, _WAYS, self.value_bytes, 0, 0, 0, 0, 0)
+        return region
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def _add_counters(self, **amounts) -> None:
+        counters = list(_COUNTERS.unpack_from(self._map, _COUNTERS_OFFSET))
+        for position, name in enumerate(_COUNTER_NAMES):
+            counters[position] += amounts.get(name, 0)
+        _COUNTERS.pack_into(self._map, _COUNTERS_OFFSET, *counters)
+
+    def _bucket(self, digest: bytes) -> tuple[int, bytes]:
+        bucket = int.from_bytes(digest[:8], "little") % (self.slot_count // _WAYS)
+        start = _HEADER.size + bucket * _WAYS * _DIGEST_SIZE
+        return bucket * _WAYS, self._map[start:start + _WAYS * _DIGEST_SIZE]
+
+    def _record_offset(self, slot: int) -> int:
+        return self._records_offset + slot * self.record_size
+
+    def _write_slot(self, slot: int, digest: bytes, expires_at: float, value: bytes) -> None:
+        key_offset = _HEADER.size + slot * _DIGEST_SIZE
+        record_offset = self._record_offset(slot)
+        self._map[key_offset:key_offset + _DIGEST_SIZE] = digest
+        _RECORD.pack_into(self._map, record_offset, expires_at, len(value))
+        self._map[record_offset + _RECORD.size:record_offset + self.record_size] = value.ljust(self.value_bytes, b"\0")
+
+    def get_many(self, materials: list) -> list:
+        """Cached values for each lookup material, ``None`` for misses and ``None`` materials."""
+        digests = [None if material is None else hashlib.shake_256(material).digest(_DIGEST_SIZE) for material in materials]
+        found = [None] * len(materials)
+        hits = misses = expired = 0
+        now = time.monotonic()
+        with self._locked():
+            for index, digest in enumerate(digests):
+                if digest is None:
+                    continue
+                first_slot, keys = self._bucket(digest)
+                way = _aligned_find(keys, digest)
+                if way == -1:
+                    misses += 1
+                    continue
+                record_offset = self._record_offset(first_slot + way)
+                expires_at, length = _RECORD.unpack_from(self._map, record_offset)
+                if expires_at <= now:
+                    self._write_slot(first_slot + way, _EMPTY_DIGEST, 0.0, b"")
+                    expired += 1
+                    misses += 1
+                    continue
+                found[index] = self._map[record_offset + _RECORD.size:record_offset + _RECORD.size + length]
+                hits += 1
+            self._add_counters(hits=hits, misses=misses, expired=expired)
+
+        results = [None] * len(materials)
+        for index, stored in enumerate(found):
+            if stored is not None:
+                pad = hashlib.shake_256(materials[index]).digest(_DIGEST_SIZE + len(stored))[_DIGEST_SIZE:]
+                results[index] = _xor(stored, pad).decode("utf-8")
+        return results
+
+    def put_many(self, entries: list, ttl_seconds: float) -> None:
+        """Store ``(material, value)`` pairs; values longer than the slot size are skipped."""
+        prepared = []
+        for material, value in entries:
+            raw = value.encode("utf-8")
+            if len(raw) > self.value_bytes:
+                continue
+            stream = hashlib.shake_256(material).digest(_DIGEST_SIZE + len(raw))
+            prepared.append((stream[:_DIGEST_SIZE], _xor(raw, stream[_DIGEST_SIZE:])))
+        if not prepared or ttl_seconds <= 0:
+            return
+
+        now = time.monotonic()
+        stores = evictions = expired = 0
+        with self._locked():
+            for digest, encrypted in prepared:
+                first_slot, keys = self._bucket(digest)
+                way = _aligned_find(keys, digest)
+                if way == -1:
+                    way = _aligned_find(keys, _EMPTY_DIGEST)
+                if way == -1:
+                    expiries = [_RECORD.unpack_from(self._map, self._record_offset(first_slot + slot))[0] for slot in range(_WAYS)]
+                    way = expiries.index(min(expiries))
+                    if expiries[way] > now:
+                        evictions += 1
+                    else:
+                        expired += 1
+                self._write_slot(first_slot + way, digest, now + ttl_seconds, encrypted)
+                stores += 1
+            self._add_counters(stores=stores, evictions=evictions, expired=expired)
+
+    def clear(self) -> None:
+        """Wipe every entry and reset the counters for all workers on the node."""
+        with self._locked():
+            self._map[_COUNTERS_OFFSET:] = bytes(self.size - _COUNTERS_OFFSET)
+
+    def close(self, unlink: bool = False) -> None:
+        """Unmap the region; with ``unlink``, wipe it and remove the file first."""
+        if unlink:
+            with self._locked():
+                self._map[_COUNTERS_OFFSET:] = bytes(self.size - _COUNTERS_OFFSET)
+                try:
+                    os.unlink(self.path)
+                except FileNotFoundError:
+                    pass
+        self._map.close()
+        os.close(self._fd)
+
+    def stats(self) -> dict:
+        with self._locked():
+            counters = _COUNTERS.unpack_from(self._map, _COUNTERS_OFFSET)
+        lookups = counters[0] + counters[1]
+        return dict(
+            zip(_COUNTER_NAMES, counters),
+            path=self.path,
+            capacity=self.slot_count,
+            max_value_bytes=self.value_bytes,
+            size_bytes=self.size,
+            hit_rate=counters[0] / lookups if lookups else 0.0,
+        )
+
+
+def open_reveal_cache(directory: str, max_entries: int, max_value_bytes: int) -> Optional[SharedRevealCache]:
+    """
+    This process's handle on the node-wide cache region for the given layout,
+    or ``None`` when ``directory`` is not a memory filesystem or the region
+    cannot be opened. The region is only created on tmpfs or ramfs, but tmpfs
+    pages can still be swapped out.
+    """
+    # Keyed by PID: a forked worker must not share its parent's flock.
+    cache_key = (os.getpid(), directory, max_entries, max_value_bytes)
+    if cache_key in _OPEN_CACHES:
+        return _OPEN_CACHES[cache_key]
+    with _OPEN_CACHES_LOCK:
+        if cache_key in _OPEN_CACHES:
+            return _OPEN_CACHES[cache_key]
+        for stale_key in [key for key in _OPEN_CACHES if key[0] != cache_key[0]]:
+            del _OPEN_CACHES[stale_key]
+            _DISABLED_REASONS.pop(stale_key, None)
+
+        cache = None
+        fstype = _mount_fstype(directory)
+        if fstype not in _MEMORY_FILESYSTEMS:
+            _DISABLED_REASONS[cache_key] = f"{directory} is not a memory filesystem ({fstype or 'unknown'})"
+        else:
+            path = os.path.join(directory, f"thales-crdp-reveal-{os.getuid()}-{max_entries}x{max_value_bytes}")
+            try:
+                cache = SharedRevealCache(path, max_entries, max_value_bytes)
+            except (ImportError, OSError) as ex:
+                _DISABLED_REASONS[cache_key] = str(ex)
+        _OPEN_CACHES[cache_key] = cache
+    return cache
+
+
+def get_disabled_reason(directory: str, max_entries: int, max_value_bytes: int) -> Optional[str]:
+    """Why ``open_reveal_cache`` returned ``None`` for this layout in this process, if it did."""
+    return _DISABLED_REASONS.get((os.getpid(), directory, max_entries, max_value_bytes))
+
+
+def close_reveal_cache(directory: str, max_entries: int, max_value_bytes: int, unlink: bool = False) -> None:
+    """
+    Drop this process's handle on the region; with ``unlink``, wipe it and
+    remove its file. Other workers keep their mapping of an unlinked region
+    until they exit, and the next lookup with the cache enabled creates a new
+    one.
+    """
+    cache_key = (os.getpid(), directory, max_entries, max_value_bytes)
+    with _OPEN_CACHES_LOCK:
+        cache = _OPEN_CACHES.pop(cache_key, None)
+        _DISABLED_REASONS.pop(cache_key, None)
+    if cache is not None:
+        cache.close(unlink)
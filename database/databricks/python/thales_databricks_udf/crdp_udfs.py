@@ -1,46 +1,111 @@
 import json
 import os
+import random
+import re
+import sys
 import hashlib
 import tempfile
 import base64
 import ssl
+import threading
+import time
+import weakref
+from collections import deque
 from collections.abc import Mapping
-from decimal import Decimal, InvalidOperation
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Optional
 import requests
 from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+
+from . import crdp_metrics
+from .crdp_metrics import describe_error, observe_histogram, record_crdp_request
 
 __all__ = [
     "BADDATATAG",
+    "CrdpCircuitOpenError",
     "PROPERTIES",
     "check_valid",
+    "check_valid_batch",
+    "clear_reveal_cache",
+    "clear_reveal_user_cache",
     "demo_bulk_test",
     "debug_tls_materials",
+    "CrdpConfig",
+    "get_crdp_config",
+    "load_crdp_config",
     "load_properties",
+    "register_json_codec",
     "prepare_reveal_input",
+    "get_crdp_endpoint_stats",
+    "get_adaptive_batch_stats",
+    "get_bulk_failure_stats",
+    "get_dedup_stats",
+    "get_http_session_pool_stats",
+    "get_tls_session_stats",
+    "get_reveal_cache_stats",
+    "get_reveal_user_cache_stats",
     "prepare_reveal_input_with_versions",
     "resolve_runtime_reveal_user",
     "thales_crdp_python_protect_with_external_header",
     "thales_crdp_python_protect_with_external_header_by_object",
+    "thales_crdp_python_protect_with_external_header_bulk",
+    "thales_crdp_python_protect_with_external_header_bulk_by_object",
     "thales_crdp_python_function_bulk_secure",
     "thales_crdp_python_function_bulk_secure_legacy",
     "thales_crdp_python_function_bulk_by_object",
     "thales_crdp_python_function_bulk_secure_by_object",
+    "thales_crdp_python_function_bulk_by_columns",
+    "thales_crdp_python_function_bulk_secure_by_columns",
 ]
 
 
-_CACHED_PROPERTIES: Optional[dict] = None
-_CACHED_HTTP_SESSION: Optional[requests.Session] = None
-_CACHED_HTTP_SESSION_SIGNATURE: Optional[str] = None
-
-
-def load_properties(path: Optional[str] = None, refresh: bool = False) -> dict:
-    global _CACHED_PROPERTIES
-
-    if path is None and _CACHED_PROPERTIES is not None and not refresh:
-        return dict(_CACHED_PROPERTIES)
-
-    config_path = path or os.getenv("UDF_CONFIG_VOLUME_PATH") or "udfConfig.properties"
+_PROPERTIES_FILE_CACHE: dict = {}
+_PROPERTIES_FILE_CACHE_LOCK = threading.Lock()
+_PROPERTIES_RECHECK_SECONDS = 2.0
+_CONFIG_CACHE: dict = {}
+_CONFIG_CACHE_MAX_ENTRIES = 32
+_HTTP_SESSIONS: dict = {}
+_HTTP_SESSIONS_LOCK = threading.Lock()
+_SSL_CONTEXTS: dict = {}
+_SSL_CONTEXTS_LOCK = threading.Lock()
+_PROFILE_INDEX_CACHE: dict = {}
+_PROFILE_INDEX_CACHE_MAX_ENTRIES = 32
+_DEFAULT_REVEAL_USER_CACHE_TTL_SECONDS = 60.0
+_DEFAULT_REVEAL_CACHE_TTL_SECONDS = 300.0
+_REVEAL_USER_CACHE_MAX_ENTRIES = 16
+_REVEAL_USER_CACHE: dict = {}
+_REVEAL_USER_CACHE_LOCK = threading.Lock()
+_REVEAL_USER_CACHE_STATS = {"hits": 0, "misses": 0, "expired": 0}
+_DEDUP_STATS = {"calls": 0, "input_values": 0, "sent_values": 0}
+_DEDUP_STATS_LOCK = threading.Lock()
+_BULK_FAILURE_STATS = {"calls": 0, "failed_calls": 0, "failed_values": 0, "isolation_requests": 0}
+_BULK_FAILURE_STATS_LOCK = threading.Lock()
+_ADAPTIVE_CONTROLLERS: dict = {}
+_ADAPTIVE_CONTROLLERS_LOCK = threading.Lock()
+_JSON_CODECS: dict = {}
+_JSON_CODECS_LOCK = threading.Lock()
+_ORJSON_IMPORT_ATTEMPTED = False
+_ENDPOINT_BALANCERS: dict = {}
+_ENDPOINT_BALANCERS_LOCK = threading.Lock()
+_RESILIENCE_STATES: dict = {}
+_RESILIENCE_STATES_LOCK = threading.Lock()
+_HEDGE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_BULK_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_BULK_EXECUTOR_WORKERS = 0
+_BULK_EXECUTOR_LOCK = threading.Lock()
+
+
+@dataclass
+class _CachedPropertiesFile:
+    file_key: tuple
+    checked_at: float
+    properties: dict
+
+
+def _read_properties_file(config_path: str) -> dict:
     properties = {}
     with open(config_path, "r", encoding="utf-8") as prop_file:
         for raw_line in prop_file:
@@ -49,15 +114,117 @@ def load_properties(path: Optional[str] = None, refresh: bool = False) -> dict:
                 continue
             name, value = line.split("=", 1)
             properties[name.strip()] = value.strip()
-    if path is None:
-        _CACHED_PROPERTIES = dict(properties)
     return properties
 
 
+def load_properties(path: Optional[str] = None, refresh: bool = False) -> dict:
+    """
+    Return a copy of the parsed properties file.
+
+    Files are cached per path. A cached file is revalidated by mtime and size
+    at most every couple of seconds and only re-read when either changed, so
+    a properties file on a slow UC volume is not re-read per call.
+    ``refresh=True`` always re-reads it.
+    """
+    config_path = path or os.getenv("UDF_CONFIG_VOLUME_PATH") or "udfConfig.properties"
+    now = time.monotonic()
+    cached = _PROPERTIES_FILE_CACHE.get(config_path)
+    if cached is not None and not refresh and now - cached.checked_at < _PROPERTIES_RECHECK_SECONDS:
+        return dict(cached.properties)
+
+    stat_result = os.stat(config_path)
+    file_key = (stat_result.st_mtime_ns, stat_result.st_size)
+    if cached is not None and not refresh and cached.file_key == file_key:
+        cached.checked_at = now
+        return dict(cached.properties)
+
+    properties = _read_properties_file(config_path)
+    with _PROPERTIES_FILE_CACHE_LOCK:
+        _PROPERTIES_FILE_CACHE[config_path] = _CachedPropertiesFile(file_key, now, properties)
+    if refresh:
+        clear_profile_cache()
+    return dict(properties)
+
+
 def get_default_properties(refresh: bool = False) -> dict:
     return load_properties(refresh=refresh)
 
 
+@dataclass(frozen=True)
+class CrdpConfig:
+    """
+    Typed view of one properties mapping, compiled once and shared by every
+    call made with the same properties.
+    """
+
+    properties: Mapping
+    endpoints: tuple
+    lb_strategy: str
+    ssl_enabled: bool
+    verify_server: bool
+    ca_cert_path: Optional[str]
+    client_cert_path: Optional[str]
+    client_key_path: Optional[str]
+    connect_timeout_ms: int
+    read_timeout_ms: int
+    pool_maxsize: int
+    pool_max_limit: int
+    batch_size: int
+    bulk_max_workers: int
+    bad_data_tag: str
+    tls_signature: str
+    http_session_signature: str
+    profiles: "_ProfileIndex"
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return self.connect_timeout_ms / 1000.0, self.read_timeout_ms / 1000.0
+
+
+def _compile_crdp_config(properties: dict) -> CrdpConfig:
+    return CrdpConfig(
+        properties=MappingProxyType(dict(properties)),
+        endpoints=tuple(get_crdp_endpoints(properties)),
+        lb_strategy=get_crdp_lb_strategy(properties),
+        ssl_enabled=is_crdp_ssl_enabled(properties),
+        verify_server=is_crdp_ssl_verify_server_enabled(properties),
+        ca_cert_path=get_crdp_ca_cert_path(properties),
+        client_cert_path=get_crdp_client_cert_path(properties),
+        client_key_path=get_crdp_client_key_path(properties),
+        connect_timeout_ms=get_crdp_connect_timeout_ms(properties),
+        read_timeout_ms=get_crdp_read_timeout_ms(properties),
+        pool_maxsize=get_crdp_http_pool_maxsize(properties),
+        pool_max_limit=get_crdp_http_pool_max_limit(properties),
+        batch_size=get_crdp_batch_size(properties),
+        bulk_max_workers=get_crdp_bulk_max_workers(properties),
+        bad_data_tag=get_bad_data_tag(properties),
+        tls_signature=_build_tls_signature(properties),
+        http_session_signature=_build_http_session_signature(properties),
+        profiles=_get_profile_index(properties),
+    )
+
+
+def get_crdp_config(properties: Optional[dict] = None) -> CrdpConfig:
+    """Compiled configuration for ``properties`` (default: the udfConfig file), cached by content."""
+    if properties is None:
+        properties = get_default_properties()
+    signature = _properties_signature(properties)
+    if signature is None:
+        return _compile_crdp_config(properties)
+
+    config = _CONFIG_CACHE.get(signature)
+    if config is None:
+        config = _compile_crdp_config(properties)
+        if len(_CONFIG_CACHE) >= _CONFIG_CACHE_MAX_ENTRIES:
+            _CONFIG_CACHE.pop(next(iter(_CONFIG_CACHE)), None)
+        _CONFIG_CACHE[signature] = config
+    return config
+
+
+def load_crdp_config(path: Optional[str] = None, refresh: bool = False) -> CrdpConfig:
+    return get_crdp_config(load_properties(path, refresh=refresh))
+
+
 def _parse_boolean_flag(value: Optional[str], default: bool = False) -> bool:
     normalized = first_non_blank(value)
     if normalized is None:
@@ -124,6 +291,16 @@ def get_crdp_client_key_pem_b64(properties: dict) -> Optional[str]:
     return first_non_blank(properties.get("CRDP_CLIENT_KEY_PEM_B64"), properties.get("crdp.client.key.pem.b64"))
 
 
+def is_crdp_tls_session_resumption_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(
+            properties.get("CRDP_TLS_SESSION_RESUMPTION_ENABLED"),
+            properties.get("crdp.tls.session.resumption.enabled"),
+        ),
+        True,
+    )
+
+
 def get_crdp_connect_timeout_ms(properties: dict) -> int:
     return _parse_positive_int(
         first_non_blank(properties.get("CRDP_CONNECT_TIMEOUT_MS"), properties.get("crdp.connect.timeout.ms")),
@@ -145,11 +322,233 @@ def get_crdp_http_pool_maxsize(properties: dict) -> int:
     )
 
 
+def get_crdp_http_pool_max_limit(properties: dict) -> int:
+    return max(
+        get_crdp_http_pool_maxsize(properties),
+        _parse_positive_int(
+            first_non_blank(properties.get("CRDP_HTTP_POOL_MAX_LIMIT"), properties.get("crdp.http.pool.max.limit")),
+            get_crdp_http_pool_maxsize(properties) * 4,
+        ),
+    )
+
+
+def get_crdp_batch_size(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("BATCH_SIZE"), properties.get("batch.size")),
+        1000,
+    )
+
+
+def get_crdp_bulk_max_workers(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_BULK_MAX_WORKERS"), properties.get("crdp.bulk.max.workers")),
+        4,
+    )
+
+
+def is_crdp_dedup_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(properties.get("CRDP_DEDUP_ENABLED"), properties.get("crdp.dedup.enabled")),
+        False,
+    )
+
+
+def is_crdp_bulk_failure_isolation_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(
+            properties.get("CRDP_BULK_FAILURE_ISOLATION_ENABLED"),
+            properties.get("crdp.bulk.failure.isolation.enabled"),
+        ),
+        False,
+    )
+
+
+def get_crdp_bulk_failure_isolation_max_requests(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(
+            properties.get("CRDP_BULK_FAILURE_ISOLATION_MAX_REQUESTS"),
+            properties.get("crdp.bulk.failure.isolation.max.requests"),
+        ),
+        64,
+    )
+
+
+def is_crdp_adaptive_batch_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(properties.get("CRDP_ADAPTIVE_BATCH_ENABLED"), properties.get("crdp.adaptive.batch.enabled")),
+        False,
+    )
+
+
+def get_crdp_adaptive_batch_min(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_ADAPTIVE_BATCH_MIN"), properties.get("crdp.adaptive.batch.min")),
+        100,
+    )
+
+
+def get_crdp_adaptive_batch_max(properties: dict) -> int:
+    return max(
+        get_crdp_adaptive_batch_min(properties),
+        _parse_positive_int(
+            first_non_blank(properties.get("CRDP_ADAPTIVE_BATCH_MAX"), properties.get("crdp.adaptive.batch.max")),
+            10000,
+        ),
+    )
+
+
+def get_crdp_adaptive_max_workers(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_ADAPTIVE_MAX_WORKERS"), properties.get("crdp.adaptive.max.workers")),
+        get_crdp_http_pool_maxsize(properties),
+    )
+
+
+def get_crdp_adaptive_target_latency_ms(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(
+            properties.get("CRDP_ADAPTIVE_TARGET_LATENCY_MS"),
+            properties.get("crdp.adaptive.target.latency.ms"),
+        ),
+        1000,
+    )
+
+
+def get_crdp_adaptive_max_payload_bytes(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(
+            properties.get("CRDP_ADAPTIVE_MAX_PAYLOAD_BYTES"),
+            properties.get("crdp.adaptive.max.payload.bytes"),
+        ),
+        8 * 1024 * 1024,
+    )
+
+
+def is_crdp_metrics_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(properties.get("CRDP_METRICS_ENABLED"), properties.get("crdp.metrics.enabled")),
+        False,
+    )
+
+
+def is_crdp_reveal_cache_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(properties.get("CRDP_REVEAL_CACHE_ENABLED"), properties.get("crdp.reveal.cache.enabled")),
+        False,
+    )
+
+
+def get_crdp_reveal_cache_ttl_seconds(properties: dict) -> float:
+    raw = first_non_blank(properties.get("CRDP_REVEAL_CACHE_TTL_SECONDS"), properties.get("crdp.reveal.cache.ttl.seconds"))
+    try:
+        return max(float(raw), 0.0) if raw is not None else _DEFAULT_REVEAL_CACHE_TTL_SECONDS
+    except ValueError:
+        return _DEFAULT_REVEAL_CACHE_TTL_SECONDS
+
+
+def get_crdp_reveal_cache_max_entries(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_REVEAL_CACHE_MAX_ENTRIES"), properties.get("crdp.reveal.cache.max.entries")),
+        65536,
+    )
+
+
+def get_crdp_reveal_cache_max_value_bytes(properties: dict) -> int:
+    # Stored lengths are 16-bit.
+    return min(
+        _parse_positive_int(
+            first_non_blank(properties.get("CRDP_REVEAL_CACHE_MAX_VALUE_BYTES"), properties.get("crdp.reveal.cache.max.value.bytes")),
+            128,
+        ),
+        65535,
+    )
+
+
+def get_crdp_reveal_cache_dir(properties: dict) -> str:
+    return first_non_blank(properties.get("CRDP_REVEAL_CACHE_DIR"), properties.get("crdp.reveal.cache.dir"), "/dev/shm")
+
+
 def get_bad_data_tag(properties: Optional[dict] = None) -> str:
     props = properties or get_default_properties()
     return props.get("BADDATATAG", "99999999999")
 
 
+def get_reveal_user_cache_ttl_seconds(properties: Optional[dict]) -> float:
+    if not properties:
+        return _DEFAULT_REVEAL_USER_CACHE_TTL_SECONDS
+    raw = first_non_blank(properties.get("REVEAL_USER_CACHE_TTL_SECONDS"), properties.get("reveal.user.cache.ttl.seconds"))
+    try:
+        return max(float(raw), 0.0) if raw is not None else _DEFAULT_REVEAL_USER_CACHE_TTL_SECONDS
+    except ValueError:
+        return _DEFAULT_REVEAL_USER_CACHE_TTL_SECONDS
+
+
+def _lookup_session_reveal_user(spark) -> Optional[str]:
+    for sql_text in ("select session_user()", "select current_user()"):
+        try:
+            value = spark.sql(sql_text).first()[0]
+            if value is not None and str(value).strip():
+                return str(value).strip()
+        except Exception:
+            continue
+
+    try:
+        context = dbutils.notebook.entry_point.getDbutils().notebook().getContext()  # type: ignore[name-defined]
+        user_name = context.userName().get()
+        if user_name is not None and str(user_name).strip():
+            return str(user_name).strip()
+    except Exception:
+        pass
+    return None
+
+
+def _cached_session_reveal_user(spark, ttl_seconds: float) -> Optional[str]:
+    """
+    Resolve the session identity at most once per Spark session and TTL window.
+
+    Entries are keyed on the session object itself, so a new or restarted
+    session always triggers a fresh lookup.
+    """
+    if ttl_seconds <= 0:
+        return _lookup_session_reveal_user(spark)
+
+    cache_key = id(spark)
+    now = time.monotonic()
+    with _REVEAL_USER_CACHE_LOCK:
+        entry = _REVEAL_USER_CACHE.get(cache_key)
+        if entry is not None and entry[0] is spark and entry[2] > now:
+            _REVEAL_USER_CACHE_STATS["hits"] += 1
+            return entry[1]
+        _REVEAL_USER_CACHE_STATS["misses"] += 1
+        if entry is not None:
+            _REVEAL_USER_CACHE_STATS["expired"] += 1
+
+    user_name = _lookup_session_reveal_user(spark)
+    if user_name is not None:
+        with _REVEAL_USER_CACHE_LOCK:
+            if len(_REVEAL_USER_CACHE) >= _REVEAL_USER_CACHE_MAX_ENTRIES:
+                _REVEAL_USER_CACHE.pop(next(iter(_REVEAL_USER_CACHE)), None)
+            _REVEAL_USER_CACHE[cache_key] = (spark, user_name, now + ttl_seconds)
+    return user_name
+
+
+def clear_reveal_user_cache(spark_session=None) -> None:
+    with _REVEAL_USER_CACHE_LOCK:
+        if spark_session is None:
+            _REVEAL_USER_CACHE.clear()
+        else:
+            _REVEAL_USER_CACHE.pop(id(spark_session), None)
+
+
+def get_reveal_user_cache_stats() -> dict:
+    with _REVEAL_USER_CACHE_LOCK:
+        stats = dict(_REVEAL_USER_CACHE_STATS)
+        stats["entries"] = len(_REVEAL_USER_CACHE)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
 def resolve_runtime_reveal_user(
     spark_session=None,
     explicit_reveal_user: Optional[str] = None,
@@ -168,21 +567,9 @@ def resolve_runtime_reveal_user(
             spark = None
 
     if spark is not None:
-        for sql_text in ("select session_user()", "select current_user()"):
-            try:
-                value = spark.sql(sql_text).first()[0]
-                if value is not None and str(value).strip():
-                    return str(value).strip()
-            except Exception:
-                continue
-
-        try:
-            context = dbutils.notebook.entry_point.getDbutils().notebook().getContext()  # type: ignore[name-defined]
-            user_name = context.userName().get()
-            if user_name is not None and str(user_name).strip():
-                return str(user_name).strip()
-        except Exception:
-            pass
+        user_name = _cached_session_reveal_user(spark, get_reveal_user_cache_ttl_seconds(properties))
+        if user_name is not None:
+            return user_name
 
     props = properties or get_default_properties()
     return first_non_blank(props.get("CRDPUSER"), props.get("DEFAULTREVEALUSER"), props.get("databricksuser"), "admin")
@@ -204,6 +591,9 @@ def check_valid(databricks_inputdata, datatype, bad_data_tag: Optional[str] = No
         return invalid_tag + value
 
     if str(datatype).lower() != "char":
+        # Only values check_valid_batch cannot classify get here, so decimal is imported on demand.
+        from decimal import Decimal, InvalidOperation
+
         try:
             number = Decimal(value)
             if Decimal(-9) <= number <= Decimal(-1):
@@ -213,6 +603,70 @@ def check_valid(databricks_inputdata, datatype, bad_data_tag: Optional[str] = No
     return value
 
 
+_PLAIN_DECIMAL_PATTERN = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+def _check_valid_integer_array(values, numeric: bool, invalid_tag: str) -> list:
+    import numpy as np  # type: ignore
+
+    text = values.astype(str)
+    results = text.astype(object)
+    single_digit = (values >= 0) & (values <= 9)
+    results[single_digit] = np.char.add(invalid_tag, text[single_digit])
+    if numeric:
+        results[(values >= -9) & (values <= -1)] = invalid_tag
+    return results.tolist()
+
+
+def check_valid_batch(values, datatype, bad_data_tag: Optional[str] = None, keep_nulls: bool = False) -> list:
+    """
+    ``[check_valid(value, datatype, bad_data_tag) for value in values]`` in one pass.
+
+    Plain ints and ASCII number strings are checked without building a
+    ``Decimal``; integer NumPy arrays are checked with array operations.
+    Anything else goes through ``check_valid``, so results are identical.
+    With ``keep_nulls`` a ``None`` stays ``None`` instead of becoming the tag.
+    """
+    invalid_tag = bad_data_tag or BADDATATAG
+    numeric = str(datatype).lower() != "char"
+    if values is None:
+        return []
+    if type(values).__module__ == "numpy" and getattr(values, "ndim", 0) == 1:
+        if values.dtype.kind in "iu":
+            return _check_valid_integer_array(values, numeric, invalid_tag)
+        values = values.tolist()
+
+    results = []
+    append = results.append
+    for value in values:
+        value_type = type(value)
+        if value is None:
+            append(None if keep_nulls else invalid_tag)
+        elif value_type is int:
+            if -9 <= value <= 9:
+                append(invalid_tag + str(value) if value >= 0 else invalid_tag if numeric else str(value))
+            else:
+                append(str(value))
+        elif value_type is str:
+            text = value.strip()
+            if not text:
+                append(invalid_tag)
+            elif len(text) < 2:
+                append(invalid_tag + text)
+            elif not numeric or (text.isdigit() and text.isascii()):
+                append(text)
+            elif text[0] == "-" and text[1:].isdigit() and text.isascii():
+                # -1..-9 with any leading zeros; int() would fail past sys.get_int_max_str_digits().
+                append(invalid_tag if len(text[1:].lstrip("0")) == 1 else text)
+            elif text[0] != "-" and _PLAIN_DECIMAL_PATTERN.fullmatch(text):
+                append(text)
+            else:
+                append(check_valid(text, datatype, invalid_tag))
+        else:
+            append(check_valid(value, datatype, invalid_tag))
+    return results
+
+
 def prepare_reveal_input(protected_data, protection_policy_name, key_metadata_location, external_version=None, username="admin"):
     return prepare_reveal_input_with_versions(
         protected_data,
@@ -331,8 +785,9 @@ def parse_object_profiles(properties: dict, prefix: str) -> dict:
     return object_profiles
 
 
-def resolve_object_profile_alias(
-    properties: dict,
+def _lookup_object_profile_alias(
+    reveal_profiles: dict,
+    protect_profiles: dict,
     object_name: Optional[str],
     column_name: Optional[str],
     mode: Optional[str] = None,
@@ -343,16 +798,31 @@ def resolve_object_profile_alias(
         return None
 
     use_reveal_profiles = str(mode or "").lower().startswith("reveal")
-    reveal_profiles = parse_object_profiles(properties, "reveal.object.")
     if use_reveal_profiles:
         configured = reveal_profiles.get(normalized_object, {}).get(normalized_column)
         if configured:
             return configured
 
-    protect_profiles = parse_object_profiles(properties, "protect.object.")
     return protect_profiles.get(normalized_object, {}).get(normalized_column)
 
 
+def resolve_object_profile_alias(
+    properties: dict,
+    object_name: Optional[str],
+    column_name: Optional[str],
+    mode: Optional[str] = None,
+) -> Optional[str]:
+    if normalize_object_key(object_name) is None or normalize_column_key(column_name) is None:
+        return None
+    return _lookup_object_profile_alias(
+        parse_object_profiles(properties, "reveal.object."),
+        parse_object_profiles(properties, "protect.object."),
+        object_name,
+        column_name,
+        mode,
+    )
+
+
 def resolve_alias(properties: dict, configured_profile: Optional[str]) -> Optional[str]:
     if configured_profile is None or not configured_profile.strip():
         return None
@@ -373,6 +843,79 @@ def resolve_column_property(properties: dict, column_name: Optional[str], suffix
     )
 
 
+class _ProfileIndex:
+    """Profile mappings parsed once per properties signature, plus memoized resolutions."""
+
+    def __init__(self, properties: dict):
+        self.properties = dict(properties)
+        self.column_profiles = parse_column_profiles(properties)
+        self.reveal_object_profiles = parse_object_profiles(properties, "reveal.object.")
+        self.protect_object_profiles = parse_object_profiles(properties, "protect.object.")
+        self.resolved: dict[tuple, tuple[Optional[str], str]] = {}
+
+    def resolve(self, datatype, column_name=None, object_name=None, mode=None) -> tuple[Optional[str], str]:
+        properties = self.properties
+        configured_profile = first_non_blank(
+            _lookup_object_profile_alias(
+                self.reveal_object_profiles,
+                self.protect_object_profiles,
+                object_name,
+                column_name,
+                mode,
+            ),
+            resolve_column_property(properties, column_name, "profile"),
+            self.column_profiles.get(normalize_column_key(column_name)),
+            properties.get("protection_profile"),
+        )
+
+        if configured_profile is None:
+            normalized_type = str(datatype).lower()
+            configured_profile = (
+                first_non_blank(properties.get("DEFAULTEXTERNALCHARPOLICY"), properties.get("protection_profile_alpha_ext"))
+                if normalized_type == "char"
+                else first_non_blank(properties.get("DEFAULTEXTERNALNBRNBRPOLICY"), properties.get("protection_profile_nbr_ext"))
+            )
+
+        policy_name = resolve_alias(properties, configured_profile)
+        policy_type = first_non_blank(
+            resolve_column_property(properties, column_name, "policyType"),
+            properties.get(f"{configured_profile}.policyType") if configured_profile else None,
+            properties.get(f"{normalize_tag_key(configured_profile)}.policyType") if configured_profile else None,
+            infer_policy_type(configured_profile),
+            infer_policy_type(policy_name),
+            properties.get("DEFAULTMODE"),
+            properties.get("keymetadatalocation"),
+            "external",
+        )
+        return policy_name, policy_type.lower()
+
+
+def _properties_signature(properties: dict):
+    try:
+        return frozenset(properties.items())
+    except TypeError:
+        return None
+
+
+def _get_profile_index(properties: dict) -> _ProfileIndex:
+    signature = _properties_signature(properties)
+    if signature is None:
+        return _ProfileIndex(properties)
+
+    index = _PROFILE_INDEX_CACHE.get(signature)
+    if index is None:
+        index = _ProfileIndex(properties)
+        if len(_PROFILE_INDEX_CACHE) >= _PROFILE_INDEX_CACHE_MAX_ENTRIES:
+            _PROFILE_INDEX_CACHE.pop(next(iter(_PROFILE_INDEX_CACHE)), None)
+        _PROFILE_INDEX_CACHE[signature] = index
+    return index
+
+
+def clear_profile_cache() -> None:
+    _PROFILE_INDEX_CACHE.clear()
+    _CONFIG_CACHE.clear()
+
+
 def resolve_profile(
     properties: dict,
     datatype: str,
@@ -380,34 +923,25 @@ def resolve_profile(
     object_name: Optional[str] = None,
     mode: Optional[str] = None,
 ):
-    column_profiles = parse_column_profiles(properties)
-    configured_profile = first_non_blank(
-        resolve_object_profile_alias(properties, object_name, column_name, mode),
-        resolve_column_property(properties, column_name, "profile"),
-        column_profiles.get(normalize_column_key(column_name)),
-        properties.get("protection_profile"),
+    index = _get_profile_index(properties)
+    cache_key = (
+        normalize_object_key(object_name),
+        normalize_column_key(column_name),
+        str(datatype).lower(),
+        str(mode or "").lower(),
     )
+    resolved = index.resolved.get(cache_key)
+    if resolved is None:
+        resolved = index.resolve(datatype, column_name, object_name, mode)
+        index.resolved[cache_key] = resolved
+    return resolved
 
-    if configured_profile is None:
-        normalized_type = str(datatype).lower()
-        configured_profile = (
-            first_non_blank(properties.get("DEFAULTEXTERNALCHARPOLICY"), properties.get("protection_profile_alpha_ext"))
-            if normalized_type == "char"
-            else first_non_blank(properties.get("DEFAULTEXTERNALNBRNBRPOLICY"), properties.get("protection_profile_nbr_ext"))
-        )
 
-    policy_name = resolve_alias(properties, configured_profile)
-    policy_type = first_non_blank(
-        resolve_column_property(properties, column_name, "policyType"),
-        properties.get(f"{configured_profile}.policyType") if configured_profile else None,
-        properties.get(f"{normalize_tag_key(configured_profile)}.policyType") if configured_profile else None,
-        infer_policy_type(configured_profile),
-        infer_policy_type(policy_name),
-        properties.get("DEFAULTMODE"),
-        properties.get("keymetadatalocation"),
-        "external",
-    )
-    return policy_name, policy_type.lower()
+def _build_base_url(properties: dict, crdp_ip: str, crdp_port: str) -> str:
+    if crdp_ip.startswith("http://") or crdp_ip.startswith("https://"):
+        return f"{crdp_ip}:{crdp_port}"
+    scheme = "https" if is_crdp_ssl_enabled(properties) else "http"
+    return f"{scheme}://{crdp_ip}:{crdp_port}"
 
 
 def build_url(properties: dict, mode: str) -> str:
@@ -415,10 +949,181 @@ def build_url(properties: dict, mode: str) -> str:
     if crdp_ip is None:
         raise ValueError("No CRDPIP found for UDF.")
     crdp_port = first_non_blank(properties.get("CRDPPORT"), properties.get("CRDPIPPORT"), "8090")
-    if crdp_ip.startswith("http://") or crdp_ip.startswith("https://"):
-        return f"{crdp_ip}:{crdp_port}/v1/{mode}"
-    scheme = "https" if is_crdp_ssl_enabled(properties) else "http"
-    return f"{scheme}://{crdp_ip}:{crdp_port}/v1/{mode}"
+    return f"{_build_base_url(properties, crdp_ip, crdp_port)}/v1/{mode}"
+
+
+def get_crdp_endpoints(properties: dict) -> list[str]:
+    """
+    Return the CRDP base URLs (``scheme://host:port``) requests are balanced across.
+
+    CRDP_ENDPOINTS is a comma-separated list of ``host``, ``host:port`` or
+    ``https://host:port`` entries; entries without a port use CRDPPORT. When it
+    is not set, the single CRDPIP/CRDPPORT endpoint is used.
+    """
+    default_port = first_non_blank(properties.get("CRDPPORT"), properties.get("CRDPIPPORT"), "8090")
+    raw = first_non_blank(properties.get("CRDP_ENDPOINTS"), properties.get("crdp.endpoints"))
+    if raw is None:
+        crdp_ip = first_non_blank(properties.get("CRDPIP"), properties.get("crdpip"))
+        if crdp_ip is None:
+            raise ValueError("No CRDPIP found for UDF.")
+        return [_build_base_url(properties, crdp_ip, default_port)]
+
+    endpoints = []
+    for entry in raw.split(","):
+        item = entry.strip().rstrip("/")
+        if not item:
+            continue
+        scheme_prefix = ""
+        for prefix in ("http://", "https://"):
+            if item.lower().startswith(prefix):
+                scheme_prefix, item = item[: len(prefix)].lower(), item[len(prefix):]
+        host, _, port = item.partition(":")
+        endpoints.append(_build_base_url(properties, scheme_prefix + host, port or default_port))
+    if not endpoints:
+        raise ValueError("No CRDP endpoints found in CRDP_ENDPOINTS.")
+    return endpoints
+
+
+def get_crdp_lb_strategy(properties: dict) -> str:
+    strategy = first_non_blank(properties.get("CRDP_LB_STRATEGY"), properties.get("crdp.lb.strategy"), "least_outstanding")
+    return "ewma" if strategy.lower() == "ewma" else "least_outstanding"
+
+
+def get_crdp_endpoint_failure_threshold(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_ENDPOINT_FAILURE_THRESHOLD"), properties.get("crdp.endpoint.failure.threshold")),
+        3,
+    )
+
+
+def get_crdp_endpoint_cooldown_ms(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_ENDPOINT_COOLDOWN_MS"), properties.get("crdp.endpoint.cooldown.ms")),
+        30000,
+    )
+
+
+class _CrdpEndpoint:
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.outstanding = 0
+        self.ewma_ms: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+
+class _EndpointBalancer:
+    """
+    Routes each request to one CRDP endpoint and tracks passive health.
+
+    ``least_outstanding`` picks the endpoint with the fewest in-flight requests;
+    ``ewma`` weights that by the endpoint's smoothed latency. An endpoint that
+    fails CRDP_ENDPOINT_FAILURE_THRESHOLD times in a row is ejected for
+    CRDP_ENDPOINT_COOLDOWN_MS and then gets one trial request. If every
+    endpoint is ejected, the one that recovers first is used.
+    """
+
+    _EWMA_ALPHA = 0.3
+
+    def __init__(self, base_urls: list[str], strategy: str, failure_threshold: int, cooldown_seconds: float):
+        self.endpoints = [_CrdpEndpoint(base_url) for base_url in base_urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    def _score(self, endpoint: _CrdpEndpoint) -> float:
+        if self.strategy == "ewma":
+            return (endpoint.ewma_ms or 0.0) * (endpoint.outstanding + 1)
+        return endpoint.outstanding
+
+    def acquire(self) -> _CrdpEndpoint:
+        now = time.monotonic()
+        with self._lock:
+            # Rotate the starting point so ties are spread round-robin.
+            start = self._next_index
+            self._next_index = (start + 1) % len(self.endpoints)
+            rotated = self.endpoints[start:] + self.endpoints[:start]
+            healthy = [endpoint for endpoint in rotated if endpoint.ejected_until <= now]
+            if healthy:
+                endpoint = min(healthy, key=self._score)
+            else:
+                endpoint = min(rotated, key=lambda candidate: candidate.ejected_until)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint: _CrdpEndpoint, elapsed_seconds: float, failed: bool) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            if failed:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.failure_threshold:
+                    endpoint.ejected_until = time.monotonic() + self.cooldown_seconds
+                return
+            endpoint.consecutive_failures = 0
+            endpoint.ejected_until = 0.0
+            elapsed_ms = elapsed_seconds * 1000.0
+            endpoint.ewma_ms = (
+                elapsed_ms
+                if endpoint.ewma_ms is None
+                else self._EWMA_ALPHA * elapsed_ms + (1 - self._EWMA_ALPHA) * endpoint.ewma_ms
+            )
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "endpoint": endpoint.base_url,
+                    "outstanding": endpoint.outstanding,
+                    "ewma_ms": endpoint.ewma_ms,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "healthy": endpoint.ejected_until <= now,
+                }
+                for endpoint in self.endpoints
+            ]
+
+
+def get_endpoint_balancer(properties: dict) -> _EndpointBalancer:
+    config = get_crdp_config(properties)
+    base_urls = list(config.endpoints)
+    strategy = config.lb_strategy
+    failure_threshold = get_crdp_endpoint_failure_threshold(properties)
+    cooldown_seconds = get_crdp_endpoint_cooldown_ms(properties) / 1000.0
+    cache_key = (tuple(base_urls), strategy, failure_threshold, cooldown_seconds)
+    balancer = _ENDPOINT_BALANCERS.get(cache_key)
+    if balancer is None:
+        with _ENDPOINT_BALANCERS_LOCK:
+            balancer = _ENDPOINT_BALANCERS.get(cache_key)
+            if balancer is None:
+                balancer = _EndpointBalancer(base_urls, strategy, failure_threshold, cooldown_seconds)
+                _ENDPOINT_BALANCERS[cache_key] = balancer
+    return balancer
+
+
+def get_crdp_endpoint_stats(properties: Optional[dict] = None) -> list[dict]:
+    props = _validate_properties(properties) or get_default_properties()
+    return get_endpoint_balancer(props).snapshot()
+
+
+# Transport failures another attempt or endpoint may not hit. Every requests
+# exception is an OSError, including invalid URLs, redirect loops and
+# undecodable bodies, which fail the same way each time, so only these count.
+_TRANSIENT_REQUEST_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+def _is_endpoint_failure(ex: Exception) -> bool:
+    """Connection problems, timeouts and 5xx count against an endpoint; 4xx do not."""
+    if isinstance(ex, requests.HTTPError):
+        response = ex.response
+        return response is None or response.status_code >= 500
+    return isinstance(ex, _TRANSIENT_REQUEST_ERRORS)
 
 
 def _hash_text(value: Optional[str]) -> str:
@@ -498,7 +1203,13 @@ def _resolve_tls_material_paths(properties: dict) -> tuple[Optional[str], Option
     )
     return ca_cert_path, client_cert_path, client_key_path
 
-def _build_http_session_signature(properties: dict) -> str:
+
+def _default_ca_bundle() -> str:
+    # Same trust store requests uses for verify=True: the environment first, then certifi.
+    return os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or DEFAULT_CA_BUNDLE_PATH
+
+
+def _build_tls_signature(properties: dict) -> str:
     return "|".join(
         [
             str(is_crdp_ssl_enabled(properties)),
@@ -509,9 +1220,18 @@ def _build_http_session_signature(properties: dict) -> str:
             _hash_text(get_crdp_ca_cert_pem(properties)),
             _hash_text(get_crdp_client_cert_pem(properties)),
             _hash_text(get_crdp_client_key_pem(properties)),
-            get_crdp_ca_cert_path(properties) or "",
+            get_crdp_ca_cert_path(properties) or _default_ca_bundle(),
             get_crdp_client_cert_path(properties) or "",
             get_crdp_client_key_path(properties) or "",
+            str(is_crdp_tls_session_resumption_enabled(properties)),
+        ]
+    )
+
+
+def _build_http_session_signature(properties: dict) -> str:
+    return "|".join(
+        [
+            _build_tls_signature(properties),
             str(get_crdp_connect_timeout_ms(properties)),
             str(get_crdp_read_timeout_ms(properties)),
             str(get_crdp_http_pool_maxsize(properties)),
@@ -519,58 +1239,776 @@ def _build_http_session_signature(properties: dict) -> str:
     )
 
 
-def _build_http_session(properties: dict) -> requests.Session:
-    session = requests.Session()
-    pool_maxsize = get_crdp_http_pool_maxsize(properties)
-    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+def _resumable_session(connection) -> Optional[ssl.SSLSession]:
+    try:
+        session = connection.session
+        # TLS 1.3 sessions are only resumable once the server's ticket has been read.
+        if session is not None and (session.has_ticket or connection.version() != "TLSv1.3"):
+            return session
+    except Exception:
+        pass
+    return None
+
+
+class _SessionSavingSSLSocket(ssl.SSLSocket):
+    def close(self):
+        save_session = getattr(self.context, "save_session", None)
+        if save_session is not None:
+            save_session(self)
+        super().close()
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """
+    Client SSLContext that offers the most recent TLS session of a host when
+    opening another connection to it, so the pool's later handshakes resume
+    instead of repeating the full key exchange.
+
+    TLS 1.3 tickets arrive after the handshake, so sessions are taken from
+    connections that are still open, or being closed, rather than at wrap time.
+    """
+
+    sslsocket_class = _SessionSavingSSLSocket
+
+    def __new__(cls, *args, **kwargs):
+        return super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._resumption_lock = threading.Lock()
+        self._sessions: dict = {}
+        self._live_connections: dict = {}
+        self.resumption_enabled = True
+        self.connections = 0
+        self.resumption_attempts = 0
+        self.resumed_connections = 0
+
+    def save_session(self, connection) -> None:
+        session = _resumable_session(connection) if self.resumption_enabled else None
+        if session is not None:
+            with self._resumption_lock:
+                self._sessions[connection.server_hostname] = session
+
+    def _pick_session(self, server_hostname) -> Optional[ssl.SSLSession]:
+        with self._resumption_lock:
+            alive = []
+            for connection_ref in self._live_connections.get(server_hostname) or []:
+                connection = connection_ref()
+                if connection is None:
+                    continue
+                alive.append(connection_ref)
+                session = _resumable_session(connection)
+                if session is not None:
+                    self._sessions[server_hostname] = session
+            self._live_connections[server_hostname] = alive
+            return self._sessions.get(server_hostname)
+
+    def _remember(self, server_hostname, connection, offered: bool) -> None:
+        with self._resumption_lock:
+            self.connections += 1
+            if offered:
+                self.resumption_attempts += 1
+            self._live_connections.setdefault(server_hostname, []).append(weakref.ref(connection))
+
+    def _wrap(self, wrap, server_hostname, session, *args, **kwargs):
+        if not self.resumption_enabled:
+            return wrap(*args, server_hostname=server_hostname, session=session, **kwargs)
+        if session is None:
+            session = self._pick_session(server_hostname)
+        # A session the server no longer accepts just falls back to a full handshake.
+        connection = wrap(*args, server_hostname=server_hostname, session=session, **kwargs)
+        self._remember(server_hostname, connection, session is not None)
+        if isinstance(connection, ssl.SSLSocket) and connection.session_reused:
+            self.record_resumed()
+        return connection
+
+    def record_resumed(self) -> None:
+        # SSLObjects (asyncio) finish their handshake after wrap_bio, so their owner reports it.
+        with self._resumption_lock:
+            self.resumed_connections += 1
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        return self._wrap(super().wrap_socket, server_hostname, session, sock, *args, **kwargs)
+
+    def wrap_bio(self, incoming, outgoing, *args, server_hostname=None, session=None, **kwargs):
+        return self._wrap(super().wrap_bio, server_hostname, session, incoming, outgoing, *args, **kwargs)
+
+    def snapshot(self) -> dict:
+        with self._resumption_lock:
+            return {
+                "connections": self.connections,
+                "resumption_attempts": self.resumption_attempts,
+                "resumed_connections": self.resumed_connections,
+            }
 
-    ca_cert_path, cert_path, key_path = _resolve_tls_material_paths(properties)
-    if cert_path and key_path:
-        session.cert = (cert_path, key_path)
 
-    verify_server = is_crdp_ssl_verify_server_enabled(properties)
-    if not verify_server:
-        session.verify = False
+def _tls_pem_text(pem_b64: Optional[str], pem: Optional[str]) -> Optional[str]:
+    if pem_b64:
+        return _decode_base64_content(pem_b64).decode("ascii")
+    return pem or None
+
+
+def _load_client_cert_chain(context: ssl.SSLContext, cert_pem: Optional[str], cert_path: Optional[str], key_pem: Optional[str], key_path: Optional[str]) -> None:
+    if not (cert_pem or cert_path) or not (key_pem or key_path):
+        return
+    if not cert_pem and not key_pem:
+        context.load_cert_chain(certfile=cert_path, keyfile=key_path)
+        return
+
+    # ssl can only load a certificate chain from a file, so in-memory PEMs go
+    # through one private file that is removed as soon as it has been read.
+    if cert_pem is None:
+        with open(cert_path, "r", encoding="utf-8") as cert_file:
+            cert_pem = cert_file.read()
+    if key_pem is None:
+        with open(key_path, "r", encoding="utf-8") as key_file:
+            key_pem = key_file.read()
+    file_descriptor, chain_path = tempfile.mkstemp(prefix="crdp-client-", suffix=".pem")
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8", newline="\n") as chain_file:
+            chain_file.write(key_pem.rstrip("\n") + "\n" + cert_pem)
+        context.load_cert_chain(certfile=chain_path)
+    finally:
+        os.remove(chain_path)
+
+
+def _build_crdp_ssl_context(properties: dict) -> _ResumingSSLContext:
+    context = _ResumingSSLContext()
+    context.resumption_enabled = is_crdp_tls_session_resumption_enabled(properties)
+    if not is_crdp_ssl_verify_server_enabled(properties):
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
     else:
-        session.verify = ca_cert_path if ca_cert_path else True
+        ca_pem = _tls_pem_text(get_crdp_ca_cert_pem_b64(properties), get_crdp_ca_cert_pem(properties))
+        if ca_pem:
+            context.load_verify_locations(cadata=ca_pem)
+        else:
+            ca_location = get_crdp_ca_cert_path(properties) or _default_ca_bundle()
+            if os.path.isdir(ca_location):
+                context.load_verify_locations(capath=ca_location)
+            else:
+                context.load_verify_locations(cafile=ca_location)
+
+    _load_client_cert_chain(
+        context,
+        _tls_pem_text(get_crdp_client_cert_pem_b64(properties), get_crdp_client_cert_pem(properties)),
+        get_crdp_client_cert_path(properties),
+        _tls_pem_text(get_crdp_client_key_pem_b64(properties), get_crdp_client_key_pem(properties)),
+        get_crdp_client_key_path(properties),
+    )
+    return context
 
-    return session
 
+def get_crdp_ssl_context(properties: dict) -> ssl.SSLContext:
+    """
+    Shared client SSLContext for the TLS settings in ``properties``.
 
-def get_http_session(properties: dict) -> requests.Session:
-    global _CACHED_HTTP_SESSION
-    global _CACHED_HTTP_SESSION_SIGNATURE
+    Built once per distinct TLS material and reused by every pooled session
+    and the asyncio client, so certificates are parsed once and TLS sessions
+    can be resumed across connections.
+    """
+    cache_key = (os.getpid(), get_crdp_config(properties).tls_signature)
+    context = _SSL_CONTEXTS.get(cache_key)
+    if context is None:
+        with _SSL_CONTEXTS_LOCK:
+            context = _SSL_CONTEXTS.get(cache_key)
+            if context is None:
+                for stale_key in [key for key in _SSL_CONTEXTS if key[0] != cache_key[0]]:
+                    del _SSL_CONTEXTS[stale_key]
+                context = _build_crdp_ssl_context(properties)
+                _SSL_CONTEXTS[cache_key] = context
+    return context
+
+
+def get_tls_session_stats() -> list[dict]:
+    """Connections opened, resumption attempts and resumed handshakes per shared SSLContext."""
+    with _SSL_CONTEXTS_LOCK:
+        contexts = [context for (pid, _), context in _SSL_CONTEXTS.items() if pid == os.getpid()]
+    return [context.snapshot() for context in contexts]
+
+
+class _CrdpHttpAdapter(HTTPAdapter):
+    """HTTPAdapter that opens every HTTPS connection with the shared CRDP SSLContext."""
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **pool_kwargs):
+        if self._ssl_context is not None:
+            pool_kwargs["ssl_context"] = self._ssl_context
+        return super().init_poolmanager(*args, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self._ssl_context is not None:
+            proxy_kwargs["ssl_context"] = self._ssl_context
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def _cert_reqs(self) -> str:
+        # The context is the source of truth; requests may substitute
+        # REQUESTS_CA_BUNDLE for session.verify=False.
+        return "CERT_NONE" if self._ssl_context.verify_mode == ssl.CERT_NONE else "CERT_REQUIRED"
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if self._ssl_context is not None:
+            for name in ("ca_certs", "ca_cert_dir", "cert_file", "key_file"):
+                pool_kwargs.pop(name, None)
+            pool_kwargs["ssl_context"] = self._ssl_context
+            pool_kwargs["cert_reqs"] = self._cert_reqs()
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        if self._ssl_context is None:
+            return super().cert_verify(conn, url, verify, cert)
+        # Trust anchors and the client certificate are already in the context.
+        conn.cert_reqs = self._cert_reqs()
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+
+
+def _mount_http_adapter(session: requests.Session, pool_maxsize: int, ssl_context: Optional[ssl.SSLContext] = None) -> None:
+    adapter = _CrdpHttpAdapter(ssl_context, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
 
-    signature = _build_http_session_signature(properties)
-    if _CACHED_HTTP_SESSION is not None and _CACHED_HTTP_SESSION_SIGNATURE == signature:
-        return _CACHED_HTTP_SESSION
 
-    session = _build_http_session(properties)
-    _CACHED_HTTP_SESSION = session
-    _CACHED_HTTP_SESSION_SIGNATURE = signature
+def _build_http_session(properties: dict, ssl_context: Optional[ssl.SSLContext] = None) -> requests.Session:
+    session = requests.Session()
+    _mount_http_adapter(session, get_crdp_http_pool_maxsize(properties), ssl_context)
+    session.verify = is_crdp_ssl_verify_server_enabled(properties)
     return session
 
 
-def post_json(url: str, payload: dict, properties: dict) -> dict:
-    session = get_http_session(properties)
-    timeout = (
-        get_crdp_connect_timeout_ms(properties) / 1000.0,
-        get_crdp_read_timeout_ms(properties) / 1000.0,
-    )
-    response = session.post(
-        url,
-        json=payload,
-        headers={"Content-Type": "application/json"},
-        timeout=timeout,
-    )
-    response.raise_for_status()
-    return response.json()
+class _ManagedHttpSession:
+    """
+    One pooled ``requests.Session`` owned by a single process.
 
+    Callers lease it for the duration of a request so concurrent use can be
+    counted. When more callers are in flight than the connection pool holds,
+    the pool is grown (doubling, up to CRDP_HTTP_POOL_MAX_LIMIT) so the extra
+    connections are kept alive instead of being discarded after each request.
+    """
 
-def debug_tls_materials(properties=None) -> dict:
-    props = _validate_properties(properties) or get_default_properties()
+    def __init__(self, properties: dict):
+        self.pid = os.getpid()
+        config = get_crdp_config(properties)
+        uses_tls = any(endpoint.startswith("https://") for endpoint in config.endpoints)
+        self.ssl_context = get_crdp_ssl_context(properties) if uses_tls else None
+        self.session = _build_http_session(properties, self.ssl_context)
+        self.pool_maxsize = get_crdp_http_pool_maxsize(properties)
+        self.pool_max_limit = get_crdp_http_pool_max_limit(properties)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.saturated_requests = 0
+        self.pool_resizes = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> requests.Session:
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.in_flight > self.pool_maxsize:
+                self.saturated_requests += 1
+                if self.pool_maxsize < self.pool_max_limit:
+                    self.pool_maxsize = min(self.pool_maxsize * 2, self.pool_max_limit)
+                    self.pool_resizes += 1
+                    replaced_adapter = self.session.adapters.get("https://")
+                    _mount_http_adapter(self.session, self.pool_maxsize, self.ssl_context)
+                    # Idle connections close now; requests still in flight finish
+                    # and their connections are closed when returned to the old pool.
+                    replaced_adapter.close()
+        return self.session
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pid": self.pid,
+                "pool_maxsize": self.pool_maxsize,
+                "pool_max_limit": self.pool_max_limit,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "requests": self.requests,
+                "saturated_requests": self.saturated_requests,
+                "pool_resizes": self.pool_resizes,
+            }
+
+
+def _get_managed_http_session(properties: dict) -> _ManagedHttpSession:
+    # The PID is part of the key so a forked Spark Python worker never reuses
+    # sockets that belong to its parent.
+    cache_key = (os.getpid(), get_crdp_config(properties).http_session_signature)
+    managed = _HTTP_SESSIONS.get(cache_key)
+    if managed is None:
+        with _HTTP_SESSIONS_LOCK:
+            managed = _HTTP_SESSIONS.get(cache_key)
+            if managed is None:
+                for stale_key in [key for key in _HTTP_SESSIONS if key[0] != cache_key[0]]:
+                    del _HTTP_SESSIONS[stale_key]
+                managed = _ManagedHttpSession(properties)
+                _HTTP_SESSIONS[cache_key] = managed
+    return managed
+
+
+def get_http_session(properties: dict) -> requests.Session:
+    return _get_managed_http_session(properties).session
+
+
+def get_http_session_pool_stats() -> list[dict]:
+    """Per-session pool size, in-flight and peak request counts, and how often the pool was saturated."""
+    with _HTTP_SESSIONS_LOCK:
+        sessions = [managed for (pid, _), managed in _HTTP_SESSIONS.items() if pid == os.getpid()]
+    return [managed.snapshot() for managed in sessions]
+
+
+def _reset_after_fork() -> None:
+    # Locks may have been held by threads that do not exist in the child, and
+    # the parent's pooled sockets and worker threads must not be reused.
+    # Balancers, breakers and adaptive controllers carry their own locks, so
+    # the child starts them afresh. The config and profile-index caches hold
+    # no locks and immutable values, so the child keeps them.
+    global _PROPERTIES_FILE_CACHE_LOCK, _HTTP_SESSIONS_LOCK, _SSL_CONTEXTS_LOCK, _REVEAL_USER_CACHE_LOCK
+    global _DEDUP_STATS_LOCK, _BULK_FAILURE_STATS_LOCK, _ADAPTIVE_CONTROLLERS_LOCK, _JSON_CODECS_LOCK
+    global _ENDPOINT_BALANCERS_LOCK, _RESILIENCE_STATES_LOCK, _HEDGE_EXECUTOR
+    global _BULK_EXECUTOR, _BULK_EXECUTOR_WORKERS, _BULK_EXECUTOR_LOCK
+    _PROPERTIES_FILE_CACHE_LOCK = threading.Lock()
+    _HTTP_SESSIONS_LOCK = threading.Lock()
+    _HTTP_SESSIONS.clear()
+    _SSL_CONTEXTS_LOCK = threading.Lock()
+    _SSL_CONTEXTS.clear()
+    _REVEAL_USER_CACHE_LOCK = threading.Lock()
+    _DEDUP_STATS_LOCK = threading.Lock()
+    _BULK_FAILURE_STATS_LOCK = threading.Lock()
+    _ADAPTIVE_CONTROLLERS_LOCK = threading.Lock()
+    _ADAPTIVE_CONTROLLERS.clear()
+    _JSON_CODECS_LOCK = threading.Lock()
+    _ENDPOINT_BALANCERS_LOCK = threading.Lock()
+    _ENDPOINT_BALANCERS.clear()
+    _RESILIENCE_STATES_LOCK = threading.Lock()
+    _RESILIENCE_STATES.clear()
+    _HEDGE_EXECUTOR = None
+    _BULK_EXECUTOR = None
+    _BULK_EXECUTOR_WORKERS = 0
+    _BULK_EXECUTOR_LOCK = threading.Lock()
+    crdp_metrics._reset_after_fork()
+    reveal_cache_module = sys.modules.get(f"{__package__}.crdp_reveal_cache")
+    if reveal_cache_module is not None:
+        reveal_cache_module._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@dataclass(frozen=True)
+class _JsonCodec:
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _stdlib_json_dumps(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+_JSON_CODECS["json"] = _JsonCodec("json", _stdlib_json_dumps, json.loads)
+
+
+def register_json_codec(name: str, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]) -> None:
+    """Make a JSON library selectable with CRDP_JSON_CODEC=<name>; ``dumps`` must return UTF-8 bytes."""
+    _JSON_CODECS[str(name).lower()] = _JsonCodec(str(name).lower(), dumps, loads)
+
+
+def _load_orjson_codec() -> Optional[_JsonCodec]:
+    global _ORJSON_IMPORT_ATTEMPTED
+    if "orjson" not in _JSON_CODECS and not _ORJSON_IMPORT_ATTEMPTED:
+        with _JSON_CODECS_LOCK:
+            if not _ORJSON_IMPORT_ATTEMPTED:
+                try:
+                    import orjson  # type: ignore
+
+                    _JSON_CODECS["orjson"] = _JsonCodec("orjson", orjson.dumps, orjson.loads)
+                except ImportError:
+                    pass
+                _ORJSON_IMPORT_ATTEMPTED = True
+    return _JSON_CODECS.get("orjson")
+
+
+def get_json_codec(properties: dict) -> _JsonCodec:
+    """
+    CRDP_JSON_CODEC selects the JSON library for request and response bodies:
+    ``auto`` (default, orjson when installed, else the stdlib), ``json``,
+    ``orjson`` or a name registered with ``register_json_codec``.
+    """
+    name = first_non_blank(properties.get("CRDP_JSON_CODEC"), properties.get("crdp.json.codec"), "auto").lower()
+    if name == "auto":
+        return _load_orjson_codec() or _JSON_CODECS["json"]
+    if name == "orjson" and _load_orjson_codec() is None:
+        raise ValueError("CRDP_JSON_CODEC is orjson but the orjson package is not installed.")
+    codec = _JSON_CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown CRDP_JSON_CODEC '{name}'.")
+    return codec
+
+
+def _record_request_metrics(url: str, payload: dict, request_bytes: int, response_bytes: int, elapsed_seconds: float, error=None) -> None:
+    endpoint, _, mode = url.rpartition("/v1/")
+    element_count = len(payload.get("data_array") or payload.get("protected_data_array") or ())
+    record_crdp_request(
+        mode,
+        payload.get("protection_policy_name"),
+        endpoint,
+        element_count,
+        request_bytes,
+        response_bytes,
+        elapsed_seconds,
+        error,
+    )
+
+
+def post_json(url: str, payload: dict, properties: dict, parse_response=None):
+    """
+    POST ``payload`` with the configured JSON codec and return the decoded body,
+    or ``parse_response(body_bytes)`` when a parser is given.
+    """
+    managed_session = _get_managed_http_session(properties)
+    codec = get_json_codec(properties)
+    timeout = get_crdp_config(properties).timeout
+    body = codec.dumps(payload)
+    metrics_enabled = is_crdp_metrics_enabled(properties)
+    started = time.monotonic()
+    session = managed_session.acquire()
+    try:
+        response = session.post(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+    except Exception as ex:
+        if metrics_enabled:
+            _record_request_metrics(url, payload, len(body), 0, time.monotonic() - started, describe_error(ex))
+        raise
+    finally:
+        managed_session.release()
+    if metrics_enabled:
+        _record_request_metrics(url, payload, len(body), len(response.content), time.monotonic() - started)
+    if parse_response is not None:
+        return parse_response(response.content)
+    return codec.loads(response.content)
+
+
+class CrdpCircuitOpenError(requests.ConnectionError):
+    """Raised without contacting CRDP while the circuit breaker is open."""
+
+
+def get_crdp_retry_max_attempts(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_RETRY_MAX_ATTEMPTS"), properties.get("crdp.retry.max.attempts")),
+        3,
+    )
+
+
+def get_crdp_retry_backoff_base_ms(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_RETRY_BACKOFF_BASE_MS"), properties.get("crdp.retry.backoff.base.ms")),
+        100,
+    )
+
+
+def get_crdp_retry_backoff_max_ms(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_RETRY_BACKOFF_MAX_MS"), properties.get("crdp.retry.backoff.max.ms")),
+        2000,
+    )
+
+
+def is_crdp_hedge_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(properties.get("CRDP_HEDGE_ENABLED"), properties.get("crdp.hedge.enabled")),
+        False,
+    )
+
+
+def get_crdp_hedge_percentile(properties: dict) -> int:
+    return min(
+        _parse_positive_int(
+            first_non_blank(properties.get("CRDP_HEDGE_PERCENTILE"), properties.get("crdp.hedge.percentile")),
+            95,
+        ),
+        99,
+    )
+
+
+def get_crdp_hedge_max_in_flight(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_HEDGE_MAX_IN_FLIGHT"), properties.get("crdp.hedge.max.in.flight")),
+        4,
+    )
+
+
+def is_crdp_circuit_breaker_enabled(properties: dict) -> bool:
+    return _parse_boolean_flag(
+        first_non_blank(properties.get("CRDP_CIRCUIT_BREAKER_ENABLED"), properties.get("crdp.circuit.breaker.enabled")),
+        True,
+    )
+
+
+def get_crdp_circuit_breaker_failure_threshold(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(
+            properties.get("CRDP_CIRCUIT_BREAKER_FAILURE_THRESHOLD"),
+            properties.get("crdp.circuit.breaker.failure.threshold"),
+        ),
+        5,
+    )
+
+
+def get_crdp_circuit_breaker_reset_ms(properties: dict) -> int:
+    return _parse_positive_int(
+        first_non_blank(properties.get("CRDP_CIRCUIT_BREAKER_RESET_MS"), properties.get("crdp.circuit.breaker.reset.ms")),
+        30000,
+    )
+
+
+def _is_retryable_error(ex: Exception) -> bool:
+    """Transient failures worth another attempt: connection errors, timeouts, 429 and 5xx."""
+    if isinstance(ex, CrdpCircuitOpenError):
+        return False
+    if isinstance(ex, requests.HTTPError):
+        response = ex.response
+        return response is None or response.status_code == 429 or response.status_code >= 500
+    return isinstance(ex, _TRANSIENT_REQUEST_ERRORS)
+
+
+def _is_breaker_failure(ex: Exception) -> bool:
+    """
+    Errors that count against the circuit breaker. Only CRDP rejecting the
+    request data (400/422) shows a healthy server; auth failures (401/403),
+    wrong paths (404) and transient errors all mean calls with these settings
+    will keep failing.
+    """
+    if isinstance(ex, requests.HTTPError) and ex.response is not None:
+        return ex.response.status_code not in _ISOLATABLE_HTTP_STATUSES
+    return True
+
+
+def _retry_backoff_seconds(properties: dict, attempt: int) -> float:
+    """Full-jitter exponential backoff for the given 1-based attempt number."""
+    ceiling_ms = min(get_crdp_retry_backoff_max_ms(properties), get_crdp_retry_backoff_base_ms(properties) * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling_ms) / 1000.0
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker shared by every caller of one CRDP
+    endpoint set and HTTP session settings.
+
+    After ``failure_threshold`` failures in a row (see ``_is_breaker_failure``) the breaker opens
+    and calls fail fast with CrdpCircuitOpenError. Once ``reset_seconds`` have
+    passed a single trial call is let through; its outcome closes or re-opens
+    the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                return True
+            return False
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if success:
+                self.state = "closed"
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class _LatencyWindow:
+    """Recent successful request latencies, used to derive the hedging delay."""
+
+    _MIN_SAMPLES = 20
+
+    def __init__(self, size: int = 256):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, elapsed_seconds: float) -> None:
+        with self._lock:
+            self._samples.append(elapsed_seconds)
+
+    def percentile(self, percentile: int) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self._MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100.0))]
+
+
+class _ResilienceState:
+    def __init__(self, properties: dict):
+        self.circuit_breaker = (
+            _CircuitBreaker(
+                get_crdp_circuit_breaker_failure_threshold(properties),
+                get_crdp_circuit_breaker_reset_ms(properties) / 1000.0,
+            )
+            if is_crdp_circuit_breaker_enabled(properties)
+            else None
+        )
+        self.latencies = _LatencyWindow()
+        # Synchronous hedges cannot be cancelled, so the losers still running are capped.
+        self.hedge_slots = threading.BoundedSemaphore(get_crdp_hedge_max_in_flight(properties))
+
+
+def get_resilience_state(properties: dict) -> _ResilienceState:
+    # Settings that fail differently (TLS material, timeouts) get their own breaker.
+    config = get_crdp_config(properties)
+    cache_key = (
+        config.endpoints,
+        config.http_session_signature,
+        is_crdp_circuit_breaker_enabled(properties),
+        get_crdp_circuit_breaker_failure_threshold(properties),
+        get_crdp_circuit_breaker_reset_ms(properties),
+    )
+    state = _RESILIENCE_STATES.get(cache_key)
+    if state is None:
+        with _RESILIENCE_STATES_LOCK:
+            state = _RESILIENCE_STATES.get(cache_key)
+            if state is None:
+                state = _ResilienceState(properties)
+                _RESILIENCE_STATES[cache_key] = state
+    return state
+
+
+def _get_hedge_executor(properties: dict) -> ThreadPoolExecutor:
+    global _HEDGE_EXECUTOR
+    if _HEDGE_EXECUTOR is None:
+        with _RESILIENCE_STATES_LOCK:
+            if _HEDGE_EXECUTOR is None:
+                _HEDGE_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=get_crdp_http_pool_maxsize(properties) * 2,
+                    thread_name_prefix="thales-crdp-hedge",
+                )
+    return _HEDGE_EXECUTOR
+
+
+def _post_to_balanced_endpoint(mode: str, payload: dict, properties: dict, parse_response=None):
+    balancer = get_endpoint_balancer(properties)
+    endpoint = balancer.acquire()
+    started = time.monotonic()
+    try:
+        response_json = post_json(f"{endpoint.base_url}/v1/{mode}", payload, properties, parse_response)
+    except Exception as ex:
+        balancer.release(endpoint, time.monotonic() - started, _is_endpoint_failure(ex))
+        raise
+    balancer.release(endpoint, time.monotonic() - started, False)
+    return response_json
+
+
+def _post_hedged(mode: str, payload: dict, properties: dict, state: _ResilienceState, hedge_delay: float, parse_response=None):
+    """
+    Send the request and, if it has not answered within ``hedge_delay``, send a
+    second copy. The first successful response wins; the slower request is
+    left to finish in the background. At most CRDP_HEDGE_MAX_IN_FLIGHT hedges
+    run at once; past that the caller just waits for its first request.
+    """
+    executor = _get_hedge_executor(properties)
+    primary = executor.submit(_post_to_balanced_endpoint, mode, payload, properties, parse_response)
+    done, _ = wait([primary], timeout=hedge_delay)
+    if done or not state.hedge_slots.acquire(blocking=False):
+        return primary.result()
+
+    try:
+        hedge = executor.submit(_post_to_balanced_endpoint, mode, payload, properties, parse_response)
+    except BaseException:
+        state.hedge_slots.release()
+        raise
+    hedge.add_done_callback(lambda _: state.hedge_slots.release())
+    pending = {primary, hedge}
+    first_error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            first_error = first_error or future.exception()
+    raise first_error
+
+
+def post_to_crdp(mode: str, payload: dict, properties: dict, parse_response=None):
+    """
+    POST ``payload`` to ``/v1/<mode>`` through the resilience layer.
+
+    Each attempt goes to the endpoint chosen by the balancer. Transient
+    failures are retried up to CRDP_RETRY_MAX_ATTEMPTS times with jittered
+    exponential backoff, optional hedged requests are sent after the recent
+    CRDP_HEDGE_PERCENTILE latency, and the circuit breaker fails fast while
+    CRDP is down. ``parse_response`` is passed through to ``post_json``.
+    """
+    state = get_resilience_state(properties)
+    breaker = state.circuit_breaker
+    max_attempts = get_crdp_retry_max_attempts(properties)
+    hedge_enabled = is_crdp_hedge_enabled(properties)
+    call_started = time.monotonic()
+
+    try:
+        for attempt in range(1, max_attempts + 1):
+            if breaker is not None and not breaker.allow():
+                raise CrdpCircuitOpenError("CRDP circuit breaker is open; failing fast without contacting CRDP.")
+
+            hedge_delay = state.latencies.percentile(get_crdp_hedge_percentile(properties)) if hedge_enabled else None
+            started = time.monotonic()
+            try:
+                if hedge_delay is None:
+                    response_json = _post_to_balanced_endpoint(mode, payload, properties, parse_response)
+                else:
+                    response_json = _post_hedged(mode, payload, properties, state, hedge_delay, parse_response)
+            except Exception as ex:
+                retryable = _is_retryable_error(ex)
+                if breaker is not None:
+                    breaker.record(not _is_breaker_failure(ex))
+                if not retryable or attempt == max_attempts:
+                    raise
+                time.sleep(_retry_backoff_seconds(properties, attempt))
+                continue
+
+            state.latencies.add(time.monotonic() - started)
+            if breaker is not None:
+                breaker.record(True)
+            return response_json
+    finally:
+        if is_crdp_metrics_enabled(properties):
+            observe_histogram(
+                "thales_crdp_client_call_latency_seconds",
+                (mode, payload.get("protection_policy_name") or ""),
+                time.monotonic() - call_started,
+            )
+
+
+def debug_tls_materials(properties=None) -> dict:
+    props = _validate_properties(properties) or get_default_properties()
     ca_cert_path, client_cert_path, client_key_path = _resolve_tls_material_paths(props)
 
     result = {
@@ -617,6 +2055,13 @@ def debug_tls_materials(properties=None) -> dict:
         result["client_cert_chain_load_ok"] = False
         result["client_cert_chain_load_error"] = f"{type(ex).__name__}: {ex}"
 
+    try:
+        get_crdp_ssl_context(props)
+        result["ssl_context_ok"] = True
+    except Exception as ex:
+        result["ssl_context_ok"] = False
+        result["ssl_context_error"] = f"{type(ex).__name__}: {ex}"
+
     return result
 
 
@@ -641,35 +2086,26 @@ def _validate_spark_session(spark_session):
     )
 
 
-def thales_crdp_python_protect_with_external_header(
-    value,
-    datatype,
-    column_name=None,
-    object_name=None,
-    *,
-    properties=None,
-    spark_session=None,
-):
+def _prepare_protect_with_external_header(value, datatype, column_name, object_name, properties, spark_session):
     validated_properties = _validate_properties(properties)
     _validate_spark_session(spark_session)
     props = validated_properties or get_default_properties()
 
     if value is None:
-        return {"protected_value": None, "external_header": None}
+        return props, None, None, None
 
-    normalized_value = value
-    if str(datatype).lower() != "char":
-        normalized_value = check_valid(value, datatype, get_bad_data_tag(props))
-    else:
-        normalized_value = check_valid(value, datatype, get_bad_data_tag(props))
+    normalized_value = check_valid(value, datatype, get_crdp_config(props).bad_data_tag)
 
     policy_name, policy_type = resolve_profile(props, datatype, column_name, object_name, "protectbulk")
-    url = build_url(props, "protectbulk")
+    get_crdp_endpoints(props)
     payload = {
         "protection_policy_name": policy_name,
         "data_array": [normalized_value],
     }
-    response_json = post_json(url, payload, props)
+    return props, normalized_value, policy_type, payload
+
+
+def _extract_external_header_result(response_json: dict, normalized_value, policy_type) -> dict:
     items = response_json.get("protected_data_array", [])
     if not items:
         return {"protected_value": normalized_value, "external_header": None}
@@ -681,6 +2117,25 @@ def thales_crdp_python_protect_with_external_header(
     }
 
 
+def thales_crdp_python_protect_with_external_header(
+    value,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    props, normalized_value, policy_type, payload = _prepare_protect_with_external_header(
+        value, datatype, column_name, object_name, properties, spark_session
+    )
+    if payload is None:
+        return {"protected_value": None, "external_header": None}
+
+    response_json = post_to_crdp("protectbulk", payload, props)
+    return _extract_external_header_result(response_json, normalized_value, policy_type)
+
+
 def thales_crdp_python_protect_with_external_header_by_object(
     value,
     datatype,
@@ -700,7 +2155,607 @@ def thales_crdp_python_protect_with_external_header_by_object(
     )
 
 
-def _thales_crdp_python_function_bulk_impl(
+def _build_chunk_ranges(total: int, batch_size: int) -> list[tuple[int, int]]:
+    return [(start, min(start + batch_size, total)) for start in range(0, total, batch_size)]
+
+
+def _dispatch_bulk_chunks(
+    chunk_count: int,
+    send_chunk,
+    properties: dict,
+    max_workers: Optional[int] = None,
+    chunk_labels: Optional[list] = None,
+) -> list:
+    """
+    Run ``send_chunk(index)`` for every chunk and return the results in chunk order.
+
+    Chunks are sent concurrently on the shared HTTP session, bounded by
+    CRDP_BULK_MAX_WORKERS (or ``max_workers`` when the adaptive controller
+    chose one) and the HTTP pool size so workers never queue for a pooled
+    connection. A single chunk is sent inline without a thread pool. When
+    ``chunk_labels`` holds a (mode, policy) per chunk, the time each chunk
+    waited for a worker is recorded.
+
+    The worker threads belong to one process-wide pool, so a call does not
+    start and join threads of its own. Each call runs at most ``max_workers``
+    loops on it that take the next unsent chunk; after a chunk fails, no
+    further chunks of that call are sent.
+    """
+    pool_workers = min(max_workers or get_crdp_bulk_max_workers(properties), get_crdp_http_pool_maxsize(properties))
+    max_workers = min(pool_workers, chunk_count)
+    if max_workers <= 1:
+        return [send_chunk(chunk_index) for chunk_index in range(chunk_count)]
+
+    run_chunk = send_chunk
+    if chunk_labels is not None:
+        dispatch_started = time.monotonic()
+
+        def run_chunk(chunk_index):
+            observe_histogram("thales_crdp_client_queue_wait_seconds", chunk_labels[chunk_index], time.monotonic() - dispatch_started)
+            return send_chunk(chunk_index)
+
+    results = [None] * chunk_count
+    unsent = iter(range(chunk_count))
+    unsent_lock = threading.Lock()
+    failed = threading.Event()
+
+    def work():
+        while not failed.is_set():
+            with unsent_lock:
+                chunk_index = next(unsent, None)
+            if chunk_index is None:
+                return
+            try:
+                results[chunk_index] = run_chunk(chunk_index)
+            except BaseException:
+                failed.set()
+                raise
+
+    workers = _submit_bulk_workers(work, max_workers, pool_workers)
+    wait(workers)
+    for worker in workers:
+        worker.result()
+    return results
+
+
+def _submit_bulk_workers(work, count: int, pool_workers: int) -> list:
+    """
+    Submit ``count`` copies of ``work`` to the shared bulk pool, first growing
+    it to ``pool_workers`` threads if it is smaller.
+    """
+    global _BULK_EXECUTOR, _BULK_EXECUTOR_WORKERS
+    with _BULK_EXECUTOR_LOCK:
+        if _BULK_EXECUTOR is None or _BULK_EXECUTOR_WORKERS < pool_workers:
+            if _BULK_EXECUTOR is not None:
+                # Work already queued on the old pool still runs; its threads exit afterwards.
+                _BULK_EXECUTOR.shutdown(wait=False)
+            _BULK_EXECUTOR = ThreadPoolExecutor(max_workers=pool_workers, thread_name_prefix="thales-crdp-bulk")
+            _BULK_EXECUTOR_WORKERS = pool_workers
+        return [_BULK_EXECUTOR.submit(work) for _ in range(count)]
+
+
+def _build_bulk_payload(
+    mode,
+    values,
+    policy_name,
+    policy_type,
+    key_metadata_location,
+    external_version,
+    external_versions=None,
+    username=None,
+) -> dict:
+    if mode == "protectbulk":
+        return {
+            "protection_policy_name": policy_name,
+            "data_array": values,
+        }
+
+    effective_key_metadata_location = key_metadata_location if policy_type != "none" else "none"
+    default_external_version = external_version if policy_type == "external" else None
+    if external_versions is None:
+        return prepare_reveal_input(
+            values,
+            policy_name,
+            effective_key_metadata_location,
+            external_version=default_external_version,
+            username=username,
+        )
+    return prepare_reveal_input_with_versions(
+        values,
+        policy_name,
+        effective_key_metadata_location,
+        external_versions=external_versions if policy_type == "external" else None,
+        external_version=default_external_version,
+        username=username,
+    )
+
+
+def _extract_bulk_results(mode, response_json: dict) -> list:
+    if mode == "protectbulk":
+        return [item["protected_data"] for item in response_json.get("protected_data_array", [])]
+    return [item["data"] for item in response_json.get("data_array", [])]
+
+
+def _extract_bulk_header_results(response_json: dict) -> list:
+    return [(item["protected_data"], item.get("external_version")) for item in response_json.get("protected_data_array", [])]
+
+
+def _deduplicate_values(values: list) -> tuple[list, list]:
+    """
+    Return (unique_values, positions) where ``unique_values[positions[i]] == values[i]``.
+
+    Only valid for deterministic (internal/none) policies, where equal inputs
+    always produce equal outputs.
+    """
+    unique_index = {}
+    positions = []
+    for value in values:
+        position = unique_index.get(value)
+        if position is None:
+            position = len(unique_index)
+            unique_index[value] = position
+        positions.append(position)
+
+    with _DEDUP_STATS_LOCK:
+        _DEDUP_STATS["calls"] += 1
+        _DEDUP_STATS["input_values"] += len(values)
+        _DEDUP_STATS["sent_values"] += len(unique_index)
+    return list(unique_index), positions
+
+
+def get_dedup_stats() -> dict:
+    with _DEDUP_STATS_LOCK:
+        stats = dict(_DEDUP_STATS)
+    stats["dedup_ratio"] = stats["input_values"] / stats["sent_values"] if stats["sent_values"] else 1.0
+    return stats
+
+
+def reset_dedup_stats() -> None:
+    with _DEDUP_STATS_LOCK:
+        for name in _DEDUP_STATS:
+            _DEDUP_STATS[name] = 0
+
+
+class _AdaptiveBatchController:
+    """
+    AIMD controller for the bulk chunk size and the number of concurrent chunks.
+
+    Every chunk reports its size, latency and response payload bytes. A failed
+    chunk halves the chunk size and drops one worker; a chunk slower than the
+    latency target or larger than the payload limit halves the chunk size.
+    Otherwise, after each window of successful chunks, the estimated
+    throughput is compared with the previous window: while it improves the
+    chunk size grows additively (then concurrency, once the chunk size is at
+    its maximum); when it drops, the last step is undone.
+    """
+
+    _WINDOW_CHUNKS = 8
+    _MIN_IMPROVEMENT = 0.95
+
+    def __init__(self, min_batch, max_batch, initial_batch, initial_workers, max_workers, target_latency_seconds, max_payload_bytes):
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.max_workers = max_workers
+        self.target_latency_seconds = target_latency_seconds
+        self.max_payload_bytes = max_payload_bytes
+        self.batch_size = min(max(initial_batch, min_batch), max_batch)
+        self.workers = min(max(initial_workers, 1), max_workers)
+        self.ewma_latency_seconds = None
+        self.last_throughput = None
+        self.measured_throughput = None
+        self.increases = 0
+        self.decreases = 0
+        self._last_step = None
+        self._window_chunks = 0
+        self._window_values = 0
+        self._window_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> tuple[int, int]:
+        with self._lock:
+            return self.batch_size, self.workers
+
+    def record(self, value_count: int, elapsed_seconds: float, payload_bytes: int, failed: bool = False) -> None:
+        with self._lock:
+            if not failed:
+                self.ewma_latency_seconds = (
+                    elapsed_seconds
+                    if self.ewma_latency_seconds is None
+                    else 0.8 * self.ewma_latency_seconds + 0.2 * elapsed_seconds
+                )
+            if failed or elapsed_seconds > self.target_latency_seconds or payload_bytes > self.max_payload_bytes:
+                self._decrease(drop_worker=failed)
+                return
+
+            self._window_chunks += 1
+            self._window_values += value_count
+            self._window_seconds += elapsed_seconds
+            if self._window_chunks < self._WINDOW_CHUNKS:
+                return
+            throughput = self._window_values / max(self._window_seconds, 1e-9) * self.workers
+            self.measured_throughput = throughput
+            self._reset_window()
+            if self.last_throughput is not None and throughput < self.last_throughput * self._MIN_IMPROVEMENT:
+                self._undo_last_step()
+                self.last_throughput = None
+                return
+            self.last_throughput = throughput
+            self._increase()
+
+    def _increase(self) -> None:
+        if self.batch_size < self.max_batch:
+            step = min(self.min_batch, self.max_batch - self.batch_size)
+            self.batch_size += step
+            self._last_step = ("batch", step)
+        elif self.workers < self.max_workers:
+            self.workers += 1
+            self._last_step = ("workers", 1)
+        else:
+            self._last_step = None
+            return
+        self.increases += 1
+
+    def _undo_last_step(self) -> None:
+        if self._last_step is not None:
+            kind, step = self._last_step
+            if kind == "batch":
+                self.batch_size = max(self.min_batch, self.batch_size - step)
+            else:
+                self.workers = max(1, self.workers - step)
+            self.decreases += 1
+        self._last_step = None
+
+    def _decrease(self, drop_worker: bool) -> None:
+        self.batch_size = max(self.min_batch, self.batch_size // 2)
+        if drop_worker:
+            self.workers = max(1, self.workers - 1)
+        self.decreases += 1
+        self.last_throughput = None
+        self._last_step = None
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_chunks = 0
+        self._window_values = 0
+        self._window_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "batch_size": self.batch_size,
+                "max_workers": self.workers,
+                "ewma_latency_ms": None if self.ewma_latency_seconds is None else self.ewma_latency_seconds * 1000.0,
+                "throughput_values_per_second": self.measured_throughput,
+                "increases": self.increases,
+                "decreases": self.decreases,
+            }
+
+
+def get_adaptive_batch_controller(properties: dict, mode: str) -> Optional[_AdaptiveBatchController]:
+    """Shared controller for one CRDP endpoint set and bulk mode, or None when adaptive batching is off."""
+    if not is_crdp_adaptive_batch_enabled(properties):
+        return None
+    cache_key = (
+        get_crdp_config(properties).endpoints,
+        mode,
+        get_crdp_adaptive_batch_min(properties),
+        get_crdp_adaptive_batch_max(properties),
+        get_crdp_adaptive_max_workers(properties),
+    )
+    controller = _ADAPTIVE_CONTROLLERS.get(cache_key)
+    if controller is None:
+        with _ADAPTIVE_CONTROLLERS_LOCK:
+            controller = _ADAPTIVE_CONTROLLERS.get(cache_key)
+            if controller is None:
+                controller = _AdaptiveBatchController(
+                    get_crdp_adaptive_batch_min(properties),
+                    get_crdp_adaptive_batch_max(properties),
+                    get_crdp_batch_size(properties),
+                    get_crdp_bulk_max_workers(properties),
+                    get_crdp_adaptive_max_workers(properties),
+                    get_crdp_adaptive_target_latency_ms(properties) / 1000.0,
+                    get_crdp_adaptive_max_payload_bytes(properties),
+                )
+                _ADAPTIVE_CONTROLLERS[cache_key] = controller
+    return controller
+
+
+def get_adaptive_batch_stats() -> list[dict]:
+    """Chunk size, concurrency and throughput currently chosen by each adaptive controller."""
+    with _ADAPTIVE_CONTROLLERS_LOCK:
+        controllers = list(_ADAPTIVE_CONTROLLERS.items())
+    stats = []
+    for (endpoints, mode, *_), controller in controllers:
+        entry = {"endpoints": list(endpoints), "mode": mode}
+        entry.update(controller.snapshot())
+        stats.append(entry)
+    return stats
+
+
+def get_bulk_failure_stats() -> dict:
+    with _BULK_FAILURE_STATS_LOCK:
+        return dict(_BULK_FAILURE_STATS)
+
+
+def reset_bulk_failure_stats() -> None:
+    with _BULK_FAILURE_STATS_LOCK:
+        for name in _BULK_FAILURE_STATS:
+            _BULK_FAILURE_STATS[name] = 0
+
+
+# Statuses CRDP uses to reject the data in a request. Anything else (5xx, 401,
+# 403, 404, 429) means CRDP or the caller's access is at fault, not the values.
+_ISOLATABLE_HTTP_STATUSES = frozenset({400, 422})
+
+
+def _is_isolatable_error(ex: Exception) -> bool:
+    """
+    CRDP rejections that may be caused by the values in the request. Only these
+    are worth splitting the request for; a response that cannot be decoded or
+    does not match the request is a protocol error and is never bisected.
+    """
+    return (
+        isinstance(ex, requests.HTTPError)
+        and ex.response is not None
+        and ex.response.status_code in _ISOLATABLE_HTTP_STATUSES
+    )
+
+
+def _is_same_rejection(first: Exception, second: Exception) -> bool:
+    return (
+        first.response.status_code == second.response.status_code
+        and first.response.content == second.response.content
+    )
+
+
+class _IsolationBudget:
+    """Bisection requests one bulk call may still send (``CRDP_BULK_FAILURE_ISOLATION_MAX_REQUESTS``)."""
+
+    def __init__(self, max_requests: int):
+        self.remaining = max_requests
+        self._lock = threading.Lock()
+
+    def take(self, count: int) -> bool:
+        with self._lock:
+            if self.remaining < count:
+                return False
+            self.remaining -= count
+            return True
+
+
+class _BulkResponseParser:
+    """
+    ``parse_response`` callable for one bulk request; remembers the response size.
+
+    With ``with_headers`` each result is a ``(protected_data, external_version)`` pair.
+    """
+
+    def __init__(self, mode: str, codec: _JsonCodec, with_headers: bool = False):
+        self.mode = mode
+        self.codec = codec
+        self.with_headers = with_headers
+        self.response_bytes = 0
+
+    def __call__(self, body: bytes) -> list:
+        self.response_bytes = len(body)
+        if self.with_headers:
+            return _extract_bulk_header_results(self.codec.loads(body))
+        return _extract_bulk_results(self.mode, self.codec.loads(body))
+
+
+def _reveal_cache_field(value) -> str:
+    text = "" if value is None else str(value)
+    return f"{len(text)}:{text}"
+
+
+class _RevealCacheLookup:
+    """
+    Reveal cache hits for one bulk call.
+
+    ``merge`` places the CRDP results for the values that were still sent
+    between the hits and stores the successful ones in the cache.
+    """
+
+    def __init__(self, cache, ttl_seconds: float, results: list, miss_indexes: list, miss_materials: list):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.results = results
+        self.miss_indexes = miss_indexes
+        self.miss_materials = miss_materials
+
+    def merge(self, results: list, failed_indexes: Optional[list]) -> tuple[list, list]:
+        failed = set(failed_indexes or ())
+        self.cache.put_many(
+            [
+                (material, value)
+                for index, (material, value) in enumerate(zip(self.miss_materials, results))
+                if index not in failed and material is not None and isinstance(value, str)
+            ],
+            self.ttl_seconds,
+        )
+        merged = list(self.results)
+        for position, value in zip(self.miss_indexes, results):
+            merged[position] = value
+        return merged, [self.miss_indexes[index] for index in failed_indexes or ()]
+
+
+def _reveal_cache_layout(props: dict) -> tuple:
+    return (
+        get_crdp_reveal_cache_dir(props),
+        get_crdp_reveal_cache_max_entries(props),
+        get_crdp_reveal_cache_max_value_bytes(props),
+    )
+
+
+def _open_reveal_cache(props: dict):
+    # Imported on first use so UDFs that never enable the cache do not pay for it.
+    from .crdp_reveal_cache import open_reveal_cache
+
+    return open_reveal_cache(*_reveal_cache_layout(props))
+
+
+def _lookup_reveal_cache(props, policy_name, policy_type, reveal_user, values, external_versions, default_external_version):
+    """
+    Split reveal ``values`` into shared-cache hits and the values still to send.
+
+    Entries are keyed by the CRDP endpoints, policy, reveal user, external
+    version and ciphertext, so a hit is only ever served to the user CRDP
+    revealed that value for. Returns the values and external versions to send
+    plus the lookup for ``_BulkCall.finish``, or the inputs unchanged and
+    ``None`` when the cache cannot be opened.
+    """
+    cache = _open_reveal_cache(props)
+    if cache is None:
+        return values, external_versions, None
+
+    scope = "".join(
+        _reveal_cache_field(part) for part in (",".join(get_crdp_config(props).endpoints), policy_name, reveal_user)
+    )
+    # Mirrors _build_bulk_payload: only external policies send a version.
+    default_version = _reveal_cache_field(default_external_version if policy_type == "external" else None)
+    per_value_versions = external_versions is not None and policy_type == "external"
+    materials = [
+        None
+        if value is None
+        else (
+            scope
+            + (_reveal_cache_field(external_versions[index]) if per_value_versions else default_version)
+            + _reveal_cache_field(value)
+        ).encode("utf-8")
+        for index, value in enumerate(values)
+    ]
+    results = cache.get_many(materials)
+    miss_indexes = [index for index, value in enumerate(results) if value is None]
+    lookup = _RevealCacheLookup(
+        cache,
+        get_crdp_reveal_cache_ttl_seconds(props),
+        results,
+        miss_indexes,
+        [materials[index] for index in miss_indexes],
+    )
+    if len(miss_indexes) == len(values):
+        return values, external_versions, lookup
+    return (
+        [values[index] for index in miss_indexes],
+        None if external_versions is None else [external_versions[index] for index in miss_indexes],
+        lookup,
+    )
+
+
+def get_reveal_cache_stats(properties: Optional[dict] = None) -> dict:
+    """
+    Node-wide hit, miss, store, eviction and expiry counters of the shared
+    reveal cache. When the cache is enabled but could not be opened,
+    ``disabled_reason`` says why.
+    """
+    props = properties or get_default_properties()
+    if not is_crdp_reveal_cache_enabled(props):
+        return {"enabled": False}
+    cache = _open_reveal_cache(props)
+    if cache is None:
+        from .crdp_reveal_cache import get_disabled_reason
+
+        return {"enabled": False, "disabled_reason": get_disabled_reason(*_reveal_cache_layout(props))}
+    return dict(cache.stats(), enabled=True)
+
+
+def clear_reveal_cache(properties: Optional[dict] = None, unlink: bool = False) -> None:
+    """
+    Wipe the shared reveal cache for every worker on this node, e.g. after
+    access was revoked. With ``unlink=True`` the region file is also removed
+    from ``CRDP_REVEAL_CACHE_DIR``, e.g. when retiring the cache.
+    """
+    props = properties or get_default_properties()
+    if not is_crdp_reveal_cache_enabled(props):
+        return
+    cache = _open_reveal_cache(props)
+    if cache is None:
+        return
+    if unlink:
+        from .crdp_reveal_cache import close_reveal_cache
+
+        close_reveal_cache(*_reveal_cache_layout(props), unlink=True)
+    else:
+        cache.clear()
+
+
+@dataclass
+class _BulkCall:
+    props: dict
+    mode: str
+    policy_name: Optional[str]
+    policy_type: str
+    key_metadata_location: str
+    external_version: str
+    reveal_user: Optional[str]
+    values: list
+    external_versions: Optional[list]
+    chunk_ranges: list
+    return_ciphertext_on_error: bool
+    dedup_positions: Optional[list] = None
+    isolate_failures: bool = False
+    isolation_budget: Optional[_IsolationBudget] = None
+    bad_data_tag: str = BADDATATAG
+    adaptive: Optional[_AdaptiveBatchController] = None
+    max_workers: Optional[int] = None
+    with_headers: bool = False
+    reveal_cache: Optional[_RevealCacheLookup] = None
+    # Set by finish(): input elements that got the bad data tag or ciphertext passthrough.
+    failed_count: int = 0
+
+    def expand(self, results: list) -> list:
+        """Map results for the values actually sent back onto the original input positions."""
+        if self.dedup_positions is None:
+            return results
+        return [results[position] for position in self.dedup_positions]
+
+    def failed_value(self, index: int):
+        value = self.values[index] if self.return_ciphertext_on_error else self.bad_data_tag
+        return (value, None) if self.with_headers else value
+
+    def finish(self, results: list, failed_indexes: Optional[list] = None) -> list:
+        """Expand ``results`` to input order and record how many input elements failed."""
+        if self.reveal_cache is not None:
+            results, failed_indexes = self.reveal_cache.merge(results, failed_indexes)
+        failed_count = 0
+        if failed_indexes:
+            if self.dedup_positions is None:
+                failed_count = len(failed_indexes)
+            else:
+                failed_positions = set(failed_indexes)
+                failed_count = sum(1 for position in self.dedup_positions if position in failed_positions)
+        with _BULK_FAILURE_STATS_LOCK:
+            _BULK_FAILURE_STATS["calls"] += 1
+            _BULK_FAILURE_STATS["failed_calls"] += 1 if failed_count else 0
+            _BULK_FAILURE_STATS["failed_values"] += failed_count
+        self.failed_count = failed_count
+        # A plain list: Spark pickles UDF results for the JVM, which cannot rebuild list subclasses.
+        return self.expand(results)
+
+    def fallback(self) -> list:
+        """Whole-call ciphertext passthrough used when CRDP could not be reached at all."""
+        return self.finish([self.failed_value(index) for index in range(len(self.values))], list(range(len(self.values))))
+
+    def metric_labels(self) -> tuple:
+        return (self.mode, self.policy_name or "")
+
+    def response_parser(self) -> "_BulkResponseParser":
+        return _BulkResponseParser(self.mode, get_json_codec(self.props), self.with_headers)
+
+    def range_payload(self, start: int, end: int) -> dict:
+        return _build_bulk_payload(
+            self.mode,
+            self.values[start:end],
+            self.policy_name,
+            self.policy_type,
+            self.key_metadata_location,
+            self.external_version,
+            external_versions=None if self.external_versions is None else self.external_versions[start:end],
+            username=self.reveal_user,
+        )
+
+
+def _prepare_bulk_call(
     databricks_inputdata,
     mode,
     datatype,
@@ -711,7 +2766,8 @@ def _thales_crdp_python_function_bulk_impl(
     properties=None,
     spark_session=None,
     allow_runtime_reveal_user_override: bool = True,
-):
+    with_headers: bool = False,
+) -> _BulkCall:
     validated_properties = _validate_properties(properties)
     validated_spark_session = _validate_spark_session(spark_session)
     props = validated_properties or get_default_properties()
@@ -733,50 +2789,188 @@ def _thales_crdp_python_function_bulk_impl(
     explicit_reveal_user = reveal_user if allow_runtime_reveal_user_override else None
     runtime_reveal_user = resolve_runtime_reveal_user(validated_spark_session, explicit_reveal_user, props)
 
-    normalized_values = list(databricks_inputdata or [])
+    config = get_crdp_config(props)
+    input_values = [] if databricks_inputdata is None else databricks_inputdata
+    if mode == "protectbulk":
+        # Char inputs keep nulls as-is; other datatypes map them to the bad data tag.
+        normalized_values = check_valid_batch(
+            input_values, datatype, config.bad_data_tag, keep_nulls=str(datatype).lower() == "char"
+        )
+    else:
+        normalized_values = [None if value is None else str(value) for value in input_values]
+
     normalized_external_versions = None if external_versions is None else list(external_versions)
     if normalized_external_versions is not None and len(normalized_external_versions) != len(normalized_values):
         raise ValueError("external_versions must have the same length as databricks_inputdata")
 
-    if mode == "protectbulk":
-        if str(datatype).lower() != "char":
-            normalized_values = [check_valid(value, datatype, get_bad_data_tag(props)) for value in normalized_values]
-        else:
-            normalized_values = [check_valid(value, datatype, get_bad_data_tag(props)) if value is not None else value for value in normalized_values]
-    else:
-        normalized_values = [None if value is None else str(value) for value in normalized_values]
-
     policy_name, policy_type = resolve_profile(props, datatype, column_name, object_name, mode)
-    url = build_url(props, mode)
-
-    try:
-        if mode == "protectbulk":
-            payload = {
-                "protection_policy_name": policy_name,
-                "data_array": normalized_values,
-            }
-            response_json = post_json(url, payload, props)
-            return [item["protected_data"] for item in response_json.get("protected_data_array", [])]
-
-        payload = prepare_reveal_input(
-            normalized_values,
+    adaptive = get_adaptive_batch_controller(props, mode)
+    batch_size, max_workers = adaptive.current() if adaptive is not None else (config.batch_size, None)
+    dedup_positions = None
+    if is_crdp_dedup_enabled(props) and policy_type in {"internal", "none"}:
+        normalized_values, dedup_positions = _deduplicate_values(normalized_values)
+        normalized_external_versions = None
+    reveal_cache = None
+    if mode == "revealbulk" and is_crdp_reveal_cache_enabled(props):
+        normalized_values, normalized_external_versions, reveal_cache = _lookup_reveal_cache(
+            props,
             policy_name,
-            key_metadata_location if policy_type != "none" else "none",
-            external_version=external_version_from_ext_source if policy_type == "external" else None,
-            username=runtime_reveal_user,
-        ) if normalized_external_versions is None else prepare_reveal_input_with_versions(
+            policy_type,
+            runtime_reveal_user,
             normalized_values,
-            policy_name,
-            key_metadata_location if policy_type != "none" else "none",
-            external_versions=normalized_external_versions if policy_type == "external" else None,
-            external_version=external_version_from_ext_source if policy_type == "external" else None,
-            username=runtime_reveal_user,
+            normalized_external_versions,
+            external_version_from_ext_source,
         )
-        response_json = post_json(url, payload, props)
-        return [item["data"] for item in response_json.get("data_array", [])]
+
+    isolate_failures = is_crdp_bulk_failure_isolation_enabled(props)
+    return _BulkCall(
+        props=props,
+        mode=mode,
+        policy_name=policy_name,
+        policy_type=policy_type,
+        key_metadata_location=key_metadata_location,
+        external_version=external_version_from_ext_source,
+        reveal_user=runtime_reveal_user,
+        values=normalized_values,
+        external_versions=normalized_external_versions,
+        chunk_ranges=_build_chunk_ranges(len(normalized_values), batch_size),
+        return_ciphertext_on_error=return_ciphertext_for_user_without_key_access,
+        dedup_positions=dedup_positions,
+        isolate_failures=isolate_failures,
+        isolation_budget=_IsolationBudget(get_crdp_bulk_failure_isolation_max_requests(props)) if isolate_failures else None,
+        bad_data_tag=config.bad_data_tag,
+        adaptive=adaptive,
+        max_workers=max_workers,
+        with_headers=with_headers,
+        reveal_cache=reveal_cache,
+    )
+
+
+def _send_bulk_range(call: _BulkCall, start: int, end: int) -> list:
+    parser = call.response_parser()
+    started = time.monotonic()
+    try:
+        results = post_to_crdp(call.mode, call.range_payload(start, end), call.props, parser)
+        if len(results) != end - start:
+            raise ValueError(f"CRDP returned {len(results)} results for {end - start} values.")
     except Exception as ex:
-        if return_ciphertext_for_user_without_key_access:
-            return normalized_values
+        if call.adaptive is not None and not _is_isolatable_error(ex):
+            call.adaptive.record(end - start, time.monotonic() - started, 0, failed=True)
+        raise
+    if call.adaptive is not None:
+        call.adaptive.record(end - start, time.monotonic() - started, parser.response_bytes)
+    return results
+
+
+def _record_isolation_requests(count: int) -> None:
+    with _BULK_FAILURE_STATS_LOCK:
+        _BULK_FAILURE_STATS["isolation_requests"] += count
+
+
+def _send_bulk_range_isolating(call: _BulkCall, start: int, end: int) -> tuple[list, list]:
+    """
+    Send ``values[start:end]`` and return (results, failed_indexes).
+
+    With failure isolation enabled, a request rejected because of its data is
+    split in half and each half retried until the failing elements are
+    isolated; only those get ``call.failed_value``. Errors that mean CRDP is
+    unavailable, or that its response could not be used, are re-raised unchanged.
+    """
+    try:
+        return _send_bulk_range(call, start, end), []
+    except Exception as ex:
+        if not call.isolate_failures or not _is_isolatable_error(ex):
+            raise
+        return _bisect_rejected_range(call, start, end, ex, first_split=True)
+
+
+def _bisect_rejected_range(
+    call: _BulkCall, start: int, end: int, rejection: Exception, first_split: bool = False
+) -> tuple[list, list]:
+    """
+    Split a rejected range in half and resend both halves, recursing into the
+    halves that are rejected again.
+
+    ``rejection`` is re-raised when the isolation budget is spent, or when both
+    halves of the first split are rejected the same way: then the policy or the
+    request as a whole is at fault and further splitting would only multiply it.
+    """
+    if end - start == 1:
+        return [call.failed_value(start)], [start]
+    if not call.isolation_budget.take(2):
+        raise rejection
+
+    _record_isolation_requests(2)
+    middle = (start + end) // 2
+    halves = []
+    for half_start, half_end in ((start, middle), (middle, end)):
+        try:
+            halves.append((half_start, half_end, _send_bulk_range(call, half_start, half_end)))
+        except Exception as ex:
+            if not _is_isolatable_error(ex):
+                raise
+            halves.append((half_start, half_end, ex))
+
+    left, right = halves[0][2], halves[1][2]
+    if first_split and isinstance(left, Exception) and isinstance(right, Exception) and _is_same_rejection(left, right):
+        raise rejection
+    return _merge_chunk_results(
+        [
+            _bisect_rejected_range(call, half_start, half_end, outcome)
+            if isinstance(outcome, Exception)
+            else (outcome, [])
+            for half_start, half_end, outcome in halves
+        ]
+    )
+
+
+def _merge_chunk_results(chunk_results: list) -> tuple[list, list]:
+    results = []
+    failed_indexes = []
+    for chunk, chunk_failed in chunk_results:
+        results.extend(chunk)
+        failed_indexes.extend(chunk_failed)
+    return results, failed_indexes
+
+
+def _thales_crdp_python_function_bulk_impl(
+    databricks_inputdata,
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+    allow_runtime_reveal_user_override: bool = True,
+):
+    call = _prepare_bulk_call(
+        databricks_inputdata,
+        mode,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        reveal_user=reveal_user,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+        allow_runtime_reveal_user_override=allow_runtime_reveal_user_override,
+    )
+    return _run_bulk_call(call)
+
+
+def _run_bulk_call(call: _BulkCall) -> list:
+    def send_chunk(chunk_index):
+        return _send_bulk_range_isolating(call, *call.chunk_ranges[chunk_index])
+
+    try:
+        chunk_labels = [call.metric_labels()] * len(call.chunk_ranges) if is_crdp_metrics_enabled(call.props) else None
+        chunk_results = _dispatch_bulk_chunks(len(call.chunk_ranges), send_chunk, call.props, call.max_workers, chunk_labels)
+        return call.finish(*_merge_chunk_results(chunk_results))
+    except Exception as ex:
+        if call.return_ciphertext_on_error:
+            return call.fallback()
         raise ex
 
 
@@ -844,6 +3038,214 @@ def thales_crdp_python_function_bulk_secure(
     )
 
 
+def _prepare_protect_with_external_header_bulk(values, datatype, column_name, object_name, properties, spark_session):
+    """Bulk call over the non-null ``values``, plus their input positions and the input length."""
+    values = list(values or [])
+    present_indexes = [index for index, value in enumerate(values) if value is not None]
+    call = _prepare_bulk_call(
+        [values[index] for index in present_indexes],
+        "protectbulk",
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        properties=properties,
+        spark_session=spark_session,
+        with_headers=True,
+    )
+    return call, present_indexes, len(values)
+
+
+def _build_external_header_bulk_result(call: _BulkCall, results: list, present_indexes: list, size: int) -> dict:
+    keep_headers = call.policy_type == "external"
+    protected_values = [None] * size
+    external_headers = [None] * size
+    for index, (protected_value, external_header) in zip(present_indexes, results):
+        protected_values[index] = protected_value
+        external_headers[index] = external_header if keep_headers else None
+    return {
+        "protected_values": protected_values,
+        "external_headers": external_headers,
+        "failed_count": call.failed_count,
+    }
+
+
+def thales_crdp_python_protect_with_external_header_bulk(
+    values,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    """
+    Protect a whole column and return its external version headers alongside.
+
+    Returns ``{"protected_values": [...], "external_headers": [...]}`` with both
+    lists parallel to ``values``. Values are sent through the same chunked,
+    pooled /v1/protectbulk path as ``thales_crdp_python_function_bulk``; null
+    inputs are not sent and come back as ``None`` in both lists. Headers are
+    only returned for external policies.
+    """
+    call, present_indexes, size = _prepare_protect_with_external_header_bulk(
+        values, datatype, column_name, object_name, properties, spark_session
+    )
+    return _build_external_header_bulk_result(call, _run_bulk_call(call), present_indexes, size)
+
+
+def thales_crdp_python_protect_with_external_header_bulk_by_object(
+    values,
+    datatype,
+    object_name,
+    column_name=None,
+    *,
+    properties=None,
+    spark_session=None,
+):
+    return thales_crdp_python_protect_with_external_header_bulk(
+        values,
+        datatype,
+        column_name=column_name,
+        object_name=object_name,
+        properties=properties,
+        spark_session=spark_session,
+    )
+
+
+def _thales_crdp_python_function_bulk_by_columns_impl(
+    column_values,
+    mode,
+    datatypes,
+    object_name=None,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+    allow_runtime_reveal_user_override: bool = True,
+):
+    if not isinstance(column_values, Mapping):
+        raise TypeError("column_values must be a mapping of column name to value array.")
+    validated_properties = _validate_properties(properties)
+    validated_spark_session = _validate_spark_session(spark_session)
+    props = validated_properties or get_default_properties()
+    explicit_reveal_user = reveal_user if allow_runtime_reveal_user_override else None
+    resolved_reveal_user = resolve_runtime_reveal_user(validated_spark_session, explicit_reveal_user, props)
+
+    calls = {}
+    for column_name, values in column_values.items():
+        if values is None:
+            continue
+        datatype = datatypes.get(column_name, "char") if isinstance(datatypes, Mapping) else datatypes
+        calls[column_name] = _prepare_bulk_call(
+            values,
+            mode,
+            datatype,
+            column_name=column_name,
+            object_name=object_name,
+            reveal_user=resolved_reveal_user,
+            external_versions=None if external_versions is None else external_versions.get(column_name),
+            properties=props,
+            allow_runtime_reveal_user_override=True,
+        )
+
+    # Every chunk of every column shares one bounded pool, so the bundle takes
+    # roughly as long as its slowest column rather than the sum of all columns.
+    tasks = [(column_name, chunk_index) for column_name, call in calls.items() for chunk_index in range(len(call.chunk_ranges))]
+
+    def send_chunk(task_index):
+        column_name, chunk_index = tasks[task_index]
+        call = calls[column_name]
+        try:
+            return _send_bulk_range_isolating(call, *call.chunk_ranges[chunk_index])
+        except Exception as ex:
+            return ex
+
+    column_chunks = {column_name: [] for column_name in calls}
+    column_errors = {}
+    max_workers = next((call.max_workers for call in calls.values()), None)
+    chunk_labels = [calls[column_name].metric_labels() for column_name, _ in tasks] if is_crdp_metrics_enabled(props) else None
+    for (column_name, _), chunk in zip(tasks, _dispatch_bulk_chunks(len(tasks), send_chunk, props, max_workers, chunk_labels)):
+        if isinstance(chunk, Exception):
+            column_errors.setdefault(column_name, chunk)
+        elif column_name not in column_errors:
+            column_chunks[column_name].append(chunk)
+
+    results = {}
+    for column_name in column_values:
+        call = calls.get(column_name)
+        if call is None:
+            results[column_name] = None
+        elif column_name in column_errors:
+            if not call.return_ciphertext_on_error:
+                raise column_errors[column_name]
+            results[column_name] = call.fallback()
+        else:
+            results[column_name] = call.finish(*_merge_chunk_results(column_chunks[column_name]))
+    return results
+
+
+def thales_crdp_python_function_bulk_by_columns(
+    column_values,
+    mode,
+    datatypes,
+    object_name=None,
+    *,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    """
+    Testing/flexible multi-column entry point.
+
+    ``column_values`` maps column name to a value array and ``datatypes`` is
+    either one datatype for every column or a column-to-datatype mapping.
+    Each column resolves its own profile; all per-column bulk requests run
+    concurrently and one column-to-result mapping is returned. A ``None``
+    array yields ``None`` for that column.
+    """
+    return _thales_crdp_python_function_bulk_by_columns_impl(
+        column_values,
+        mode,
+        datatypes,
+        object_name=object_name,
+        reveal_user=reveal_user,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+        allow_runtime_reveal_user_override=True,
+    )
+
+
+def thales_crdp_python_function_bulk_secure_by_columns(
+    column_values,
+    mode,
+    datatypes,
+    object_name=None,
+    *,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    """
+    Production-safe multi-column entry point.
+
+    Same as ``thales_crdp_python_function_bulk_by_columns`` but never accepts a
+    caller-supplied reveal user.
+    """
+    return _thales_crdp_python_function_bulk_by_columns_impl(
+        column_values,
+        mode,
+        datatypes,
+        object_name=object_name,
+        reveal_user=None,
+        external_versions=external_versions,
+        properties=properties,
+        spark_session=spark_session,
+        allow_runtime_reveal_user_override=False,
+    )
+
+
 def thales_crdp_python_function_bulk_legacy(databricks_inputdata, mode, datatype):
     return thales_crdp_python_function_bulk(databricks_inputdata, mode, datatype, None)
 
@@ -0,0 +1,203 @@
+from .crdp_udfs import (
+    _thales_crdp_python_function_bulk_impl,
+    _validate_properties,
+    _validate_spark_session,
+    get_default_properties,
+    resolve_runtime_reveal_user,
+)
+
+__all__ = [
+    "thales_crdp_pandas_udf_secure",
+    "thales_crdp_python_function_vectorized",
+    "thales_crdp_python_function_vectorized_secure",
+]
+
+
+def _is_arrow_array(values) -> bool:
+    return type(values).__module__.startswith("pyarrow")
+
+
+def _apply_arrow(values, external_versions, run_bulk):
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    string_values = values if pa.types.is_string(values.type) else pc.cast(values, pa.string())
+    valid_mask = pc.is_valid(string_values)
+
+    present_versions = None
+    if external_versions is not None:
+        if not _is_arrow_array(external_versions):
+            external_versions = pa.array(external_versions, type=pa.string())
+        present_versions = pc.filter(external_versions, valid_mask).to_pylist()
+
+    if pa.types.is_integer(values.type):
+        # Integer columns go to check_valid_batch as a NumPy array.
+        present_values = pc.filter(values, valid_mask).to_numpy(zero_copy_only=False)
+    else:
+        present_values = pc.filter(string_values, valid_mask).to_pylist()
+    results = run_bulk(present_values, present_versions)
+    return pc.replace_with_mask(string_values, valid_mask, pa.array(results, type=pa.string()))
+
+
+def _apply_pandas(values, external_versions, run_bulk):
+    import pandas as pd  # type: ignore
+
+    valid_mask = values.notna().to_numpy()
+    present_values = values[valid_mask]
+    if present_values.dtype.kind == "f" and (present_values % 1 == 0).all():
+        # Spark hands nullable integer columns over as float64; 123.0 must be sent as 123.
+        present_values = present_values.to_numpy().astype("int64")
+    elif present_values.dtype.kind in "iu" or present_values.dtype == object:
+        present_values = present_values.to_numpy()
+    else:
+        present_values = present_values.astype(str).to_numpy()
+
+    present_versions = None
+    if external_versions is not None:
+        present_versions = pd.Series(external_versions).to_numpy()[valid_mask]
+
+    results = run_bulk(present_values, present_versions)
+    output = pd.Series([None] * len(values), index=values.index, dtype=object, name=values.name)
+    output[valid_mask] = results
+    return output
+
+
+def _apply_vectorized(values, external_versions, run_bulk):
+    """
+    Run one bulk call over the non-null values of a pandas Series or pyarrow Array.
+
+    Nulls are kept in place and never sent to CRDP. The result has the same
+    length as the input and is a string column of the same container type.
+    """
+    if _is_arrow_array(values):
+        return _apply_arrow(values, external_versions, run_bulk)
+    if hasattr(values, "notna"):
+        return _apply_pandas(values, external_versions, run_bulk)
+    raise TypeError("values must be a pandas.Series or a pyarrow.Array/ChunkedArray.")
+
+
+def thales_crdp_python_function_vectorized(
+    values,
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    reveal_user=None,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    """
+    Testing/flexible Arrow-batch entry point.
+
+    Accepts a pandas.Series or pyarrow.Array for one Spark batch and returns the
+    protected or revealed column. An explicit reveal_user override is allowed.
+    """
+    def run_bulk(present_values, present_versions):
+        return _thales_crdp_python_function_bulk_impl(
+            present_values,
+            mode,
+            datatype,
+            column_name=column_name,
+            object_name=object_name,
+            reveal_user=reveal_user,
+            external_versions=present_versions,
+            properties=properties,
+            spark_session=spark_session,
+            allow_runtime_reveal_user_override=True,
+        )
+
+    return _apply_vectorized(values, external_versions, run_bulk)
+
+
+def thales_crdp_python_function_vectorized_secure(
+    values,
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    external_versions=None,
+    properties=None,
+    spark_session=None,
+):
+    """
+    Production-safe Arrow-batch entry point.
+
+    Never accepts a caller-supplied reveal user; identity is resolved the same
+    way as ``thales_crdp_python_function_bulk_secure``.
+    """
+    def run_bulk(present_values, present_versions):
+        return _thales_crdp_python_function_bulk_impl(
+            present_values,
+            mode,
+            datatype,
+            column_name=column_name,
+            object_name=object_name,
+            reveal_user=None,
+            external_versions=present_versions,
+            properties=properties,
+            spark_session=spark_session,
+            allow_runtime_reveal_user_override=False,
+        )
+
+    return _apply_vectorized(values, external_versions, run_bulk)
+
+
+def thales_crdp_pandas_udf_secure(
+    mode,
+    datatype,
+    column_name=None,
+    object_name=None,
+    *,
+    with_external_versions: bool = False,
+    properties=None,
+    spark_session=None,
+):
+    """
+    Build a Spark ``pandas_udf`` that protects or reveals one column per Arrow batch.
+
+    Properties and the reveal user are resolved once on the driver, because
+    executors have no Spark session to resolve identity from. Callers cannot
+    supply the reveal user. With ``with_external_versions=True`` the UDF takes
+    a second column holding the external version header of each value.
+    """
+    import pandas as pd  # type: ignore
+    from pyspark.sql.functions import pandas_udf  # type: ignore
+
+    props = _validate_properties(properties) or get_default_properties()
+    validated_spark_session = _validate_spark_session(spark_session)
+    resolved_reveal_user = (
+        resolve_runtime_reveal_user(validated_spark_session, None, props)
+        if str(mode).lower() == "revealbulk"
+        else None
+    )
+
+    def run_bulk(present_values, present_versions):
+        return _thales_crdp_python_function_bulk_impl(
+            present_values,
+            mode,
+            datatype,
+            column_name=column_name,
+            object_name=object_name,
+            reveal_user=resolved_reveal_user,
+            external_versions=present_versions,
+            properties=props,
+            allow_runtime_reveal_user_override=True,
+        )
+
+    if with_external_versions:
+        @pandas_udf("string")
+        def crdp_column_udf_with_versions(values: pd.Series, external_versions: pd.Series) -> pd.Series:
+            return _apply_pandas(values, external_versions, run_bulk)
+
+        return crdp_column_udf_with_versions
+
+    @pandas_udf("string")
+    def crdp_column_udf(values: pd.Series) -> pd.Series:
+        return _apply_pandas(values, None, run_bulk)
+
+    return crdp_column_udf
@@ -53,7 +53,7 @@ ENVIRONMENT (
 AS $$
 import json
 
-from thales_databricks_udf.crdp_udfs import thales_crdp_python_function_bulk_by_object
+from thales_databricks_udf.crdp_udfs import thales_crdp_python_function_bulk_by_columns
 
 PROPERTIES = {
     "CRDPIP": "your-crdp-ip",
@@ -64,6 +64,7 @@ PROPERTIES = {
     "DEFAULTMODE": "internal",
     "keymetadatalocation": "internal",
     "BADDATATAG": "999999999",
+    "CRDP_BULK_MAX_WORKERS": "5",
     "RETURNCIPHERTEXTFORUSERWITHNOKEYACCESS": "no",
     "DEFAULTINTERNALCHARPOLICY": "char-internal",
     "DEFAULTINTERNALNBRNBRPOLICY": "nbr-nbr-internal",
@@ -102,26 +103,36 @@ PROPERTIES = {
 }
 
 
-def reveal(values, datatype, column_name):
-    if values is None:
-        return None
-    return thales_crdp_python_function_bulk_by_object(
-        values,
-        "revealbulk",
-        datatype,
-        "my_catalog.my_schema.plaintext_protected_internal_arrays",
-        column_name=column_name,
-        reveal_user=reveal_user,
-        properties=PROPERTIES,
-    )
-
+# CRDP_BULK_MAX_WORKERS is 5 above, so all five columns are revealed
+# concurrently in one bundle call and the wall time is close to the slowest
+# column instead of the sum of all five.
+revealed = thales_crdp_python_function_bulk_by_columns(
+    {
+        "address": address_values,
+        "email": email_values,
+        "creditcard": creditcard_values,
+        "creditcardcode": creditcardcode_values,
+        "ssn": ssn_values,
+    },
+    "revealbulk",
+    {
+        "address": "char",
+        "email": "char",
+        "creditcard": "nbr",
+        "creditcardcode": "nbr",
+        "ssn": "nbr",
+    },
+    "my_catalog.my_schema.plaintext_protected_internal_arrays",
+    reveal_user=reveal_user,
+    properties=PROPERTIES,
+)
 
 result = {
-    "address_decrypted": reveal(address_values, "char", "address"),
-    "email_decrypted": reveal(email_values, "char", "email"),
-    "creditcard_decrypted_raw": reveal(creditcard_values, "nbr", "creditcard"),
-    "creditcardcode_decrypted_raw": reveal(creditcardcode_values, "nbr", "creditcardcode"),
-    "ssn_decrypted": reveal(ssn_values, "nbr", "ssn"),
+    "address_decrypted": revealed["address"],
+    "email_decrypted": revealed["email"],
+    "creditcard_decrypted_raw": revealed["creditcard"],
+    "creditcardcode_decrypted_raw": revealed["creditcardcode"],
+    "ssn_decrypted": revealed["ssn"],
 }
 
 return json.dumps(result)
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_ROOT, "tools"))
+sys.path.insert(0, os.path.join(_ROOT, "tools", "benchmarks"))
+sys.path.insert(0, os.path.join(_ROOT, "python"))
+
+from crdp_emulator import CrdpEmulator  # noqa: E402
+
+
+@pytest.fixture
+def emulator():
+    with CrdpEmulator(policies={"ext-policy": "external"}, reject_marker="BAD", seed=0) as crdp:
+        yield crdp
@@ -0,0 +1,77 @@
+import pytest
+import requests
+
+from thales_databricks_udf import crdp_udfs, thales_crdp_python_function_bulk
+from thales_databricks_udf.crdp_udfs import get_adaptive_batch_controller
+
+
+@pytest.fixture(autouse=True)
+def _fresh_controllers(monkeypatch):
+    # Controllers are keyed on the endpoint URL, and emulator ports get reused.
+    monkeypatch.setattr(crdp_udfs, "_ADAPTIVE_CONTROLLERS", {})
+
+
+def _adaptive_properties(emulator, **overrides):
+    return emulator.properties(
+        "pol",
+        BATCH_SIZE="400",
+        CRDP_BULK_MAX_WORKERS="4",
+        CRDP_ADAPTIVE_BATCH_ENABLED="true",
+        CRDP_ADAPTIVE_BATCH_MIN="50",
+        CRDP_ADAPTIVE_BATCH_MAX="800",
+        CRDP_ADAPTIVE_MAX_WORKERS="8",
+        CRDP_CIRCUIT_BREAKER_ENABLED="false",
+        CRDP_RETRY_MAX_ATTEMPTS="1",
+        **overrides,
+    )
+
+
+def _protect(values, props):
+    return thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+
+
+def test_payload_too_large_shrinks_chunks_and_concurrency(emulator):
+    props = _adaptive_properties(emulator)
+    controller = get_adaptive_batch_controller(props, "protectbulk")
+    emulator.error_rate = 1.0
+    emulator.error_status = 413
+
+    with pytest.raises(requests.HTTPError):
+        _protect(["aa"], props)
+
+    assert controller.current() == (200, 3)
+
+
+def test_timeout_shrinks_chunks_and_concurrency(emulator):
+    props = _adaptive_properties(emulator, CRDP_READ_TIMEOUT_MS="100")
+    controller = get_adaptive_batch_controller(props, "protectbulk")
+    emulator.latency_ms = 300
+
+    with pytest.raises(requests.Timeout):
+        _protect(["aa"], props)
+
+    assert controller.current() == (200, 3)
+
+
+def test_slow_chunks_shrink_only_the_chunk_size(emulator):
+    props = _adaptive_properties(emulator, CRDP_ADAPTIVE_TARGET_LATENCY_MS="50")
+    controller = get_adaptive_batch_controller(props, "protectbulk")
+    emulator.latency_ms = 100
+
+    assert _protect(["aa"], props) == ["1001000nn"]
+
+    assert controller.current() == (200, 4)
+
+
+def test_next_call_uses_the_reduced_chunk_size(emulator):
+    props = _adaptive_properties(emulator)
+    controller = get_adaptive_batch_controller(props, "protectbulk")
+    emulator.error_rate = 1.0
+    emulator.error_status = 413
+    with pytest.raises(requests.HTTPError):
+        _protect(["aa"], props)
+    emulator.error_rate = 0.0
+    emulator.reset_stats()
+
+    assert _protect(["aa"] * 400, props) == ["1001000nn"] * 400
+    assert emulator.stats()["requests"] == 2
@@ -0,0 +1,52 @@
+import pytest
+import requests
+
+from thales_databricks_udf import thales_crdp_python_function_bulk, thales_crdp_python_function_bulk_by_columns
+
+_DATATYPES = {"name": "char", "email": "char", "ssn": "nbr"}
+
+
+def _column_properties(emulator, **overrides):
+    return emulator.properties(
+        "pol",
+        BATCH_SIZE="4",
+        CRDP_RETRY_MAX_ATTEMPTS="1",
+        **{"column.email.profile": "ext-policy", "ext-policy.policyType": "external"},
+        **overrides,
+    )
+
+
+@pytest.mark.parametrize("mode", ["protectbulk", "revealbulk"])
+def test_bundle_matches_per_column_calls(emulator, mode):
+    props = _column_properties(emulator)
+    columns = {
+        "name": [f"name{index}" for index in range(10)],
+        "email": [f"user{index}@example.com" for index in range(7)],
+        "ssn": [str(100000000 + index) for index in range(9)],
+    }
+    if mode == "revealbulk":
+        # keymetadatalocation is global, so only internal-header columns are revealed here.
+        columns = {
+            column: thales_crdp_python_function_bulk(values, "protectbulk", _DATATYPES[column], column, properties=props)
+            for column, values in columns.items()
+            if column != "email"
+        }
+
+    expected = {
+        column: thales_crdp_python_function_bulk(values, mode, _DATATYPES[column], column, properties=props)
+        for column, values in columns.items()
+    }
+    bundle = thales_crdp_python_function_bulk_by_columns(dict(columns, address=None), mode, _DATATYPES, properties=props)
+
+    assert bundle == dict(expected, address=None)
+
+
+def test_failing_column_does_not_affect_the_others(emulator):
+    columns = {"name": ["aa", "bb"], "email": ["BADx"]}
+
+    with pytest.raises(requests.HTTPError):
+        thales_crdp_python_function_bulk_by_columns(columns, "protectbulk", "char", properties=_column_properties(emulator))
+
+    props = _column_properties(emulator, returnciphertextforuserwithnokeyaccess="yes")
+    bundle = thales_crdp_python_function_bulk_by_columns(columns, "protectbulk", "char", properties=props)
+    assert bundle == {"name": ["1001000nn", "1001000oo"], "email": ["BADx"]}
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from thales_databricks_udf import crdp_async, crdp_udfs, thales_crdp_python_function_bulk, thales_crdp_python_function_bulk_async
+
+
+def _expected_protect(emulator, policy, values):
+    return [
+        emulator.handle("/v1/protect", {"protection_policy_name": policy, "data": value})[1]["protected_data"]
+        for value in values
+    ]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_parallel_chunks_keep_input_order(emulator, use_async):
+    # Jitter lets later chunks finish first.
+    emulator.jitter_ms = 30
+    props = emulator.properties("pol", BATCH_SIZE="7", CRDP_BULK_MAX_WORKERS="8")
+    values = [f"v{index:03d}" for index in range(100)]
+
+    if use_async:
+        protected = asyncio.run(thales_crdp_python_function_bulk_async(values, "protectbulk", "char", properties=props))
+        revealed = asyncio.run(thales_crdp_python_function_bulk_async(protected, "revealbulk", "char", properties=props))
+    else:
+        protected = thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+        revealed = thales_crdp_python_function_bulk(protected, "revealbulk", "char", properties=props)
+
+    assert protected == _expected_protect(emulator, "pol", values)
+    assert revealed == values
+    assert emulator.stats() == {"requests": 30, "elements": 200, "errors": 0}
+
+
+def test_short_input_is_sent_in_one_request(emulator):
+    props = emulator.properties("pol", BATCH_SIZE="1000")
+
+    assert thales_crdp_python_function_bulk(["aa", "bb"], "protectbulk", "char", properties=props) == [
+        "1001000nn",
+        "1001000oo",
+    ]
+    assert emulator.stats()["requests"] == 1
+
+
+def test_calls_share_one_worker_pool(emulator, monkeypatch):
+    props = emulator.properties("pol", BATCH_SIZE="2", CRDP_BULK_MAX_WORKERS="3")
+    monkeypatch.setattr(crdp_udfs, "_BULK_EXECUTOR", None)
+    monkeypatch.setattr(crdp_udfs, "_BULK_EXECUTOR_WORKERS", 0)
+
+    thales_crdp_python_function_bulk(["aa"] * 10, "protectbulk", "char", properties=props)
+    executor = crdp_udfs._BULK_EXECUTOR
+    thales_crdp_python_function_bulk(["aa"] * 10, "protectbulk", "char", properties=props)
+
+    assert crdp_udfs._BULK_EXECUTOR is executor
+    assert crdp_udfs._BULK_EXECUTOR_WORKERS == 3
+    thales_crdp_python_function_bulk(["aa"] * 10, "protectbulk", "char", properties=dict(props, CRDP_BULK_MAX_WORKERS="5"))
+    assert crdp_udfs._BULK_EXECUTOR_WORKERS == 5
+
+
+def test_dispatch_bounds_concurrency_per_call():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def send_chunk(chunk_index):
+        with lock:
+            running.append(chunk_index)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(chunk_index)
+        return chunk_index * 10
+
+    results = crdp_udfs._dispatch_bulk_chunks(20, send_chunk, {"CRDP_BULK_MAX_WORKERS": "8"}, max_workers=3)
+
+    assert results == [index * 10 for index in range(20)]
+    assert max(peak) == 3
+
+
+def test_dispatch_stops_sending_after_a_failed_chunk():
+    sent = []
+
+    def send_chunk(chunk_index):
+        sent.append(chunk_index)
+        if chunk_index == 0:
+            raise requests.ConnectionError("refused")
+        time.sleep(0.01)
+        return chunk_index
+
+    with pytest.raises(requests.ConnectionError):
+        crdp_udfs._dispatch_bulk_chunks(50, send_chunk, {"CRDP_BULK_MAX_WORKERS": "2"})
+    assert len(sent) < 5
+
+
+def test_async_call_is_prepared_off_the_event_loop(emulator, monkeypatch):
+    prepare = crdp_async._prepare_bulk_call
+    threads = []
+
+    def recording_prepare(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return prepare(*args, **kwargs)
+
+    monkeypatch.setattr(crdp_async, "_prepare_bulk_call", recording_prepare)
+    props = emulator.properties()
+
+    protected = asyncio.run(thales_crdp_python_function_bulk_async(["aa"], "protectbulk", "char", properties=props))
+
+    assert protected == ["1001000nn"]
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+import requests
+
+from thales_databricks_udf import thales_crdp_python_function_bulk, thales_crdp_python_function_bulk_async
+
+
+def _isolating_properties(emulator, **overrides):
+    return emulator.properties(
+        "pol",
+        CRDP_BULK_FAILURE_ISOLATION_ENABLED="true",
+        CRDP_CIRCUIT_BREAKER_ENABLED="false",
+        CRDP_RETRY_MAX_ATTEMPTS="1",
+        **overrides,
+    )
+
+
+def test_rejected_values_are_isolated(emulator):
+    props = _isolating_properties(emulator)
+    results = thales_crdp_python_function_bulk(["aa", "BADx", "bb"], "protectbulk", "char", properties=props)
+    assert results == ["1001000nn", "99999999999", "1001000oo"]
+
+
+@pytest.mark.parametrize("status", [401, 403, 404, 429, 500, 503])
+def test_unavailable_crdp_is_not_bisected(emulator, status):
+    emulator.error_rate = 1.0
+    emulator.error_status = status
+    props = _isolating_properties(emulator)
+    values = [f"v{index:03d}" for index in range(64)]
+
+    with pytest.raises(requests.HTTPError):
+        thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(thales_crdp_python_function_bulk_async(values, "protectbulk", "char", properties=props))
+    assert emulator.stats()["requests"] == 2
+
+
+def test_bulk_results_are_plain_lists(emulator):
+    import pickle
+
+    from thales_databricks_udf import get_bulk_failure_stats, thales_crdp_python_protect_with_external_header_bulk
+
+    props = _isolating_properties(emulator)
+    before = get_bulk_failure_stats()["failed_values"]
+    results = thales_crdp_python_function_bulk(["aa", "BADx"], "protectbulk", "char", properties=props)
+    assert type(results) is list
+    # Spark's JVM side can only rebuild builtins, so no class reference may be pickled.
+    assert b"thales_databricks_udf" not in pickle.dumps(results, protocol=2)
+    assert get_bulk_failure_stats()["failed_values"] == before + 1
+
+    header_result = thales_crdp_python_protect_with_external_header_bulk(["aa", "BADx"], "char", properties=props)
+    assert type(header_result["protected_values"]) is list
+    assert header_result["failed_count"] == 1
+
+
+def _protect_both_ways(values, props):
+    with pytest.raises(Exception) as sync_error:
+        thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+    with pytest.raises(Exception) as async_error:
+        asyncio.run(thales_crdp_python_function_bulk_async(values, "protectbulk", "char", properties=props))
+    return sync_error.value, async_error.value
+
+
+def test_malformed_response_is_not_bisected(emulator):
+    emulator.malformed_responses = True
+    props = _isolating_properties(emulator)
+
+    errors = _protect_both_ways([f"v{index:03d}" for index in range(64)], props)
+
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert emulator.stats()["requests"] == 2
+
+
+def test_whole_policy_rejection_stops_after_first_split(emulator):
+    emulator.strict_policies = True
+    props = _isolating_properties(emulator)
+
+    errors = _protect_both_ways([f"v{index:03d}" for index in range(64)], props)
+
+    assert all(isinstance(error, requests.HTTPError) for error in errors)
+    assert all(error.response.status_code == 400 for error in errors)
+    assert emulator.stats()["requests"] == 6
+
+
+def test_bisection_requests_are_capped(emulator):
+    props = _isolating_properties(emulator, CRDP_BULK_FAILURE_ISOLATION_MAX_REQUESTS="4")
+    values = [f"BAD{index}" for index in range(8)]
+
+    with pytest.raises(requests.HTTPError):
+        thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+    assert emulator.stats()["requests"] == 5
+
+    # Async halves bisect concurrently, so the half still in flight may be cancelled before it is sent.
+    emulator.reset_stats()
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(thales_crdp_python_function_bulk_async(values, "protectbulk", "char", properties=props))
+    assert emulator.stats()["requests"] <= 5
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import pytest
+
+from thales_databricks_udf.crdp_udfs import check_valid, check_valid_batch
+
+_LONG_DIGITS = "7" * 5000
+
+_VALUES = [
+    None,
+    0,
+    5,
+    9,
+    10,
+    -1,
+    -9,
+    -10,
+    12345678901234567890,
+    "",
+    "   ",
+    "7",
+    " 7 ",
+    "42",
+    " 42 ",
+    "\t-5\n",
+    "-1",
+    "-9",
+    "-0",
+    "-01",
+    "-09",
+    "-10",
+    "+5",
+    "007",
+    "1.5",
+    "-1.5",
+    ".5",
+    "1e3",
+    "-1e0",
+    "1_000",
+    "１２",
+    "abc",
+    "a",
+    "-",
+    "--1",
+    1.5,
+    -1.0,
+    float("nan"),
+    Decimal("-5"),
+    Decimal("3.25"),
+    True,
+    "1" * 4299,
+    "1" * 4301,
+    "-" + _LONG_DIGITS,
+    _LONG_DIGITS,
+    "-" + "0" * 5000 + "3",
+]
+
+
+@pytest.mark.parametrize("datatype", ["char", "int", "decimal", "CHAR"])
+@pytest.mark.parametrize("bad_data_tag", [None, "BAD"])
+def test_batch_matches_check_valid(datatype, bad_data_tag):
+    expected = [check_valid(value, datatype, bad_data_tag) for value in _VALUES]
+
+    assert check_valid_batch(_VALUES, datatype, bad_data_tag) == expected
+
+
+@pytest.mark.parametrize("datatype", ["char", "int"])
+def test_integer_arrays_match_check_valid(datatype):
+    np = pytest.importorskip("numpy")
+    values = np.array([-11, -10, -9, -1, 0, 1, 9, 10, 99, 2**62], dtype="int64")
+
+    assert check_valid_batch(values, datatype) == [check_valid(int(value), datatype) for value in values]
+
+
+def test_keep_nulls():
+    assert check_valid_batch([None, "42"], "int", keep_nulls=True) == [None, "42"]
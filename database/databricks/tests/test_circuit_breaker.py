@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from thales_databricks_udf import CrdpCircuitOpenError, thales_crdp_python_function_bulk
+from thales_databricks_udf.crdp_udfs import get_resilience_state
+
+
+def _breaker_properties(emulator, **overrides):
+    return emulator.properties(
+        "pol",
+        CRDP_CIRCUIT_BREAKER_FAILURE_THRESHOLD="3",
+        CRDP_RETRY_MAX_ATTEMPTS="1",
+        **overrides,
+    )
+
+
+def _protect(values, properties):
+    return thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=properties)
+
+
+@pytest.mark.parametrize("status", [401, 403, 404, 503])
+def test_failures_open_the_breaker(emulator, status):
+    emulator.error_rate = 1.0
+    emulator.error_status = status
+    props = _breaker_properties(emulator)
+
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            _protect(["aa"], props)
+    with pytest.raises(CrdpCircuitOpenError):
+        _protect(["aa"], props)
+    assert emulator.stats()["requests"] == 3
+
+
+def test_data_rejections_keep_the_breaker_closed(emulator):
+    props = _breaker_properties(emulator)
+
+    for _ in range(5):
+        with pytest.raises(requests.HTTPError):
+            _protect(["BADx"], props)
+    assert _protect(["aa"], props) == ["1001000nn"]
+    assert emulator.stats()["requests"] == 6
+
+
+def test_breaker_is_scoped_to_session_settings(emulator):
+    broken = _breaker_properties(emulator, CRDP_READ_TIMEOUT_MS="1000")
+    working = _breaker_properties(emulator, CRDP_READ_TIMEOUT_MS="2000")
+    emulator.error_rate = 1.0
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            _protect(["aa"], broken)
+    emulator.error_rate = 0.0
+
+    with pytest.raises(CrdpCircuitOpenError):
+        _protect(["aa"], broken)
+    assert _protect(["aa"], working) == ["1001000nn"]
+
+
+def test_sync_hedges_are_capped(emulator):
+    emulator.latency_ms = 300
+    props = _breaker_properties(emulator, CRDP_HEDGE_ENABLED="true", CRDP_HEDGE_MAX_IN_FLIGHT="1")
+    state = get_resilience_state(props)
+    for _ in range(20):
+        state.latencies.add(0.01)
+
+    threads = [threading.Thread(target=_protect, args=(["aa"], props)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time.sleep(0.5)
+
+    assert emulator.stats()["requests"] == 5
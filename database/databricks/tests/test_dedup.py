@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from thales_databricks_udf import (
+    get_bulk_failure_stats,
+    thales_crdp_python_function_bulk,
+    thales_crdp_python_function_bulk_async,
+)
+
+_VALUES = ["aa", "bb", "aa", "ee", "cc", "aa", "bb", "dd"] * 5
+
+
+def _protect(values, props, use_async):
+    if use_async:
+        return asyncio.run(thales_crdp_python_function_bulk_async(values, "protectbulk", "char", properties=props))
+    return thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_duplicates_are_sent_once_and_expanded_back(emulator, use_async):
+    expected = _protect(_VALUES, emulator.properties("pol", BATCH_SIZE="3"), use_async)
+    emulator.reset_stats()
+
+    deduplicated = _protect(_VALUES, emulator.properties("pol", BATCH_SIZE="3", CRDP_DEDUP_ENABLED="true"), use_async)
+
+    assert deduplicated == expected
+    assert deduplicated[0] == deduplicated[2] == deduplicated[5] == "1001000nn"
+    assert emulator.stats()["elements"] == len(set(_VALUES))
+
+
+def test_external_policies_are_not_deduplicated(emulator):
+    props = emulator.properties("ext-policy", CRDP_DEDUP_ENABLED="true")
+
+    assert _protect(["aa", "aa"], props, False) == ["nn", "nn"]
+    assert emulator.stats()["elements"] == 2
+
+
+def test_failed_duplicates_are_counted_per_position(emulator):
+    props = emulator.properties(
+        "pol",
+        CRDP_DEDUP_ENABLED="true",
+        CRDP_BULK_FAILURE_ISOLATION_ENABLED="true",
+        CRDP_RETRY_MAX_ATTEMPTS="1",
+    )
+    before = get_bulk_failure_stats()["failed_values"]
+
+    assert _protect(["BADx", "aa", "BADx"], props, False) == ["99999999999", "1001000nn", "99999999999"]
+    assert get_bulk_failure_stats()["failed_values"] == before + 2
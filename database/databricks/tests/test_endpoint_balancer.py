@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from crdp_emulator import CrdpEmulator
+from thales_databricks_udf import get_crdp_endpoint_stats, thales_crdp_python_function_bulk
+
+
+@pytest.fixture
+def second_emulator():
+    with CrdpEmulator(seed=1) as crdp:
+        yield crdp
+
+
+def _balanced_properties(emulator, second_emulator, **overrides):
+    return emulator.properties(
+        "pol",
+        CRDP_ENDPOINTS=f"127.0.0.1:{emulator.port},127.0.0.1:{second_emulator.port}",
+        CRDP_ENDPOINT_FAILURE_THRESHOLD="1",
+        CRDP_CIRCUIT_BREAKER_ENABLED="false",
+        CRDP_RETRY_MAX_ATTEMPTS="3",
+        CRDP_RETRY_BACKOFF_BASE_MS="1",
+        **overrides,
+    )
+
+
+def _protect_repeatedly(props, count=10):
+    for _ in range(count):
+        assert thales_crdp_python_function_bulk(["aa"], "protectbulk", "char", properties=props) == ["1001000nn"]
+
+
+def test_requests_are_spread_across_endpoints(emulator, second_emulator):
+    _protect_repeatedly(_balanced_properties(emulator, second_emulator))
+
+    assert emulator.stats()["requests"] == 5
+    assert second_emulator.stats()["requests"] == 5
+
+
+def test_failing_endpoint_is_ejected_and_restored_after_cooldown(emulator, second_emulator):
+    props = _balanced_properties(emulator, second_emulator, CRDP_ENDPOINT_COOLDOWN_MS="1000")
+    second_emulator.error_rate = 1.0
+
+    _protect_repeatedly(props)
+
+    assert second_emulator.stats()["requests"] <= 1
+    assert emulator.stats()["requests"] == 10
+    assert [stats["healthy"] for stats in get_crdp_endpoint_stats(props)] == [True, second_emulator.stats()["requests"] == 0]
+
+    second_emulator.error_rate = 0.0
+    time.sleep(1.1)
+    _protect_repeatedly(props)
+
+    assert second_emulator.stats()["requests"] >= 5
+    assert [stats["healthy"] for stats in get_crdp_endpoint_stats(props)] == [True, True]
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from thales_databricks_udf import (
+    thales_crdp_python_function_bulk,
+    thales_crdp_python_protect_with_external_header,
+    thales_crdp_python_protect_with_external_header_bulk,
+    thales_crdp_python_protect_with_external_header_bulk_async,
+)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_bulk_headers_match_single_calls_and_reveal(emulator, use_async):
+    props = emulator.properties("ext-policy", BATCH_SIZE="100", CRDP_BULK_MAX_WORKERS="4")
+    values = [f"value{index:03d}" for index in range(250)]
+    values[3] = None
+
+    if use_async:
+        result = asyncio.run(thales_crdp_python_protect_with_external_header_bulk_async(values, "char", properties=props))
+    else:
+        result = thales_crdp_python_protect_with_external_header_bulk(values, "char", properties=props)
+
+    assert emulator.stats()["requests"] == 3
+    assert result["failed_count"] == 0
+    assert result["protected_values"][3] is None and result["external_headers"][3] is None
+    single = thales_crdp_python_protect_with_external_header(values[0], "char", properties=props)
+    assert single == {"protected_value": result["protected_values"][0], "external_header": result["external_headers"][0]}
+    assert set(result["external_headers"][:3] + result["external_headers"][4:]) == {"1001000"}
+
+    present = [index for index, value in enumerate(values) if value is not None]
+    revealed = thales_crdp_python_function_bulk(
+        [result["protected_values"][index] for index in present],
+        "revealbulk",
+        "char",
+        external_versions=[result["external_headers"][index] for index in present],
+        properties=props,
+    )
+    assert revealed == [values[index] for index in present]
+
+
+def test_internal_policies_return_no_headers(emulator):
+    props = emulator.properties(
+        "pol",
+        CRDP_BULK_FAILURE_ISOLATION_ENABLED="true",
+        CRDP_RETRY_MAX_ATTEMPTS="1",
+    )
+
+    result = thales_crdp_python_protect_with_external_header_bulk(["aa", "BADx", "cc"], "char", properties=props)
+
+    assert result == {
+        "protected_values": ["1001000nn", "99999999999", "1001000pp"],
+        "external_headers": [None, None, None],
+        "failed_count": 1,
+    }
+
+
+def test_empty_input(emulator):
+    result = thales_crdp_python_protect_with_external_header_bulk([], "char", properties=emulator.properties("ext-policy"))
+
+    assert result == {"protected_values": [], "external_headers": [], "failed_count": 0}
+    assert emulator.stats()["requests"] == 0
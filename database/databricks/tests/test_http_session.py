@@ -0,0 +1,52 @@
+import os
+import signal
+
+import pytest
+
+from thales_databricks_udf import crdp_metrics, crdp_reveal_cache, crdp_udfs, thales_crdp_python_function_bulk
+
+_MODULE_LOCKS = [
+    (crdp_udfs, name) for name in dir(crdp_udfs) if name.startswith("_") and name.endswith("_LOCK")
+] + [(crdp_metrics, "_METRICS_LOCK"), (crdp_reveal_cache, "_OPEN_CACHES_LOCK")]
+
+
+def test_pool_growth_closes_the_replaced_adapter(emulator):
+    props = emulator.properties(CRDP_HTTP_POOL_MAXSIZE="1", CRDP_HTTP_POOL_MAX_LIMIT="4")
+    managed = crdp_udfs._get_managed_http_session(props)
+    replaced = managed.session.adapters["https://"]
+    closed = []
+    replaced.close = lambda: closed.append(True)
+
+    managed.acquire()
+    managed.acquire()
+    managed.release()
+    managed.release()
+
+    assert closed == [True]
+    assert managed.pool_maxsize == 2
+    assert managed.session.adapters["https://"] is not replaced
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_does_not_inherit_held_locks(emulator):
+    props = emulator.properties(CRDP_METRICS_ENABLED="true", CRDP_RETRY_MAX_ATTEMPTS="1", BATCH_SIZE="1")
+    held = [getattr(module, name) for module, name in _MODULE_LOCKS]
+    for lock in held:
+        lock.acquire()
+    try:
+        pid = os.fork()
+        if pid == 0:
+            signal.alarm(20)
+            try:
+                results = thales_crdp_python_function_bulk(["aa", "aa"], "protectbulk", "char", properties=props)
+                crdp_udfs.get_bulk_failure_stats()
+                crdp_udfs.get_http_session_pool_stats()
+                crdp_metrics.get_crdp_client_metrics()
+                os._exit(0 if results == ["1001000nn", "1001000nn"] else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        for lock in held:
+            lock.release()
+    assert os.waitstatus_to_exitcode(status) == 0
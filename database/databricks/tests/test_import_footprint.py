@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+import check_import_time
+
+# Loosens every time budget on slow runners, like the tool's --budget-scale.
+_BUDGET_SCALE = float(os.environ.get("IMPORT_TIME_BUDGET_SCALE", "1"))
+
+
+@pytest.mark.parametrize("module", sorted(check_import_time.TARGETS))
+def test_entry_module_import_footprint(module):
+    _, forbidden = check_import_time.TARGETS[module]
+
+    loaded = check_import_time.import_once(module)
+
+    assert sorted(name for name in loaded if name in forbidden) == []
+
+
+@pytest.mark.parametrize("module", sorted(check_import_time.TARGETS))
+def test_entry_module_import_time(module):
+    budget_ms, forbidden = check_import_time.TARGETS[module]
+
+    result = check_import_time.check_target(module, budget_ms * _BUDGET_SCALE, forbidden, repeats=3)
+
+    assert result["median_ms"] <= result["budget_ms"]
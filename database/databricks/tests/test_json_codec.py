@@ -0,0 +1,78 @@
+import asyncio
+import json
+import sys
+
+import pytest
+
+from thales_databricks_udf import (
+    crdp_udfs,
+    register_json_codec,
+    thales_crdp_python_function_bulk,
+    thales_crdp_python_function_bulk_async,
+)
+
+_VALUES = ['ab"c', "dé\\f", "<x>", "naïve", "日本語テキスト", "tab\there", "emoji 😀", "plain"] * 20
+
+
+def _round_trip(props, use_async):
+    if use_async:
+        protected = asyncio.run(thales_crdp_python_function_bulk_async(_VALUES, "protectbulk", "char", properties=props))
+        revealed = asyncio.run(thales_crdp_python_function_bulk_async(protected, "revealbulk", "char", properties=props))
+    else:
+        protected = thales_crdp_python_function_bulk(_VALUES, "protectbulk", "char", properties=props)
+        revealed = thales_crdp_python_function_bulk(protected, "revealbulk", "char", properties=props)
+    return protected, revealed
+
+
+@pytest.fixture
+def without_orjson(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setattr(crdp_udfs, "_JSON_CODECS", {"json": crdp_udfs._JSON_CODECS["json"]})
+    monkeypatch.setattr(crdp_udfs, "_ORJSON_IMPORT_ATTEMPTED", False)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+@pytest.mark.parametrize("codec", ["json", "orjson", "auto"])
+def test_round_trip_with_orjson(emulator, codec, use_async):
+    pytest.importorskip("orjson")
+    expected, _ = _round_trip(emulator.properties("pol", BATCH_SIZE="50", CRDP_JSON_CODEC="json"), False)
+
+    protected, revealed = _round_trip(emulator.properties("pol", BATCH_SIZE="50", CRDP_JSON_CODEC=codec), use_async)
+
+    assert protected == expected
+    assert revealed == _VALUES
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_round_trip_without_orjson(emulator, without_orjson, use_async):
+    props = emulator.properties("pol", BATCH_SIZE="50")
+
+    protected, revealed = _round_trip(props, use_async)
+
+    assert crdp_udfs.get_json_codec(props).name == "json"
+    assert protected[0] == '1001000no"p'
+    assert revealed == _VALUES
+
+
+def test_orjson_codec_requires_orjson(emulator, without_orjson):
+    with pytest.raises(ValueError, match="orjson"):
+        thales_crdp_python_function_bulk(_VALUES, "protectbulk", "char", properties=emulator.properties("pol", CRDP_JSON_CODEC="orjson"))
+
+
+def test_registered_codec_is_used(emulator, monkeypatch):
+    monkeypatch.setattr(crdp_udfs, "_JSON_CODECS", dict(crdp_udfs._JSON_CODECS))
+    calls = []
+
+    def dumps(payload):
+        calls.append("dumps")
+        return json.dumps(payload).encode("utf-8")
+
+    def loads(body):
+        calls.append("loads")
+        return json.loads(body)
+
+    register_json_codec("Counting", dumps, loads)
+    _, revealed = _round_trip(emulator.properties("pol", CRDP_JSON_CODEC="counting"), False)
+
+    assert revealed == _VALUES
+    assert calls == ["dumps", "loads"] * 2
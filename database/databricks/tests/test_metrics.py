@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+from thales_databricks_udf import (
+    export_crdp_client_metrics_prometheus,
+    get_crdp_client_metrics,
+    reset_crdp_client_metrics,
+    thales_crdp_python_function_bulk,
+    thales_crdp_python_function_bulk_async,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry():
+    reset_crdp_client_metrics()
+    yield
+    reset_crdp_client_metrics()
+
+
+def _counter(name, **labels):
+    return sum(
+        sample["value"]
+        for sample in get_crdp_client_metrics()["counters"]
+        if sample["name"] == name and all(sample["labels"].get(key) == value for key, value in labels.items())
+    )
+
+
+def _histogram_count(name):
+    return sum(sample["count"] for sample in get_crdp_client_metrics()["histograms"] if sample["name"] == name)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_bulk_requests_are_counted(emulator, use_async):
+    props = emulator.properties("pol", BATCH_SIZE="100", CRDP_METRICS_ENABLED="true")
+    values = [f"v{index:03d}" for index in range(250)]
+
+    if use_async:
+        asyncio.run(thales_crdp_python_function_bulk_async(values, "protectbulk", "char", properties=props))
+    else:
+        thales_crdp_python_function_bulk(values, "protectbulk", "char", properties=props)
+
+    labels = {"mode": "protectbulk", "policy": "pol", "endpoint": emulator.url}
+    assert _counter("thales_crdp_client_requests_total", **labels) == emulator.stats()["requests"] == 3
+    assert _counter("thales_crdp_client_elements_total", **labels) == 250
+    assert _counter("thales_crdp_client_request_bytes_total", **labels) > 0
+    assert _counter("thales_crdp_client_response_bytes_total", **labels) > 0
+    assert _histogram_count("thales_crdp_client_chunk_size") == 3
+    assert _histogram_count("thales_crdp_client_call_latency_seconds") == 3
+    json.dumps(get_crdp_client_metrics())
+
+
+def test_errors_are_labelled_by_status(emulator):
+    props = emulator.properties("pol", CRDP_METRICS_ENABLED="true", CRDP_RETRY_MAX_ATTEMPTS="1")
+
+    with pytest.raises(requests.HTTPError):
+        thales_crdp_python_function_bulk(["BADx"], "protectbulk", "char", properties=props)
+
+    assert _counter("thales_crdp_client_errors_total", error="http_400") == 1
+    assert _counter("thales_crdp_client_elements_total") == 0
+
+
+def test_prometheus_export(emulator):
+    props = emulator.properties("pol", CRDP_METRICS_ENABLED="true")
+    thales_crdp_python_function_bulk(["aa", "bb"], "protectbulk", "char", properties=props)
+
+    text = export_crdp_client_metrics_prometheus()
+
+    assert "# TYPE thales_crdp_client_requests_total counter" in text
+    assert f'thales_crdp_client_elements_total{{mode="protectbulk",policy="pol",endpoint="{emulator.url}"}} 2' in text
+    assert 'thales_crdp_client_chunk_size_bucket{mode="protectbulk",policy="pol",endpoint="%s",le="+Inf"} 1' % emulator.url in text
+    assert text.endswith("\n")
+
+
+def test_disabled_metrics_record_nothing(emulator):
+    thales_crdp_python_function_bulk(["aa"], "protectbulk", "char", properties=emulator.properties("pol"))
+
+    assert get_crdp_client_metrics() == {"counters": [], "histograms": []}
+    assert export_crdp_client_metrics_prometheus() == ""
@@ -0,0 +1,34 @@
+import itertools
+
+from thales_databricks_udf import thales_crdp_python_function_bulk
+from thales_databricks_udf.crdp_udfs import _ProfileIndex, resolve_profile
+
+_PROPERTIES = {
+    "protection_profile": "tag.char.internal",
+    "tag.char.internal": "char-int",
+    "COLUMN_PROFILES": "email|tag.char.external, ssn|nbr-none",
+    "tag.char.external": "char-ext",
+    "column.ssn.policyType": "none",
+    "reveal.object.cat.sch.tbl": "email|reveal-email",
+    "protect.object.cat.sch.tbl": "email|protect-email, address|protect-address",
+    "DEFAULTMODE": "internal",
+}
+
+
+def test_memoized_resolution_matches_a_fresh_index():
+    objects = [None, "cat.sch.tbl", " Cat.Sch.TBL ", "other"]
+    columns = [None, "email", " EMAIL", "ssn", "address", "unknown"]
+    for object_name, column_name, datatype, mode in itertools.product(
+        objects, columns, ["char", "nbr"], [None, "protectbulk", "revealbulk"]
+    ):
+        expected = _ProfileIndex(_PROPERTIES).resolve(datatype, column_name, object_name, mode)
+        assert resolve_profile(_PROPERTIES, datatype, column_name, object_name, mode) == expected
+        assert resolve_profile(dict(_PROPERTIES), datatype, column_name, object_name, mode) == expected
+
+
+def test_edited_properties_resolve_again(emulator):
+    props = emulator.properties("pol", **{"column.email.profile": "ext-policy", "ext-policy.policyType": "external"})
+
+    assert thales_crdp_python_function_bulk(["aa"], "protectbulk", "char", "email", properties=props) == ["nn"]
+    props["column.email.profile"] = "pol"
+    assert thales_crdp_python_function_bulk(["aa"], "protectbulk", "char", "email", properties=props) == ["1001000nn"]
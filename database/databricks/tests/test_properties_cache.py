@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from thales_databricks_udf import crdp_udfs, get_crdp_config, load_properties, thales_crdp_python_function_bulk
+
+
+def _write_properties(path, properties):
+    path.write_text("".join(f"{name}={value}\n" for name, value in properties.items()), encoding="utf-8")
+
+
+@pytest.fixture
+def properties_file(emulator, tmp_path, monkeypatch):
+    path = tmp_path / "udfConfig.properties"
+    _write_properties(path, emulator.properties("pol", CRDP_RETRY_MAX_ATTEMPTS="1"))
+    monkeypatch.setenv("UDF_CONFIG_VOLUME_PATH", str(path))
+    return path
+
+
+def _protect_with_default_properties():
+    return thales_crdp_python_function_bulk(["aa"], "protectbulk", "char")
+
+
+def _switch_to_external_policy(emulator, path):
+    _write_properties(path, emulator.properties("ext-policy", CRDP_RETRY_MAX_ATTEMPTS="1", BATCH_SIZE="500"))
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def test_edited_file_is_picked_up_after_the_recheck_interval(emulator, properties_file, monkeypatch):
+    assert _protect_with_default_properties() == ["1001000nn"]
+
+    _switch_to_external_policy(emulator, properties_file)
+    assert _protect_with_default_properties() == ["1001000nn"]
+
+    monkeypatch.setattr(crdp_udfs, "_PROPERTIES_RECHECK_SECONDS", 0.0)
+    assert _protect_with_default_properties() == ["nn"]
+
+
+def test_unchanged_file_is_not_re_read(properties_file, monkeypatch):
+    monkeypatch.setattr(crdp_udfs, "_PROPERTIES_RECHECK_SECONDS", 0.0)
+    load_properties(refresh=True)
+    reads = []
+    read_properties_file = crdp_udfs._read_properties_file
+    monkeypatch.setattr(crdp_udfs, "_read_properties_file", lambda path: reads.append(path) or read_properties_file(path))
+
+    for _ in range(3):
+        load_properties()
+    assert reads == []
+    load_properties(refresh=True)
+    assert reads == [str(properties_file)]
+
+
+def test_loaded_properties_are_copies(properties_file):
+    first = load_properties()
+    first["protection_profile"] = "changed"
+
+    assert load_properties()["protection_profile"] == "pol"
+
+
+def test_config_is_shared_by_equal_properties(emulator):
+    props = emulator.properties("pol", BATCH_SIZE="250")
+
+    config = get_crdp_config(props)
+
+    assert get_crdp_config(dict(props)) is config
+    assert config.batch_size == 250
+    assert config.endpoints == (emulator.url,)
+    assert get_crdp_config(dict(props, BATCH_SIZE="300")).batch_size == 300
@@ -0,0 +1,61 @@
+import pytest
+import requests
+
+from thales_databricks_udf import CrdpCircuitOpenError, thales_crdp_python_function_bulk
+from thales_databricks_udf.crdp_udfs import _is_endpoint_failure, _is_retryable_error
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status}", response=response)
+
+
+@pytest.mark.parametrize(
+    "error, retryable, endpoint_failure",
+    [
+        (requests.ConnectionError("refused"), True, True),
+        (requests.ConnectTimeout("connect"), True, True),
+        (requests.ReadTimeout("read"), True, True),
+        (requests.exceptions.ChunkedEncodingError("cut"), True, True),
+        (_http_error(429), True, False),
+        (_http_error(503), True, True),
+        (_http_error(400), False, False),
+        (_http_error(404), False, False),
+        (CrdpCircuitOpenError("open"), False, True),
+        (requests.exceptions.InvalidURL("bad url"), False, False),
+        (requests.exceptions.TooManyRedirects("loop"), False, False),
+        (requests.exceptions.ContentDecodingError("gzip"), False, False),
+        (requests.exceptions.InvalidJSONError("json"), False, False),
+        (OSError("disk"), False, False),
+        (ValueError("count"), False, False),
+    ],
+)
+def test_only_transient_errors_are_retried(error, retryable, endpoint_failure):
+    assert _is_retryable_error(error) is retryable
+    assert _is_endpoint_failure(error) is endpoint_failure
+
+
+def _retrying_properties(emulator):
+    return emulator.properties(
+        "pol",
+        CRDP_RETRY_MAX_ATTEMPTS="3",
+        CRDP_RETRY_BACKOFF_BASE_MS="1",
+        CRDP_CIRCUIT_BREAKER_ENABLED="false",
+    )
+
+
+def test_unavailable_crdp_is_retried(emulator):
+    emulator.error_rate = 1.0
+
+    with pytest.raises(requests.HTTPError):
+        thales_crdp_python_function_bulk(["aa"], "protectbulk", "char", properties=_retrying_properties(emulator))
+    assert emulator.stats()["requests"] == 3
+
+
+def test_undecodable_response_is_not_retried(emulator):
+    emulator.malformed_responses = True
+
+    with pytest.raises(ValueError):
+        thales_crdp_python_function_bulk(["aa"], "protectbulk", "char", properties=_retrying_properties(emulator))
+    assert emulator.stats()["requests"] == 1
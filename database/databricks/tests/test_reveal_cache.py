@@ -0,0 +1,22 @@
+from thales_databricks_udf import clear_reveal_cache, crdp_reveal_cache, get_reveal_cache_stats
+
+
+def test_disabled_cache_reports_why(emulator, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(crdp_reveal_cache, "_mount_fstype", lambda path: "ext4")
+    props = emulator.properties(CRDP_REVEAL_CACHE_ENABLED="true", CRDP_REVEAL_CACHE_DIR=str(tmp_path))
+
+    stats = get_reveal_cache_stats(props)
+
+    assert stats == {"enabled": False, "disabled_reason": f"{tmp_path} is not a memory filesystem (ext4)"}
+    assert capsys.readouterr().out == ""
+
+
+def test_clear_with_unlink_removes_the_region(emulator, tmp_path, monkeypatch):
+    monkeypatch.setattr(crdp_reveal_cache, "_mount_fstype", lambda path: "tmpfs")
+    props = emulator.properties(CRDP_REVEAL_CACHE_ENABLED="true", CRDP_REVEAL_CACHE_DIR=str(tmp_path))
+    assert get_reveal_cache_stats(props)["enabled"] is True
+    assert len(list(tmp_path.iterdir())) == 1
+
+    clear_reveal_cache(props, unlink=True)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from thales_databricks_udf import (
+    clear_reveal_user_cache,
+    resolve_runtime_reveal_user,
+    thales_crdp_python_function_bulk_secure,
+)
+
+
+class _Row:
+    def __init__(self, value):
+        self.value = value
+
+    def first(self):
+        return [self.value]
+
+
+class _FakeSparkSession:
+    def __init__(self, user):
+        self.user = user
+        self.lookups = 0
+
+    def sql(self, sql_text):
+        self.lookups += 1
+        return _Row(self.user)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_reveal_user_cache()
+    yield
+    clear_reveal_user_cache()
+
+
+def test_session_user_is_looked_up_once_per_ttl(emulator):
+    spark = _FakeSparkSession("alice")
+    props = emulator.properties("pol", REVEAL_USER_CACHE_TTL_SECONDS="0.3")
+
+    for _ in range(3):
+        revealed = thales_crdp_python_function_bulk_secure(["1001000nn"], "revealbulk", "char", properties=props, spark_session=spark)
+        assert revealed == ["aa"]
+    assert spark.lookups == 1
+
+    time.sleep(0.4)
+    spark.user = "bob"
+    assert resolve_runtime_reveal_user(spark, properties=props) == "bob"
+    assert spark.lookups == 2
+
+
+def test_clear_reveal_user_cache_forces_a_lookup():
+    spark = _FakeSparkSession("alice")
+    other = _FakeSparkSession("carol")
+    assert resolve_runtime_reveal_user(spark) == "alice"
+    assert resolve_runtime_reveal_user(other) == "carol"
+
+    spark.user = "bob"
+    assert resolve_runtime_reveal_user(spark) == "alice"
+    clear_reveal_user_cache(spark)
+    assert resolve_runtime_reveal_user(spark) == "bob"
+    assert resolve_runtime_reveal_user(other) == "carol"
+    assert (spark.lookups, other.lookups) == (2, 1)
+
+    clear_reveal_user_cache()
+    resolve_runtime_reveal_user(other)
+    assert other.lookups == 2
+
+
+def test_zero_ttl_disables_the_cache():
+    spark = _FakeSparkSession("alice")
+    props = {"REVEAL_USER_CACHE_TTL_SECONDS": "0"}
+
+    for _ in range(3):
+        assert resolve_runtime_reveal_user(spark, properties=props) == "alice"
+    assert spark.lookups == 3
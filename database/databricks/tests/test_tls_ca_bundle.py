@@ -0,0 +1,40 @@
+import os
+import ssl
+
+import pytest
+import requests
+
+from crdp_emulator import CrdpEmulator
+from thales_databricks_udf import thales_crdp_python_function_bulk
+
+_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+_TEST_CA = os.path.join(_DATA, "test_ca.pem")
+
+
+@pytest.fixture
+def tls_emulator():
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(os.path.join(_DATA, "test_server.pem"), os.path.join(_DATA, "test_server.key"))
+    with CrdpEmulator(ssl_context=context, seed=0) as crdp:
+        yield crdp
+
+
+@pytest.mark.parametrize("variable", ["REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE"])
+def test_ca_bundle_environment_is_trusted_without_crdp_ca(tls_emulator, monkeypatch, variable):
+    monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    monkeypatch.setenv(variable, _TEST_CA)
+    properties = tls_emulator.properties(CRDP_SSL_VERIFY_SERVER="true", CRDP_RETRY_MAX_ATTEMPTS="1", CRDP_CIRCUIT_BREAKER_ENABLED="false")
+
+    protected = thales_crdp_python_function_bulk(["4111111111111111"], "protectbulk", "char", properties=properties)
+
+    assert protected == ["10010007444444444444444"]
+
+
+def test_untrusted_server_is_rejected_without_ca_bundle(tls_emulator, monkeypatch):
+    monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    properties = tls_emulator.properties(CRDP_SSL_VERIFY_SERVER="true", CRDP_RETRY_MAX_ATTEMPTS="1", CRDP_CIRCUIT_BREAKER_ENABLED="false")
+
+    with pytest.raises(requests.exceptions.SSLError):
+        thales_crdp_python_function_bulk(["4111111111111111"], "protectbulk", "char", properties=properties)
@@ -0,0 +1,29 @@
+import pytest
+
+from thales_databricks_udf import thales_crdp_python_function_vectorized
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("values", [[123, None, 456], [None, -7, 5, 10**12], [0, 1, 2]])
+def test_pandas_and_arrow_agree_on_nullable_integers(emulator, values):
+    props = emulator.properties(CRDP_RETRY_MAX_ATTEMPTS="1")
+
+    # Spark's Arrow conversion delivers a nullable IntegerType column as float64.
+    from_pandas = thales_crdp_python_function_vectorized(pd.Series(values, dtype="float64"), "protectbulk", "nbr", properties=props)
+    from_arrow = thales_crdp_python_function_vectorized(pa.array(values, type=pa.int64()), "protectbulk", "nbr", properties=props)
+
+    assert from_pandas.tolist() == from_arrow.to_pylist()
+    present = [value for value in values if value is not None]
+    assert [value for value in from_pandas if value is not None] == thales_crdp_python_function_vectorized(
+        pd.Series(present), "protectbulk", "nbr", properties=props
+    ).tolist()
+
+
+def test_fractional_floats_are_sent_as_text(emulator):
+    props = emulator.properties(CRDP_RETRY_MAX_ATTEMPTS="1")
+
+    protected = thales_crdp_python_function_vectorized(pd.Series([1.5, None]), "protectbulk", "nbr", properties=props)
+
+    assert protected.tolist() == ["10010004.8", None]
@@ -0,0 +1,236 @@
+"""
+Offline throughput benchmark for the Python CRDP bulk client.
+
+Drives thales_crdp_python_function_bulk (and its asyncio variant) against
+the local CRDP emulator across batch sizes, worker counts and value widths,
+so client-side regressions show up without a Databricks cluster or a real
+CRDP. Results can be saved as a baseline and later runs compared against it.
+
+Examples:
+
+    python tools/benchmarks/bench_crdp_bulk.py --quick
+    python tools/benchmarks/bench_crdp_bulk.py --output baseline.json
+    python tools/benchmarks/bench_crdp_bulk.py --baseline baseline.json --max-regression 0.15
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _TOOLS_DIR)
+
+try:
+    import thales_databricks_udf  # noqa: F401
+except ImportError:
+    # Running from a source checkout without the wheel installed.
+    sys.path.insert(0, os.path.join(os.path.dirname(_TOOLS_DIR), "python"))
+
+from crdp_emulator import CrdpEmulator  # noqa: E402
+from thales_databricks_udf import (  # noqa: E402
+    thales_crdp_python_function_bulk,
+    thales_crdp_python_function_bulk_async,
+)
+
+FUNCTIONS = {
+    "bulk": thales_crdp_python_function_bulk,
+    "bulk_async": thales_crdp_python_function_bulk_async,
+}
+HEADER_POLICIES = {"internal": "bench-internal", "external": "bench-external", "none": "bench-none"}
+
+DEFAULT_MATRIX = {
+    "batch_sizes": [100, 1000, 5000],
+    "workers": [1, 4, 8],
+    "widths": [8, 64, 512],
+    "headers": ["internal", "external"],
+    "modes": ["protectbulk", "revealbulk"],
+    "functions": ["bulk", "bulk_async"],
+}
+QUICK_MATRIX = {
+    "batch_sizes": [1000],
+    "workers": [1, 4],
+    "widths": [16],
+    "headers": ["internal"],
+    "modes": ["protectbulk", "revealbulk"],
+    "functions": ["bulk"],
+}
+
+
+def build_values(rows: int, width: int) -> list:
+    # Widths below 2 would be replaced by the bad data tag before protection.
+    width = max(width, 2)
+    return [str(index).zfill(width)[-width:] for index in range(rows)]
+
+
+def run_function(function_name: str, values: list, mode: str, properties: dict, external_versions=None) -> list:
+    kwargs = {"properties": properties}
+    if external_versions is not None:
+        kwargs["external_versions"] = external_versions
+    if function_name == "bulk_async":
+        return asyncio.run(FUNCTIONS[function_name](values, mode, "char", **kwargs))
+    return FUNCTIONS[function_name](values, mode, "char", **kwargs)
+
+
+def run_case(emulator: CrdpEmulator, case: dict, rows: int, repeats: int) -> dict:
+    policy = HEADER_POLICIES[case["header"]]
+    properties = emulator.properties(
+        policy,
+        BATCH_SIZE=case["batch_size"],
+        CRDP_BULK_MAX_WORKERS=case["workers"],
+        CRDP_HTTP_POOL_MAXSIZE=max(case["workers"], 1),
+    )
+    plaintext = build_values(rows, case["width"])
+    values = plaintext
+    external_versions = None
+    if case["mode"] == "revealbulk":
+        protected = run_function(case["function"], values, "protectbulk", properties)
+        if case["header"] == "external":
+            external_versions = [emulator.key_version] * len(protected)
+        values = list(protected)
+
+    # One untimed run warms the session pool, profile index and config caches.
+    warm_results = run_function(case["function"], values, case["mode"], properties, external_versions)
+    if case["mode"] == "revealbulk" and list(warm_results) != plaintext:
+        raise RuntimeError(f"{case_key(case)} did not reveal the original values")
+    emulator.reset_stats()
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        results = run_function(case["function"], values, case["mode"], properties, external_versions)
+        timings.append(time.perf_counter() - started)
+        if len(results) != rows:
+            raise RuntimeError(f"{case_key(case)} returned {len(results)} results for {rows} rows")
+
+    median_seconds = statistics.median(timings)
+    return dict(
+        case,
+        key=case_key(case),
+        rows=rows,
+        repeats=repeats,
+        median_seconds=median_seconds,
+        min_seconds=min(timings),
+        rows_per_second=rows / median_seconds,
+        requests=emulator.stats()["requests"],
+    )
+
+
+def case_key(case: dict) -> str:
+    return "{function}/{mode}/{header}/batch={batch_size}/workers={workers}/width={width}".format(**case)
+
+
+def iter_cases(matrix: dict):
+    for function, mode, header, batch_size, workers, width in itertools.product(
+        matrix["functions"], matrix["modes"], matrix["headers"], matrix["batch_sizes"], matrix["workers"], matrix["widths"]
+    ):
+        yield {
+            "function": function,
+            "mode": mode,
+            "header": header,
+            "batch_size": batch_size,
+            "workers": workers,
+            "width": width,
+        }
+
+
+def compare_to_baseline(results: list, baseline: dict, max_regression: float) -> list:
+    """Return the cases whose throughput dropped by more than ``max_regression`` against the baseline."""
+    previous = {entry["key"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        old = previous.get(entry["key"])
+        if old is None:
+            continue
+        change = entry["rows_per_second"] / old["rows_per_second"] - 1.0
+        entry["change_vs_baseline"] = change
+        if change < -max_regression:
+            regressions.append(entry)
+    return regressions
+
+
+def parse_int_list(value: str) -> list:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Python CRDP bulk client against the local CRDP emulator.")
+    parser.add_argument("--quick", action="store_true", help="run a small matrix suitable for CI")
+    parser.add_argument("--rows", type=int, default=20000, help="values per call")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--batch-sizes", type=parse_int_list, default=None)
+    parser.add_argument("--workers", type=parse_int_list, default=None)
+    parser.add_argument("--widths", type=parse_int_list, default=None)
+    parser.add_argument("--headers", default=None, help="comma-separated subset of internal,external,none")
+    parser.add_argument("--modes", default=None, help="comma-separated subset of protectbulk,revealbulk")
+    parser.add_argument("--functions", default=None, help="comma-separated subset of bulk,bulk_async")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="emulated CRDP latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--per-element-us", type=float, default=2.0, help="emulated CRDP cost per value")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=None, help="JSON file from an earlier --output run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed throughput drop vs. baseline (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def build_matrix(args) -> dict:
+    matrix = dict(QUICK_MATRIX if args.quick else DEFAULT_MATRIX)
+    for name in ("batch_sizes", "workers", "widths"):
+        if getattr(args, name) is not None:
+            matrix[name] = getattr(args, name)
+    for name in ("headers", "modes", "functions"):
+        if getattr(args, name) is not None:
+            matrix[name] = [item.strip() for item in getattr(args, name).split(",") if item.strip()]
+    return matrix
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    matrix = build_matrix(args)
+    rows = min(args.rows, 5000) if args.quick else args.rows
+
+    results = []
+    with CrdpEmulator(
+        policies={policy: header for header, policy in HEADER_POLICIES.items()},
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        per_element_us=args.per_element_us,
+        seed=0,
+    ) as emulator:
+        for case in iter_cases(matrix):
+            result = run_case(emulator, case, rows, args.repeats)
+            results.append(result)
+            print(
+                f"{result['key']:<72} {result['rows_per_second']:>12.0f} rows/s "
+                f"median={result['median_seconds'] * 1000:.1f}ms requests={result['requests']}"
+            )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "emulator": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "per_element_us": args.per_element_us},
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare_to_baseline(results, json.load(baseline_file), args.max_regression)
+        for entry in regressions:
+            print(f"REGRESSION {entry['key']}: {entry['change_vs_baseline'] * 100:.1f}% rows/s vs. baseline")
+        if regressions:
+            exit_code = 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Import footprint and import-time check for the Python UDF wheel.
+
+Every Unity Catalog Python UDF sandbox imports the package on cold start, so
+import cost is paid once per sandbox. This script imports each entry module in
+a fresh interpreter with ``python -X importtime`` and fails when
+
+- a module that entry point must not load shows up (asyncio, pandas, pyarrow,
+  numpy, or a package module outside its path), or
+- the median import time exceeds its budget.
+
+Both checks also run in the test suite (tests/test_import_footprint.py). The
+time budgets are deliberately loose and only catch large slowdowns; set
+IMPORT_TIME_BUDGET_SCALE there, or pass --budget-scale here, on slow runners.
+
+Examples:
+
+    python tools/benchmarks/check_import_time.py
+    python tools/benchmarks/check_import_time.py --repeats 9 --budget-scale 2 --output importtime.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PACKAGE = "thales_databricks_udf"
+_SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "python")
+
+_HEAVY_MODULES = ("asyncio", "pandas", "pyarrow", "numpy")
+
+# entry module -> (budget in ms, modules it must not import)
+TARGETS = {
+    _PACKAGE: (
+        15.0,
+        _HEAVY_MODULES + ("requests", f"{_PACKAGE}.crdp_udfs", f"{_PACKAGE}.crdp_async", f"{_PACKAGE}.crdp_vectorized"),
+    ),
+    f"{_PACKAGE}.crdp_udfs": (
+        150.0,
+        _HEAVY_MODULES + ("decimal", f"{_PACKAGE}.crdp_async", f"{_PACKAGE}.crdp_vectorized"),
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map each imported module to its cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def import_once(module: str) -> dict:
+    env = dict(os.environ)
+    # Measure the warm-bytecode case a wheel install sees, not source compilation.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_SOURCE_DIR, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    return parse_importtime(completed.stderr)
+
+
+def check_target(module: str, budget_ms: float, forbidden: tuple, repeats: int) -> dict:
+    import_once(module)
+    runs = [import_once(module) for _ in range(repeats)]
+    # The package is imported before its submodules and logged on its own line.
+    timings_ms = [
+        sum(elapsed for name, elapsed in run.items() if name in (module, _PACKAGE)) / 1000.0
+        for run in runs
+    ]
+    loaded = set(runs[-1])
+    return {
+        "module": module,
+        "median_ms": statistics.median(timings_ms),
+        "budget_ms": budget_ms,
+        "forbidden_loaded": sorted(name for name in loaded if name in forbidden),
+        "modules_loaded": len(loaded),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold import time and import footprint of the UDF wheel entry modules.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--modules", default=None, help="comma-separated subset of the checked entry modules")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every time budget, e.g. 2 on slow CI runners")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    modules = [item.strip() for item in args.modules.split(",") if item.strip()] if args.modules else list(TARGETS)
+
+    results = []
+    exit_code = 0
+    for module in modules:
+        budget_ms, forbidden = TARGETS[module]
+        result = check_target(module, budget_ms * args.budget_scale, forbidden, args.repeats)
+        results.append(result)
+        print(f"{module:<40} median={result['median_ms']:.1f}ms budget={result['budget_ms']:.0f}ms modules={result['modules_loaded']}")
+        if result["forbidden_loaded"]:
+            print(f"FAIL {module} imports {', '.join(result['forbidden_loaded'])}")
+            exit_code = 1
+        if result["median_ms"] > result["budget_ms"]:
+            print(f"FAIL {module} took {result['median_ms']:.1f}ms, over its {result['budget_ms']:.0f}ms budget")
+            exit_code = 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"python": sys.version.split()[0], "results": results}, output_file, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
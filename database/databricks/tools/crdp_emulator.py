@@ -0,0 +1,327 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_KEY_VERSION = "1001000"
+HEADER_TYPES = ("internal", "external", "none")
+
+_DIGITS = "0123456789"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+_UPPER = _LOWER.upper()
+_PROTECT_TABLE = str.maketrans(
+    _DIGITS + _LOWER + _UPPER,
+    _DIGITS[3:] + _DIGITS[:3] + _LOWER[13:] + _LOWER[:13] + _UPPER[13:] + _UPPER[:13],
+)
+_REVEAL_TABLE = {value: key for key, value in _PROTECT_TABLE.items()}
+
+
+class CrdpRequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CrdpEmulator:
+    """
+    Local stand-in for the CRDP REST API.
+
+    Implements /v1/protect, /v1/protectbulk, /v1/reveal and /v1/revealbulk
+    with the same request and response JSON shapes as CRDP. Protection is a
+    reversible character rotation, not encryption; only use it for tests and
+    benchmarks.
+
+    Header semantics follow the policy type mapped in ``policies`` (falling
+    back to ``default_header``):
+
+    - internal: the key version is prepended to the protected value and
+      stripped again on reveal
+    - external: the key version is returned as ``external_version`` and
+      reveal requires it on every element
+    - none: no key version at all
+
+    Every request sleeps ``latency_ms`` plus ``per_element_us`` per value plus
+    a uniform ``jitter_ms``. A fraction ``error_rate`` of requests fail with
+    ``error_status``, and any value containing ``reject_marker`` fails its
+    whole request with HTTP 400, like a value CRDP cannot protect. With
+    ``strict_policies`` a policy missing from ``policies`` fails every request
+    with HTTP 400, and ``malformed_responses`` truncates successful response
+    bodies. Pass a server-side ``ssl_context`` to serve HTTPS.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        policies=None,
+        default_header: str = "internal",
+        key_version: str = DEFAULT_KEY_VERSION,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        per_element_us: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        reject_marker=None,
+        strict_policies: bool = False,
+        malformed_responses: bool = False,
+        seed=None,
+        ssl_context=None,
+    ):
+        if default_header not in HEADER_TYPES:
+            raise ValueError(f"default_header must be one of {HEADER_TYPES}")
+        self.policies = {str(name): str(header).lower() for name, header in (policies or {}).items()}
+        self.default_header = default_header
+        self.key_version = key_version
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.per_element_us = per_element_us
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.reject_marker = reject_marker
+        self.strict_policies = strict_policies
+        self.malformed_responses = malformed_responses
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "elements": 0, "errors": 0}
+        self._server = ThreadingHTTPServer((host, port), _build_handler(self))
+        self._server.daemon_threads = True
+        self.tls = ssl_context is not None
+        if self.tls:
+            self._server.socket = ssl_context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{'https' if self.tls else 'http'}://{host}:{port}"
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "CrdpEmulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="crdp-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def properties(self, policy: str = "emulator-policy", **overrides) -> dict:
+        """udfConfig-style properties that point the Python client at this emulator."""
+        props = {
+            "CRDPIP": self._server.server_address[0],
+            "CRDPPORT": str(self.port),
+            "protection_profile": policy,
+            f"{policy}.policyType": self.header_type(policy),
+            "keymetadatalocation": "external" if self.header_type(policy) == "external" else "internal",
+            "keymetadata": self.key_version,
+            "CRDPUSER": "admin",
+            "DEFAULTREVEALUSER": "admin",
+            "CRDP_SSL_ENABLED": str(self.tls).lower(),
+        }
+        props.update({key: str(value) for key, value in overrides.items()})
+        return props
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def header_type(self, policy_name) -> str:
+        return self.policies.get(str(policy_name), self.default_header)
+
+    def _count(self, elements: int, failed: bool) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["elements"] += elements
+            if failed:
+                self._stats["errors"] += 1
+
+    def _delay(self, elements: int) -> None:
+        delay_ms = self.latency_ms + elements * self.per_element_us / 1000.0
+        if self.jitter_ms:
+            with self._lock:
+                delay_ms += self._random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    def _inject_failure(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _protect_value(self, value, header_type: str) -> dict:
+        if value is None:
+            raise CrdpRequestError(400, "data must not be null")
+        text = str(value)
+        if self.reject_marker and self.reject_marker in text:
+            raise CrdpRequestError(400, f"Invalid input data: {text}")
+        protected = text.translate(_PROTECT_TABLE)
+        if header_type == "internal":
+            return {"protected_data": self.key_version + protected}
+        if header_type == "external":
+            return {"protected_data": protected, "external_version": self.key_version}
+        return {"protected_data": protected}
+
+    def _reveal_value(self, protected, external_version, header_type: str) -> str:
+        if protected is None:
+            raise CrdpRequestError(400, "protected_data must not be null")
+        text = str(protected)
+        if self.reject_marker and self.reject_marker in text:
+            raise CrdpRequestError(400, f"Invalid protected data: {text}")
+        if header_type == "internal":
+            if not text.startswith(self.key_version):
+                raise CrdpRequestError(400, "protected_data does not carry a valid key version header")
+            text = text[len(self.key_version):]
+        elif header_type == "external" and not external_version:
+            raise CrdpRequestError(400, "external_version is required for policies with an external header")
+        return text.translate(_REVEAL_TABLE)
+
+    def handle(self, path: str, body: dict) -> tuple[int, dict, int]:
+        """Return (status, response JSON, element count) for one request."""
+        policy = body.get("protection_policy_name")
+        if not policy:
+            raise CrdpRequestError(400, "protection_policy_name is required")
+        if self.strict_policies and str(policy) not in self.policies:
+            raise CrdpRequestError(400, f"Protection policy {policy} not found")
+        header_type = self.header_type(policy)
+
+        if path == "/v1/protect":
+            return 200, self._protect_value(body.get("data"), header_type), 1
+        if path == "/v1/protectbulk":
+            values = body.get("data_array")
+            if not isinstance(values, list):
+                raise CrdpRequestError(400, "data_array is required")
+            results = [self._protect_value(value, header_type) for value in values]
+            return 200, {"status": "Success", "total_count": len(results), "success_count": len(results), "error_count": 0, "protected_data_array": results}, len(values)
+
+        if not body.get("username"):
+            raise CrdpRequestError(400, "username is required for reveal")
+        if path == "/v1/reveal":
+            data = self._reveal_value(body.get("protected_data"), body.get("external_version"), header_type)
+            return 200, {"data": data}, 1
+        if path == "/v1/revealbulk":
+            items = body.get("protected_data_array")
+            if not isinstance(items, list):
+                raise CrdpRequestError(400, "protected_data_array is required")
+            results = [
+                {"data": self._reveal_value(item.get("protected_data"), item.get("external_version"), header_type)}
+                for item in items
+            ]
+            return 200, {"status": "Success", "total_count": len(results), "success_count": len(results), "error_count": 0, "data_array": results}, len(items)
+        raise CrdpRequestError(404, f"Unknown path {path}")
+
+
+def _build_handler(emulator: CrdpEmulator):
+    class CrdpEmulatorHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body in one segment, so Nagle and delayed ACKs do
+        # not add ~40 ms per response and swamp the client costs being measured.
+        disable_nagle_algorithm = True
+        wbufsize = 1 << 16
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: dict, truncate: bool = False) -> None:
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            if truncate:
+                body = body[: len(body) // 2]
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            elements = 0
+            try:
+                raw_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                try:
+                    body = json.loads(raw_body or b"{}")
+                except ValueError:
+                    raise CrdpRequestError(400, "Request body is not valid JSON")
+                elements = len(body.get("data_array") or body.get("protected_data_array") or []) or 1
+                emulator._delay(elements)
+                if emulator._inject_failure():
+                    raise CrdpRequestError(emulator.error_status, "Injected failure")
+                status, payload, elements = emulator.handle(self.path, body)
+            except CrdpRequestError as ex:
+                emulator._count(elements, True)
+                self._send_json(ex.status, {"code": ex.status, "message": str(ex)})
+                return
+            emulator._count(elements, False)
+            self._send_json(status, payload, truncate=emulator.malformed_responses)
+
+    return CrdpEmulatorHandler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local CRDP stand-in for tests and benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--default-header", choices=HEADER_TYPES, default="internal")
+    parser.add_argument(
+        "--policy",
+        action="append",
+        default=[],
+        metavar="NAME=HEADER",
+        help="header type of one policy, e.g. plain-alpha-ext=external (repeatable)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--per-element-us", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--reject-marker", default=None, help="values containing this text are rejected with HTTP 400")
+    parser.add_argument("--strict-policies", action="store_true", help="reject policies not given with --policy")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    policies = dict(entry.split("=", 1) for entry in args.policy)
+    emulator = CrdpEmulator(
+        args.host,
+        args.port,
+        policies=policies,
+        default_header=args.default_header,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        per_element_us=args.per_element_us,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        reject_marker=args.reject_marker,
+        strict_policies=args.strict_policies,
+        seed=args.seed,
+    )
+    print(f"CRDP emulator listening on {emulator.url}")
+    try:
+        emulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import os
 import sys
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 disable_warnings(InsecureRequestWarning)
@@ -35,26 +37,53 @@ errs = 0
 # Set the header application
 hdrs = {'Content-Type': 'application/json'}
 
+# Maximum number of tokenize requests on the wire at once for one Redshift batch.
+CTS_MAX_CONCURRENCY = max(int(os.environ.get('CTS_MAX_CONCURRENCY', '16')), 1)
+
+# One keep-alive session per Lambda container, reused across warm invocations.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=CTS_MAX_CONCURRENCY, pool_maxsize=CTS_MAX_CONCURRENCY))
+session.headers.update(hdrs)
+session.auth = p11auth
+session.verify = False
+executor = ThreadPoolExecutor(max_workers=CTS_MAX_CONCURRENCY)
+vts_checked = False
+
 ############ Check connect to VTS before continue #######################
-try:
-    r = requests.get(p11url, verify=False)
-    r.raise_for_status()
-except requests.exceptions.RequestException as err:
-    print("\nEror, something wrong: ")
-    print(err)
-    sys.exit(HTTP_FAILURE)
-except requests.exceptions.HTTPError as errh:
-    print("\nHttp Error:", errh)
-    sys.exit(HTTP_FAILURE)
-except requests.exceptions.ConnectionError as errc:
-    print("\nError Connecting:", errc)
-    sys.exit(HTTP_FAILURE)
-except requests.exceptions.Timeout as errt:
-    print("\nTimeout Error:", errt)
-    sys.exit(HTTP_FAILURE)
+def check_vts_connection():
+    # Runs once per container on the first invocation instead of at import time,
+    # so it does not add to cold-start latency.
+    global vts_checked
+    if vts_checked:
+        return
+    try:
+        r = session.get(p11url)
+        r.raise_for_status()
+    except requests.exceptions.HTTPError as errh:
+        print("\nHttp Error:", errh)
+        raise
+    except requests.exceptions.ConnectionError as errc:
+        print("\nError Connecting:", errc)
+        raise
+    except requests.exceptions.Timeout as errt:
+        print("\nTimeout Error:", errt)
+        raise
+    except requests.exceptions.RequestException as err:
+        print("\nEror, something wrong: ")
+        print(err)
+        raise
+    vts_checked = True
 
 ################################################################################
 
+def tokenize_value(u, row_value):
+    data = {"tokengroup" :  p11tokgroup, "tokentemplate" : p11toktemplate}
+    data["data"] = row_value
+    # Post the request
+    r = session.post(u, json=data)
+    result = json.loads(r.text)
+    return result['token']
+
 def lambda_handler(event, context):
     ret = dict()
     res = []
@@ -67,20 +96,10 @@ def lambda_handler(event, context):
         rows = event["arguments"]
         print("number of rows")
         print(len(rows))
+        check_vts_connection()
         u = p11url + "/rest/v2.0/tokenize"
-        # For each input row
-        for row in rows:
-            # Include the row number.
-            #row_number = row[0]
-            row_value = row[0]
-            #print(row_value)
-            data = {"tokengroup" :  p11tokgroup, "tokentemplate" : p11toktemplate}
-            data["data"] = row_value
-            # Post the request
-            r = requests.post(u, headers=hdrs, auth=p11auth, verify=False, json=data)
-            result = json.loads(r.text)
-            encvalue = result['token']
-            res.append(encvalue)
+        # Fan the rows out over the shared pool; map() keeps event["arguments"] order.
+        res = list(executor.map(lambda row: tokenize_value(u, row[0]), rows))
         ret['success'] = True
         ret["num_records"] = len(rows)
         ret['results'] = res       
@@ -1,134 +1,238 @@
+import argparse
 import json
-import ssl
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
 from urllib3 import disable_warnings, exceptions
-from requests.auth import HTTPBasicAuth
 
 BATCH_LIMIT = 5000
 
-def main(args):
-    crdp_container_ip = "yourip"
-    batch_size = 250
-    protect_url = f"http://{crdp_container_ip}:8090/v1/protect"
-    debug = False
-    protection_profile = "plain-nbr-internal"
-    mode_of_operation = "regular"
-    
-    if args[1] != "null":
-        debug = args[1].lower() == "true"
-        
-    if args[2] != "null":
-        mode_of_operation = args[2]
-        
-    if mode_of_operation.lower() == "bulk":
-        protect_url = protect_url + "bulk"
-        
-    file_path = r"C:\data\emp-id1k.txt"
-    total_records = 0
-    
-    if mode_of_operation.lower() == "regular":
-        total_records = protect_from_file(protect_url, debug, file_path, protection_profile)
-        nbrofchunks = 1
-    else:
-        strings = read_strings_from_file(file_path)
-        total_number_of_records = len(strings)
-        index = 0
-        nbrofchunks = 0
-        records_left = total_number_of_records
-        
-        batch_nnn = []
-        if batch_size > total_number_of_records:
-            batch_size = total_number_of_records
-        if batch_size >= BATCH_LIMIT:
-            batch_size = BATCH_LIMIT
-            
-        while index < total_number_of_records:
-            for i in range(batch_size):
-                if index < total_number_of_records:
-                    batch_nnn.append(strings[index])
-                    index += 1
-                    records_left -= 1
-            
-            total_records += protect_from_file_bulk(protect_url, debug, batch_nnn, batch_size, index, total_number_of_records, records_left, protection_profile)
-            batch_nnn = []
-            nbrofchunks += 1
-
-    print(f"Total records = {total_records}")
-
-def protect_from_file_bulk(url, debug, strings, batch_size, index, total_number_of_records, records_left, protection_profile):
-    total_nb_of_records = 0
-    count = 0
-    crdp_payload_array = []
-    
-    for str_ in strings:
-        total_nb_of_records += 1
-        crdp_payload_array.append(str_)
-        count += 1
-        
-        if count == batch_size:
-            crdp_payload = {"data_array": crdp_payload_array, "protection_policy_name": protection_profile}
-            json_body = json.dumps(crdp_payload)
-            if debug:
-                print("json body:", json_body)
-            make_cm_call(json_body, url, debug)
-            crdp_payload_array = []
-            count = 0
-            
-    if count > 0:
-        crdp_payload = {"data_array": crdp_payload_array, "protection_policy_name": protection_profile}
-        json_body = json.dumps(crdp_payload)
-        if debug:
-            print("json body:", json_body)
-        make_cm_call(json_body, url, debug)
-
-    return total_nb_of_records
-
-def protect_from_file(url, debug, file_path, protection_profile):
-    total_nb_of_records = 0
-    
-    with open(file_path, 'r') as file:
-        for line in file:
-            total_nb_of_records += 1
-            crdp_payload = {
-                "protection_policy_name": protection_profile,
-                "data": line.strip()
-            }
-            json_body = json.dumps(crdp_payload)
-            if debug:
-                print("jsonBody", json_body)
-            make_cm_call(json_body, url, debug)
-    
-    return total_nb_of_records
-
-def disable_cert_validation():
-    disable_warnings(exceptions.InsecureRequestWarning)
-    ssl._create_default_https_context = ssl._create_unverified_context
-
-def make_cm_call(payload, url, debug):
-    disable_cert_validation()
-    
-    headers = {'Content-Type': 'application/json'}
-    
-    response = requests.post(url, data=payload, headers=headers, verify=False)
-    
+
+def build_session(pool_size, verify=True):
+    """Create one pooled keep-alive session shared by every batch."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    if verify is False:
+        disable_warnings(exceptions.InsecureRequestWarning)
+    session.verify = verify
+    return session
+
+
+def iter_batches(file_path, batch_size, start_offset=0):
+    """
+    Stream the input file and yield (values, end_offset) per batch.
+
+    Only one batch of lines is held in memory at a time. end_offset is the
+    byte offset just past the last line of the batch, so a run can resume
+    from it with --start-offset.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start_offset)
+        offset = start_offset
+        batch = []
+        for raw_line in file:
+            offset += len(raw_line)
+            batch.append(raw_line.decode("utf-8").strip())
+            if len(batch) == batch_size:
+                yield batch, offset
+                batch = []
+        if batch:
+            yield batch, offset
+
+
+def build_payload(operation, values, protection_profile, username=None, external_version=None):
+    if operation == "protect":
+        return {"protection_policy_name": protection_profile, "data_array": values}
+
+    items = []
+    for value in values:
+        item = {"protected_data": value}
+        if external_version:
+            item["external_version"] = external_version
+        items.append(item)
+    payload = {"protection_policy_name": protection_profile, "protected_data_array": items}
+    if username:
+        payload["username"] = username
+    return payload
+
+
+def parse_response(operation, response_json):
+    if operation == "protect":
+        return [item["protected_data"] for item in response_json.get("protected_data_array", [])]
+    return [item["data"] for item in response_json.get("data_array", [])]
+
+
+def make_cm_call(session, url, payload, timeout, debug=False):
+    body = json.dumps(payload)
+    if debug:
+        print("json body:", body)
+
+    response = session.post(url, data=body, timeout=timeout)
     if debug:
         print(f"Response Code: {response.status_code}")
         print(f"Response Body: {response.text}")
-    
-    return response.status_code
 
-def read_strings_from_file(file_path):
-    with open(file_path, 'r') as file:
-        return [line.strip() for line in file]
+    response.raise_for_status()
+    return response.json()
+
+
+def process_file(
+    input_path,
+    output_path,
+    url,
+    operation,
+    protection_profile,
+    batch_size=1000,
+    in_flight=4,
+    start_offset=0,
+    checkpoint_path=None,
+    username=None,
+    external_version=None,
+    verify=True,
+    timeout=(10.0, 30.0),
+    report_every_seconds=5.0,
+    debug=False,
+):
+    """
+    Protect or reveal every line of input_path and write the results to output_path.
+
+    Keeps up to in_flight batches on the wire over one pooled session and writes
+    results strictly in input order. After each written batch the next input
+    byte offset is stored in checkpoint_path, if given, so an interrupted run can
+    resume. Returns a dict with record, batch and throughput totals.
+    """
+    batch_size = max(1, min(batch_size, BATCH_LIMIT))
+    in_flight = max(1, in_flight)
+    session = build_session(in_flight, verify)
+
+    def send_batch(values):
+        payload = build_payload(operation, values, protection_profile, username, external_version)
+        results = parse_response(operation, make_cm_call(session, url, payload, timeout, debug))
+        if len(results) != len(values):
+            raise ValueError(f"CRDP returned {len(results)} results for a batch of {len(values)} values.")
+        return results
+
+    total_records = 0
+    total_batches = 0
+    committed_offset = start_offset
+    started = time.monotonic()
+    last_report = started
+    pending = deque()
+
+    def write_oldest(output_file):
+        nonlocal total_records, total_batches, committed_offset, last_report
+        future, batch_len, end_offset = pending.popleft()
+        results = future.result()
+        output_file.write("\n".join("" if value is None else str(value) for value in results))
+        output_file.write("\n")
+        output_file.flush()
+        total_records += batch_len
+        total_batches += 1
+        committed_offset = end_offset
+        if checkpoint_path:
+            with open(checkpoint_path, "w", encoding="utf-8") as checkpoint_file:
+                checkpoint_file.write(str(committed_offset))
+
+        now = time.monotonic()
+        if report_every_seconds and now - last_report >= report_every_seconds:
+            elapsed = now - started
+            print(
+                f"records={total_records} batches={total_batches} offset={committed_offset} "
+                f"records_per_sec={total_records / elapsed:.1f}"
+            )
+            last_report = now
+
+    output_mode = "a" if start_offset else "w"
+    with open(output_path, output_mode, encoding="utf-8", newline="\n") as output_file:
+        with ThreadPoolExecutor(max_workers=in_flight, thread_name_prefix="crdp-bulk") as executor:
+            try:
+                for values, end_offset in iter_batches(input_path, batch_size, start_offset):
+                    if len(pending) >= in_flight:
+                        write_oldest(output_file)
+                    pending.append((executor.submit(send_batch, values), len(values), end_offset))
+                while pending:
+                    write_oldest(output_file)
+            except BaseException:
+                for future, _, _ in pending:
+                    future.cancel()
+                print(f"Stopped. Resume with --start-offset {committed_offset}", file=sys.stderr)
+                raise
+
+    elapsed = max(time.monotonic() - started, 1e-9)
+    session.close()
+    return {
+        "records": total_records,
+        "batches": total_batches,
+        "elapsed_seconds": elapsed,
+        "records_per_second": total_records / elapsed,
+        "next_offset": committed_offset,
+    }
+
+
+def read_checkpoint(checkpoint_path):
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+            return int(checkpoint_file.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Stream a file of values through CRDP protectbulk/revealbulk.")
+    parser.add_argument("input", help="input file, one value per line")
+    parser.add_argument("output", help="output file, one protected/revealed value per line in input order")
+    parser.add_argument("--operation", choices=["protect", "reveal"], default="protect")
+    parser.add_argument("--crdp", default="http://yourip:8090", help="CRDP base URL, e.g. http://10.0.0.5:8090")
+    parser.add_argument("--profile", default="plain-nbr-internal", help="protection policy name")
+    parser.add_argument("--batch-size", type=int, default=1000, help=f"values per request (max {BATCH_LIMIT})")
+    parser.add_argument("--in-flight", type=int, default=4, help="number of batches kept on the wire")
+    parser.add_argument("--start-offset", type=int, default=None, help="byte offset in the input file to resume from")
+    parser.add_argument("--checkpoint-file", default=None, help="file that records the next byte offset after each batch")
+    parser.add_argument("--username", default=None, help="reveal user")
+    parser.add_argument("--external-version", default=None, help="external_version header for external policies")
+    parser.add_argument("--ca-cert", default=None, help="CA bundle used to verify the CRDP certificate")
+    parser.add_argument("--insecure", action="store_true", help="disable certificate validation (testing only)")
+    parser.add_argument("--debug", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    url = f"{args.crdp.rstrip('/')}/v1/{args.operation}bulk"
+    verify = False if args.insecure else (args.ca_cert or True)
+
+    start_offset = args.start_offset
+    if start_offset is None:
+        start_offset = read_checkpoint(args.checkpoint_file) if args.checkpoint_file else 0
+
+    stats = process_file(
+        args.input,
+        args.output,
+        url,
+        args.operation,
+        args.profile,
+        batch_size=args.batch_size,
+        in_flight=args.in_flight,
+        start_offset=start_offset,
+        checkpoint_path=args.checkpoint_file,
+        username=args.username,
+        external_version=args.external_version,
+        verify=verify,
+        debug=args.debug,
+    )
+    print(
+        f"Total records = {stats['records']} batches = {stats['batches']} "
+        f"elapsed = {stats['elapsed_seconds']:.2f}s records/sec = {stats['records_per_second']:.1f} "
+        f"next offset = {stats['next_offset']}"
+    )
+
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print( len(sys.argv))
-        print("Usage: script.py <debug> <mode_of_operation>")
-        sys.exit(1)
-    
-    # sys.argv[0] is the script name, so pass args starting from index 1
-    args = sys.argv[1:]
-    print(f"Debug mode: {args[1]}, Mode of operation: {args[2]}")
-    main(args)
\ No newline at end of file
+    main(sys.argv[1:])